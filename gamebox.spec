@@ -29,8 +29,6 @@ a = Analysis(
         'PyQt5.QtWidgets',
         'PyQt5.QtWebEngineWidgets',
         'PyQt5.QtWebEngineCore',
-        'keyboard',
-        'pyperclip',
         'google.generativeai',
         'PIL.Image',
         'PIL.PngImagePlugin',
@@ -5,16 +5,26 @@ A game launcher that runs HTML5 games in an embedded browser using PyQt5.
 
 import sys
 import os
+import io
+import re
 import json
+import hashlib
+import sqlite3
 import threading
+import concurrent.futures
 import random
 import shutil
 import collections
 import zipfile
 import tempfile
 import string
+import uuid
+import atexit
+import logging
+import traceback
 from pathlib import Path
 from datetime import datetime
+from operator import itemgetter
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QGridLayout, QPushButton, QLabel, QScrollArea, QMessageBox,
@@ -25,71 +35,385 @@ from PyQt5.QtWidgets import (
     QAbstractItemView, QProgressDialog, QGraphicsOpacityEffect
 )
 from PyQt5.QtWebEngineWidgets import QWebEngineView
-from PyQt5.QtCore import Qt, QUrl, QSize, QTimer, pyqtSignal, QThread, QEvent, QRect, QPropertyAnimation, QEasingCurve
+from PyQt5.QtCore import Qt, QUrl, QSize, QTimer, QObject, pyqtSignal, QThread, QEvent, QRect, QPropertyAnimation, QEasingCurve, QBuffer
 from PyQt5.QtGui import QPixmap, QFont, QColor, QPainter, QKeySequence, QTextCursor, QTextFormat, QIcon
 
-# Keyboard simulation and clipboard imports
-import keyboard
-import pyperclip
 import time
+import functools
+import importlib
+import importlib.util
 
-# Syntax highlighting imports
-try:
-    from PyQt5.Qsci import QsciScintilla, QsciLexerHTML, QsciLexerCSS, QsciLexerJavaScript, QsciAPIs
-    HAS_QSCINTILLA = True
-except ImportError:
-    HAS_QSCINTILLA = False
-    print("Warning: QScintilla not available. Syntax highlighting will be disabled.")
+# --- Lazy imports for heavy optional modules ---
+# google.generativeai, PIL and QScintilla can each cost
+# hundreds of ms of import time. They are loaded on first use so starting the
+# launcher only pays for what the user actually opens.
 
-# AI Integration imports
-try:
-    import google.generativeai as genai
-    HAS_GEMINI_AI = True
-except ImportError:
-    HAS_GEMINI_AI = False
-    print("Warning: Google Generative AI not available. AI features will be disabled.")
+class _LazyModule:
+    """Module proxy that defers the real import until first attribute access"""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+class _LazyAttr:
+    """Proxy for a single class/attribute of a lazily imported module"""
+
+    def __init__(self, module_name, attr):
+        self._module_name = module_name
+        self._attr = attr
+        self._target = None
+
+    def _load(self):
+        if self._target is None:
+            self._target = getattr(importlib.import_module(self._module_name), self._attr)
+        return self._target
+
+    def __call__(self, *args, **kwargs):
+        return self._load()(*args, **kwargs)
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+_AVAILABILITY_CACHE = {}
+
+def _module_available(name):
+    """Check importability without executing the module; memoized"""
+    cached = _AVAILABILITY_CACHE.get(name)
+    if cached is None:
+        try:
+            cached = importlib.util.find_spec(name) is not None
+        except (ImportError, ValueError):
+            cached = False
+        _AVAILABILITY_CACHE[name] = cached
+        if not cached:
+            if name == 'PyQt5.Qsci':
+                print("Warning: QScintilla not available. Syntax highlighting will be disabled.")
+            elif name == 'google.generativeai':
+                print("Warning: Google Generative AI not available. AI features will be disabled.")
+            elif name == 'PIL':
+                print("Warning: PIL (Pillow) not available. Vision features may be limited.")
+    return cached
+
+def has_qscintilla():
+    return _module_available('PyQt5.Qsci')
+
+def has_gemini_ai():
+    return _module_available('google.generativeai')
+
+def has_pil():
+    return _module_available('PIL')
+
+def _is_qsci_widget(widget):
+    """isinstance check against QsciScintilla without an eager Qsci import
+    
+    The class is resolved through the lazy proxy on first call; when
+    QScintilla is not installed no widget can be one, so the probe stays
+    import-free. Replaces the type(...).__name__ string comparison that ran
+    on every selection query.
+    """
+    if widget is None or not has_qscintilla():
+        return False
+    return isinstance(widget, QsciScintilla._load())
+
+# AI Integration imports (lazy)
+genai = _LazyModule('google.generativeai')
+
+# Image processing imports (lazy)
+Image = _LazyAttr('PIL', 'Image')
+
+# Syntax highlighting imports (lazy)
+QsciScintilla = _LazyAttr('PyQt5.Qsci', 'QsciScintilla')
+QsciLexerHTML = _LazyAttr('PyQt5.Qsci', 'QsciLexerHTML')
+QsciLexerCSS = _LazyAttr('PyQt5.Qsci', 'QsciLexerCSS')
+QsciLexerJavaScript = _LazyAttr('PyQt5.Qsci', 'QsciLexerJavaScript')
+QsciAPIs = _LazyAttr('PyQt5.Qsci', 'QsciAPIs')
 
-# Image processing imports
+# Optional C-accelerated JSON for manifest/config parsing (orjson preferred,
+# then ujson); falls back to stdlib json when neither is installed
 try:
-    from PIL import Image
-    HAS_PIL = True
+    import orjson
+
+    def _json_loads(data):
+        return orjson.loads(data)
+
+    def _json_dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode('utf-8')
+
+    def _json_dumps_compact(obj):
+        return orjson.dumps(obj).decode('utf-8')
 except ImportError:
-    HAS_PIL = False
-    print("Warning: PIL (Pillow) not available. Vision features may be limited.")
+    try:
+        import ujson
+
+        def _json_loads(data):
+            return ujson.loads(data)
+
+        def _json_dumps(obj):
+            return ujson.dumps(obj, indent=4, ensure_ascii=False)
+
+        def _json_dumps_compact(obj):
+            return ujson.dumps(obj, ensure_ascii=False)
+    except ImportError:
+        def _json_loads(data):
+            return json.loads(data)
+
+        def _json_dumps(obj):
+            return json.dumps(obj, indent=4, ensure_ascii=False)
+
+        def _json_dumps_compact(obj):
+            return json.dumps(obj, separators=(',', ':'), ensure_ascii=False)
+
+# Verbose diagnostics for hot paths (selection events fire per keystroke/drag)
+DEBUG = False
+
+# Service-layer diagnostics go through a leveled logger so the hot
+# create/import/delete paths pay one isEnabledFor() check instead of
+# dozens of stdout writes; enable with GAMEBOX_DEBUG=1.
+_log = logging.getLogger(__name__)
 
 # --- AI Selection Cache System ---
-# Global variables to track the latest selected code for AI processing
-_SELECTION_CACHE = {
-    "selected_text": "",
-    "start_line": 0,
-    "end_line": 0,
-    "editor_context": None  # To track which editor context (main/gameplay)
-}
+# Tracks the latest selected code for AI processing. Selection events fire on
+# every keystroke/mouse-drag, so the cache is a single slotted instance whose
+# fields are mutated in place instead of a dict rebuilt on each event.
+class _SelectionCache:
+    __slots__ = ("selected_text", "start_line", "end_line", "editor_context")
+
+    def __init__(self):
+        self.selected_text = ""
+        self.start_line = 0
+        self.end_line = 0
+        self.editor_context = None  # To track which editor context (main/gameplay)
+
+_SELECTION_CACHE = _SelectionCache()
 
 def cache_selection(text, start_line, end_line, editor_context):
     """Store selection to cache, replacing any previous selection"""
-    global _SELECTION_CACHE
-    _SELECTION_CACHE["selected_text"] = text
-    _SELECTION_CACHE["start_line"] = start_line  
-    _SELECTION_CACHE["end_line"] = end_line
-    _SELECTION_CACHE["editor_context"] = editor_context
-    print(f"Selection cached: {len(text)} chars from lines {start_line}-{end_line} ({editor_context})")
+    _SELECTION_CACHE.selected_text = text
+    _SELECTION_CACHE.start_line = start_line
+    _SELECTION_CACHE.end_line = end_line
+    _SELECTION_CACHE.editor_context = editor_context
+    if DEBUG:
+        print(f"Selection cached: {len(text)} chars from lines {start_line}-{end_line} ({editor_context})")
 
 def get_cached_selection():
     """Get the currently cached selection"""
-    global _SELECTION_CACHE
     return _SELECTION_CACHE
 
 def clear_selection_cache():
     """Clear the selection cache"""
-    global _SELECTION_CACHE
-    _SELECTION_CACHE = {
-        "selected_text": "",
-        "start_line": 0,
-        "end_line": 0,
-        "editor_context": None
-    }
-    print("Selection cache cleared")
+    _SELECTION_CACHE.selected_text = ""
+    _SELECTION_CACHE.start_line = 0
+    _SELECTION_CACHE.end_line = 0
+    _SELECTION_CACHE.editor_context = None
+    if DEBUG:
+        print("Selection cache cleared")
+
+class GamaiResponseCache:
+    """Disk cache of Gemini responses keyed by SHA256 of (model, prompt).
+
+    Identical prompts skip the network round trip entirely. Policy comes from
+    the "ResponseCache" config field: "Enabled" (read + write), "Replay"
+    (read-only, never stores new responses) or "Disabled" (bypass).
+    """
+
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    # Hot-key memory layer in front of sqlite: repeated identical prompts in
+    # one session (undo/redo of the same edit) skip the disk query too
+    _MEM_CACHE_MAX = 128
+
+    def __init__(self):
+        self._conn = None
+        self._lock = threading.Lock()
+        self._mem_cache = collections.OrderedDict()
+
+    def _connection(self):
+        if self._conn is None:
+            ensure_gamai_config()
+            db_path = os.path.join(GAMAI_CONFIG_DIR, "response_cache.db")
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, model TEXT, response BLOB, ts INTEGER)")
+            self._conn.commit()
+        return self._conn
+
+    @staticmethod
+    def _mode():
+        return load_gamai_config().get("ResponseCache", "Enabled")
+
+    @staticmethod
+    def make_key(model_name, prompt):
+        return hashlib.sha256(f"{model_name}\0{prompt}".encode('utf-8')).hexdigest()
+
+    def get(self, model_name, prompt):
+        """Return the cached response text, or None on miss/disabled cache"""
+        if self._mode() == "Disabled":
+            return None
+        key = self.make_key(model_name, prompt)
+        try:
+            with self._lock:
+                cached = self._mem_cache.get(key)
+                if cached is not None:
+                    self._mem_cache.move_to_end(key)
+                    return cached
+                row = self._connection().execute(
+                    "SELECT response FROM responses WHERE key = ?",
+                    (key,)).fetchone()
+                if row:
+                    text = row[0].decode('utf-8')
+                    self._remember(key, text)
+                    return text
+        except Exception as e:
+            print(f"Warning: AI response cache read failed: {e}")
+        return None
+
+    def _remember(self, key, text):
+        """Insert into the bounded in-memory layer (caller holds the lock)"""
+        self._mem_cache[key] = text
+        self._mem_cache.move_to_end(key)
+        while len(self._mem_cache) > self._MEM_CACHE_MAX:
+            self._mem_cache.popitem(last=False)
+
+    def put(self, model_name, prompt, response_text):
+        """Store a response; no-op in Replay/Disabled modes"""
+        if self._mode() != "Enabled":
+            return
+        try:
+            key = self.make_key(model_name, prompt)
+            with self._lock:
+                conn = self._connection()
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, model, response, ts) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, model_name,
+                     response_text.encode('utf-8'), int(time.time())))
+                conn.commit()
+                self._remember(key, response_text)
+        except Exception as e:
+            print(f"Warning: AI response cache write failed: {e}")
+
+class GeminiRateLimiter:
+    """Token-bucket limiter in front of Gemini calls.
+
+    Requests self-throttle to the per-model RPM/TPM budget (config fields
+    "RPM"/"TPM") so 429 responses - and the wasted round trip plus arbitrary
+    backoff they cause - become rare instead of routine near quota.
+    """
+
+    def __init__(self):
+        self._buckets = {}  # model_name -> [request_budget, token_budget, last_update]
+        self._lock = threading.Lock()
+
+    def acquire(self, model_name, estimated_tokens):
+        """Block until one request plus estimated_tokens fit in the budget"""
+        config = load_gamai_config()
+        rpm = config.get("RPM", 60)
+        tpm = config.get("TPM", 1000000)
+        with self._lock:
+            now = time.monotonic()
+            bucket = self._buckets.setdefault(model_name, [float(rpm), float(tpm), now])
+            elapsed = now - bucket[2]
+            bucket[0] = min(float(rpm), bucket[0] + elapsed * rpm / 60.0)
+            bucket[1] = min(float(tpm), bucket[1] + elapsed * tpm / 60.0)
+            bucket[2] = now
+            wait = 0.0
+            if bucket[0] < 1:
+                wait = max(wait, (1 - bucket[0]) * 60.0 / rpm)
+            if bucket[1] < estimated_tokens:
+                wait = max(wait, (estimated_tokens - bucket[1]) * 60.0 / tpm)
+            bucket[0] -= 1
+            bucket[1] -= estimated_tokens
+        if wait > 0:
+            time.sleep(wait)
+
+GEMINI_RATE_LIMITER = GeminiRateLimiter()
+
+class _CachedAIResponse:
+    """Minimal stand-in for a Gemini response served from the local cache"""
+    __slots__ = ("text",)
+
+    def __init__(self, text):
+        self.text = text
+
+def generate_ai_content(model, prompt):
+    """Run model.generate_content with the local response cache in front"""
+    model_name = getattr(model, "model_name", "") or ""
+    cache = GamaiResponseCache.instance()
+    cached_text = cache.get(model_name, prompt)
+    if cached_text is not None:
+        return _CachedAIResponse(cached_text)
+
+    # Cache miss: throttle under the RPM/TPM budget before hitting the network
+    GEMINI_RATE_LIMITER.acquire(model_name, len(prompt) // 4)
+    response = model.generate_content(prompt)
+    try:
+        response_text = response.text
+    except Exception:
+        response_text = None
+    if response_text:
+        cache.put(model_name, prompt, response_text)
+    return response
+
+@functools.lru_cache(maxsize=32)
+def _build_system_prompt(mode, games_text):
+    """Assemble the fallback persona/tool prompt for a chat context.
+
+    The (mode, games) combinations form a small finite set, so the prompt is
+    built once per combination instead of re-concatenated on every message.
+    """
+    if mode == "editor":
+        return "You are GAMAI, helping with code editing and development."
+    if mode == "game":
+        return "You are GAMAI, assisting with gameplay and game-related questions."
+    # Main menu AI with tool-calls support
+    return (
+        f"You are GAMAI, the GameBox assistant in main menu mode. "
+        f"Available games: {games_text}. "
+        f"Available tools: play_game_name (opens game in play mode), edit_game_name (opens game in editor mode), get_tools (shows all available tools). "
+        f"CRITICAL: When users want to open ANY game, you MUST use JSON tool-calls. "
+        f"For play mode: {{\"tool\": \"play_game_name\", \"parameters\": {{\"name\": \"Game Name\"}}}} "
+        f"For edit mode: {{\"tool\": \"edit_game_name\", \"parameters\": {{\"name\": \"Game Name\"}}}} "
+        f"Examples: 'play candy crush', 'edit maser fighter', 'open game name'. "
+        f"If a game isn't found, show the user what games are available."
+    )
+
+def build_cache_friendly_prompt(persona, messages):
+    """Assemble a chat prompt ordered for Gemini implicit prompt caching.
+
+    Gemini discounts tokens shared with a previous request's prefix, so the
+    large immutable blocks go first: persona, then game-file context blocks
+    (deduplicated - the same INDEX.HTML is only injected once), then the
+    chronological conversation with the newest user turn last.
+    """
+    file_blocks = []
+    seen_blocks = set()
+    conversation = []
+    for msg in messages:
+        content = msg["content"]
+        if ('INDEX.HTML COMPLETE CONTENT' in content or
+                'MANIFEST.JSON COMPLETE CONTENT' in content):
+            if content not in seen_blocks:
+                seen_blocks.add(content)
+                file_blocks.append(content)
+        else:
+            conversation.append(content)
+    return persona + "\n\n" + "\n".join(file_blocks + conversation)
 
 def create_gamai_model(use_backup=False):
     """Create and return a Gemini AI model instance with fallback capability
@@ -100,7 +424,7 @@ def create_gamai_model(use_backup=False):
     Returns:
         tuple: (model_instance, model_name) or (None, None) on error
     """
-    if not HAS_GEMINI_AI:
+    if not has_gemini_ai():
         return None, None
     
     try:
@@ -143,6 +467,66 @@ def switch_to_backup_model(current_model_name):
     
     return None, current_model_name
 
+# One model instance serves every AI request in a session; building it per
+# click repeats SDK configuration and config-file parsing for no benefit
+_MODEL_CACHE = {'model': None, 'name': None}
+
+def get_cached_gamai_model():
+    """Return the cached (model, name) pair, creating it on first use"""
+    if _MODEL_CACHE['model'] is None:
+        _MODEL_CACHE['model'], _MODEL_CACHE['name'] = create_gamai_model()
+    return _MODEL_CACHE['model'], _MODEL_CACHE['name']
+
+def invalidate_gamai_model_cache():
+    """Drop the cached model so the next request rebuilds it"""
+    _MODEL_CACHE['model'] = None
+    _MODEL_CACHE['name'] = None
+
+# Rate-limit error classifier: one compiled scan instead of three substring
+# passes over a lowered copy, and no bare-"limit" false positives
+_RATE_LIMIT_RE = re.compile(r'rate[- ]?limit|quota|429|resource[_ ]exhausted', re.IGNORECASE)
+
+def _is_rate_limit_error(exc):
+    """True when the exception looks like a Gemini rate/quota limit"""
+    return _RATE_LIMIT_RE.search(str(exc)) is not None
+
+# Conversational-response heuristics for the specific-lines apply path:
+# one case-insensitive scan instead of lowering the whole response and
+# running a substring search per phrase
+_CONVERSATIONAL_RE = re.compile(
+    r"here's|here is|you can|you should|i suggest|i recommend|let me|i'll|"
+    r"i would|try this|to improve|to fix|you might|consider|instead",
+    re.IGNORECASE)
+_CODE_CHARS = frozenset('{}();=<>:"\'')
+
+# Pattern to match markdown code blocks (```language or just ```), compiled once
+_CODE_BLOCK_RE = re.compile(r'```(?:\w+)?\n(.*?)\n```', re.DOTALL)
+
+# Pattern to match "line X:" / "lines X-Y:" commands in AI responses
+_LINE_CMD_RE = re.compile(r'lines?\s+(\d+)(?:-(\d+))?\s*:', re.MULTILINE | re.IGNORECASE)
+
+# Spacing-preservation markers the AI prefixes to CSS/HTML blocks
+_CSS_PFX = '/*.*/'
+_CSS_PFX_LEN = len(_CSS_PFX)
+_HTML_PFX = '<!--.-->'
+_HTML_PFX_LEN = len(_HTML_PFX)
+
+def _dedent_preserving_prefix(line, min_indent):
+    """Strip min_indent spaces from a line, keeping any spacing marker intact"""
+    if line.startswith(_CSS_PFX):
+        prefix_end = _CSS_PFX_LEN
+    elif line.startswith(_HTML_PFX):
+        prefix_end = _HTML_PFX_LEN
+    else:
+        if len(line) > min_indent and line.strip():
+            return line[min_indent:]
+        return line
+    # Remove indentation after the marker only
+    content = line[prefix_end:]
+    if content and content[0] == ' ' and len(content) > min_indent:
+        return line[:prefix_end] + content[min_indent:]
+    return line
+
 def extract_content_from_code_blocks(ai_response):
     """Extract actual content from markdown code blocks in AI response
     
@@ -154,15 +538,9 @@ def extract_content_from_code_blocks(ai_response):
     """
     if not ai_response:
         return ""
-    
-    # Look for code blocks with various language specifications
-    import re
-    
-    # Pattern to match markdown code blocks (```language or just ```)
-    code_block_pattern = r'```(?:\w+)?\n(.*?)\n```'
-    
-    matches = re.findall(code_block_pattern, ai_response, re.DOTALL)
-    
+
+    matches = _CODE_BLOCK_RE.findall(ai_response)
+
     if matches:
         # If we found code blocks, concatenate their content
         extracted_content = "\n".join(match.strip() for match in matches)
@@ -194,6 +572,14 @@ SUB_CATEGORIES = [
     "Linear", "Branching", "Sandbox", "Creative", "Puzzle-platformer"
 ]
 
+# Frozenset companions for O(1) membership tests (the lists keep display order)
+MAIN_CATEGORIES_SET = frozenset(MAIN_CATEGORIES)
+SUB_CATEGORIES_SET = frozenset(SUB_CATEGORIES)
+
+# Valid values for the manifest "type" and "players" fields
+_VALID_TYPES = frozenset({"2D", "3D"})
+_VALID_PLAYERS = frozenset({"1", "2"})
+
 # --- 2. AI Integration Constants ---
 
 # AI Configuration
@@ -205,6 +591,9 @@ DEFAULT_AI_CONFIG = {
     "Key": "",
     "Model": "gemini-2.5-pro",
     "BackupModel": "gemini-2.5-flash",
+    "ResponseCache": "Enabled",  # Enabled / Replay / Disabled
+    "RPM": 60,        # Requests-per-minute budget for the rate limiter
+    "TPM": 1000000,   # Tokens-per-minute budget for the rate limiter
     "Personas": {
         "Default": "You are GAMAI, the Gamebox assistant.",
         "OneShot": "",
@@ -253,34 +642,132 @@ CURRENT CONTEXT-AWARE BEHAVIOR:
 
 🎯 REMEMBER: Never invent tools. Use get_tools tool to get accurate information!"""
 
+# --- Manifest / game-info caches ---
+# Composed game-info string cache keyed by str(game_dir) -> (index_sig, manifest_sig, info string)
+_GAME_INFO_CACHE = {}
+
+@functools.lru_cache(maxsize=1024)
+def _read_manifest_cached(path_str, mtime_ns, size):
+    """Read and parse a manifest keyed by its stat tuple.
+
+    A changed file gets a new (mtime_ns, size) key, so stale entries are
+    simply never hit again and age out of the LRU - no explicit
+    invalidation needed. Unchanged manifests skip both read() and parse.
+    """
+    with open(path_str, 'rb') as f:
+        return _json_loads(f.read())
+
+def _file_signature(path):
+    """Return (st_mtime_ns, st_size) for a file, or None if it doesn't exist"""
+    try:
+        stat_result = os.stat(path)
+        return (stat_result.st_mtime_ns, stat_result.st_size)
+    except OSError:
+        return None
+
+class GameContextLoader(QThread):
+    """Reads game files off the GUI thread and reports the composed context message"""
+    context_ready = pyqtSignal(str, str)  # (role, content)
+
+    def __init__(self, context_manager, game_name, game_path, parent=None):
+        super().__init__(parent)
+        self.context_manager = context_manager
+        self.game_name = game_name
+        self.game_path = game_path
+
+    def run(self):
+        try:
+            game_info = self.context_manager._get_game_info(self.game_path)
+            if game_info:
+                game_msg = f"🎮 Game context: '{self.game_name}' loaded from '{self.game_path}'. {game_info}"
+                self.context_ready.emit("system", game_msg)
+        except Exception as e:
+            warning_msg = f"⚠️ Could not load game context for {self.game_name}: {e}"
+            self.context_ready.emit("system", warning_msg)
+
+class FileContentLoader(QThread):
+    """Reads a file off the GUI thread and reports its decoded contents"""
+    content_ready = pyqtSignal(str)
+
+    def __init__(self, file_path, parent=None):
+        super().__init__(parent)
+        self.file_path = file_path
+
+    def run(self):
+        try:
+            path = Path(self.file_path)
+            # Re-opening a dialog on an unchanged file serves the read from
+            # the mtime-keyed cache
+            self.content_ready.emit(
+                _read_text_cached(str(path), path.stat().st_mtime_ns))
+        except Exception as e:
+            _log.error("Error loading file content from %s: %s", self.file_path, e)
+            self.content_ready.emit("")
+
 # Global GAMAI Context Manager
-class GamaiContextManager:
-    """Manages dynamic global GAMAI context with 1M token limit management"""
+class GamaiContextManager(QObject):
+    """Manages dynamic global GAMAI context with 1M token limit management
+
+    A QObject living on the GUI thread so loader signals connected to it are
+    delivered queued - worker threads never touch the context state directly.
+    """
     
     def __init__(self):
-        self.global_context = []  # Single global context for all modes
+        super().__init__()
+        # Guards all context state: the activity-log executor calls
+        # add_message from its worker thread while the GUI thread reads
+        self._lock = threading.RLock()
+        self.global_context = collections.deque()  # Single global context for all modes
         self.max_tokens = 1000000  # 1M tokens limit
         self.token_warning_threshold = 0.9  # Start pruning at 90% capacity
         self.current_mode = "main"  # Track current mode for context
-        
+        self._total_tokens = 0  # Running total, maintained incrementally
+        self._loading_game_paths = set()  # Game paths with a context load in flight
+        self._game_context_loaders = []  # Keep loader threads alive until finished
+        # Last 10 activity-log entries, maintained at insertion time so prompt
+        # builders don't rescan the whole context looking for them
+        self.activity_log = collections.deque(maxlen=10)
+
     def get_context(self, context_name=None):
-        """Get conversation history - always returns global context"""
-        return self.global_context
-    
+        """Get conversation history - a list snapshot of the global context"""
+        with self._lock:
+            return list(self.global_context)
+
     def set_context(self, context_name, history):
         """Set conversation history - clears and replaces global context"""
-        self.global_context = history.copy()
-        self._manage_token_limit()
-    
+        with self._lock:
+            self.global_context = collections.deque(history)
+            self._total_tokens = 0
+            self.activity_log.clear()
+            for message in self.global_context:
+                message["_tokens"] = self._estimate_message_tokens(message['role'], message['content'])
+                self._total_tokens += message["_tokens"]
+                if message['role'] == 'system' and '📝 Activity Log:' in message['content']:
+                    self.activity_log.append(message['content'])
+            self._manage_token_limit()
+
     def add_message(self, context_name, role, content):
         """Add a message to global context with smart pruning"""
-        message = {"role": role, "content": content}
-        self.global_context.append(message)
-        self._manage_token_limit()  # Check and manage token limit
-    
+        message = {"role": role, "content": content,
+                   "_tokens": self._estimate_message_tokens(role, content)}
+        with self._lock:
+            self.global_context.append(message)
+            self._total_tokens += message["_tokens"]
+            if role == 'system' and '📝 Activity Log:' in content:
+                self.activity_log.append(content)
+            self._manage_token_limit()  # Check and manage token limit
+
+    def get_activity_log(self):
+        """Snapshot of the recent activity-log entries (oldest to newest)"""
+        with self._lock:
+            return tuple(self.activity_log)
+
     def clear_context(self, context_name=None):
         """Clear conversation history"""
-        self.global_context = []
+        with self._lock:
+            self.global_context.clear()
+            self._total_tokens = 0
+            self.activity_log.clear()
     
     def set_active_context(self, context_name):
         """Set the currently active context mode"""
@@ -292,7 +779,8 @@ class GamaiContextManager:
     
     def get_active_history(self):
         """Get conversation history for the active context"""
-        return self.global_context
+        with self._lock:
+            return list(self.global_context)
     
     def update_context_status(self, context_name, status_message):
         """Update context with user status (e.g., user opened game, exited game, etc.)"""
@@ -300,46 +788,77 @@ class GamaiContextManager:
         self.add_message("global", "system", status_msg)
     
     def add_game_context(self, context_name, game_name, game_path):
-        """Add game information to global context"""
+        """Add game information to global context - file reads run off the GUI thread"""
+        path_key = str(game_path)
+        if path_key in self._loading_game_paths:
+            return  # A load for this game is already in flight
+        self._loading_game_paths.add(path_key)
+
+        loader = GameContextLoader(self, game_name, game_path)
+        loader.context_ready.connect(self._on_game_context_ready)
+        loader.finished.connect(lambda: self._on_game_context_loaded(path_key, loader))
+        self._game_context_loaders.append(loader)
+        loader.start()
+
+    def _on_game_context_ready(self, role, content):
+        """Receive a loader result on the GUI thread and add it to context"""
+        self.add_message("global", role, content)
+
+    def _on_game_context_loaded(self, path_key, loader):
+        """Release tracking for a finished game-context load"""
+        self._loading_game_paths.discard(path_key)
         try:
-            # Read game files
-            game_info = self._get_game_info(game_path)
-            if game_info:
-                game_msg = f"🎮 Game context: '{game_name}' loaded from '{game_path}'. {game_info}"
-                self.add_message("global", "system", game_msg)
-        except Exception as e:
-            warning_msg = f"⚠️ Could not load game context for {game_name}: {e}"
-            self.add_message("global", "system", warning_msg)
+            self._game_context_loaders.remove(loader)
+        except ValueError:
+            pass
     
     def _get_game_info(self, game_path):
         """Extract information from game files (index.html, manifest.json) - includes ENTIRE file contents"""
         try:
-            info_parts = []
             game_dir = Path(game_path)
-            
-            # Read index.html - ENTIRE CONTENT
             index_file = game_dir / "index.html"
-            if index_file.exists():
+            manifest_file = game_dir / "manifest.json"
+
+            # Check cache first - skip re-reading files that haven't changed
+            index_sig = _file_signature(index_file)
+            manifest_sig = _file_signature(manifest_file)
+            cache_key = str(game_dir)
+            cached = _GAME_INFO_CACHE.get(cache_key)
+            if cached and cached[0] == index_sig and cached[1] == manifest_sig:
+                return cached[2]
+
+            info_parts = []
+
+            # Read index.html - ENTIRE CONTENT
+            if index_sig is not None:
                 try:
-                    with open(index_file, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        if content.strip():
-                            info_parts.append(f"📄 INDEX.HTML COMPLETE CONTENT:\n{content}")
+                    # Stream in 1 MB chunks into a bytearray and decode once -
+                    # games with embedded assets can push index.html to megabytes
+                    buf = bytearray()
+                    block = 1 << 20
+                    with open(index_file, 'rb', buffering=block) as f:
+                        while (chunk := f.read(block)):
+                            buf.extend(chunk)
+                    content = buf.decode('utf-8', 'replace')
+                    if content.strip():
+                        # join instead of an f-string avoids a second full copy
+                        info_parts.append(''.join(('📄 INDEX.HTML COMPLETE CONTENT:\n', content)))
                 except Exception as e:
                     info_parts.append(f"📄 Error reading index.html: {e}")
-            
+
             # Read manifest.json - ENTIRE CONTENT
-            manifest_file = game_dir / "manifest.json"
-            if manifest_file.exists():
+            if manifest_sig is not None:
                 try:
-                    with open(manifest_file, 'r', encoding='utf-8') as f:
-                        manifest_content = f.read()
-                        if manifest_content.strip():
-                            info_parts.append(f"📋 MANIFEST.JSON COMPLETE CONTENT:\n{manifest_content}")
+                    with open(manifest_file, 'rb', buffering=1 << 20) as f:
+                        manifest_content = f.read().decode('utf-8', 'replace')
+                    if manifest_content.strip():
+                        info_parts.append(f"📋 MANIFEST.JSON COMPLETE CONTENT:\n{manifest_content}")
                 except Exception as e:
                     info_parts.append(f"📋 Error reading manifest.json: {e}")
-            
-            return "\n\n".join(info_parts) if info_parts else "Game files loaded successfully."
+
+            result = "\n\n".join(info_parts) if info_parts else "Game files loaded successfully."
+            _GAME_INFO_CACHE[cache_key] = (index_sig, manifest_sig, result)
+            return result
         except Exception as e:
             return f"Game loaded (file read error: {e})"
     
@@ -347,13 +866,27 @@ class GamaiContextManager:
         """Estimate token count for text - rough approximation"""
         # Simple token estimation: ~4 characters per token on average
         return len(text) // 4
+
+    def _estimate_message_tokens(self, role, content):
+        """Estimate tokens for a role/content pair without building the
+        "role: content" string - content can hold a full HTML file"""
+        return (len(role) + len(content) + 2) // 4
     
     def _calculate_total_tokens(self):
-        """Calculate total estimated tokens in global context"""
-        total_tokens = 0
-        for message in self.global_context:
-            total_tokens += self._estimate_tokens(f"{message['role']}: {message['content']}")
-        return total_tokens
+        """Total estimated tokens in global context (maintained incrementally)"""
+        return self._total_tokens
+
+    def _drop_messages(self, drop_indices):
+        """Rebuild the context without the given indices in one linear pass"""
+        if not drop_indices:
+            return
+        kept = collections.deque()
+        for i, message in enumerate(self.global_context):
+            if i in drop_indices:
+                self._total_tokens -= message.get("_tokens", 0)
+            else:
+                kept.append(message)
+        self.global_context = kept
     
     def _manage_token_limit(self):
         """Smart token management - implement sliding window approach for dynamic context"""
@@ -384,52 +917,51 @@ class GamaiContextManager:
                     continue
                     
                 # Remove priority 1: Old game file contents
-                if ('INDEX.HTML COMPLETE CONTENT' in content or 
+                if ('INDEX.HTML COMPLETE CONTENT' in content or
                     'MANIFEST.JSON COMPLETE CONTENT' in content):
-                    message_tokens = self._estimate_tokens(content)
+                    message_tokens = message.get("_tokens", self._estimate_tokens(content))
                     if tokens_to_remove >= message_tokens:
                         messages_to_remove.append(i)
                         tokens_to_remove -= message_tokens
                         continue
-                
+
                 # Remove priority 2: Old status messages (but keep activity logs)
-                if (message['role'] == 'system' and 
+                if (message['role'] == 'system' and
                     '📝 Activity Log:' not in content and
                     'INDEX.HTML COMPLETE CONTENT' not in content and
                     'MANIFEST.JSON COMPLETE CONTENT' not in content):
-                    message_tokens = self._estimate_tokens(content)
+                    message_tokens = message.get("_tokens", self._estimate_tokens(content))
                     if tokens_to_remove >= message_tokens:
                         messages_to_remove.append(i)
                         tokens_to_remove -= message_tokens
                         continue
-            
-            # If still over limit, implement sliding window (remove oldest messages)
-            current_tokens = self._calculate_total_tokens()
-            while current_tokens > self.max_tokens * 0.8 and len(self.global_context) > 50:
-                # Remove oldest message that's not activity log
-                removed = False
-                for i, message in enumerate(self.global_context):
-                    content = message.get('content', '')
-                    if '📝 Activity Log:' not in content:
-                        self.global_context.pop(i)
-                        removed = True
-                        break
-                
-                if not removed:
+
+            # Drop the priority removals in a single linear rebuild
+            self._drop_messages(set(messages_to_remove))
+
+            # If still over limit, implement sliding window (remove oldest
+            # messages) - popleft is O(1) on the deque; activity logs are
+            # carried over and re-attached at the front afterwards
+            kept_logs = []
+            while (self._total_tokens > self.max_tokens * 0.8 and
+                   len(self.global_context) + len(kept_logs) > 50):
+                if not self.global_context:
                     break  # All remaining messages are activity logs
-                    
-                current_tokens = self._calculate_total_tokens()
-            
-            # Remove messages in reverse order
-            for i in reversed(messages_to_remove):
-                if i < len(self.global_context):  # Double check index is still valid
-                    self.global_context.pop(i)
-            
+                message = self.global_context.popleft()
+                if '📝 Activity Log:' in message.get('content', ''):
+                    kept_logs.append(message)
+                    continue
+                self._total_tokens -= message.get("_tokens", 0)
+            self.global_context.extendleft(reversed(kept_logs))
+
             # Add context management info
+            status_content = f"📊 Context optimized: {self._total_tokens}/{self.max_tokens} tokens"
             self.global_context.append({
-                "role": "system", 
-                "content": f"📊 Context optimized: {self._calculate_total_tokens()}/{self.max_tokens} tokens"
+                "role": "system",
+                "content": status_content,
+                "_tokens": self._estimate_message_tokens("system", status_content)
             })
+            self._total_tokens += self.global_context[-1]["_tokens"]
             
             print(f"✅ Context optimized: {self._calculate_total_tokens()}/{self.max_tokens} tokens")
 
@@ -455,7 +987,7 @@ def validate_categories(main_categories, sub_categories):
     
     if main_categories:
         for category in main_categories:
-            if category in MAIN_CATEGORIES:
+            if category in MAIN_CATEGORIES_SET:
                 validated_main.append(category)
             else:
                 unknown_main_count += 1
@@ -466,70 +998,56 @@ def validate_categories(main_categories, sub_categories):
     
     if sub_categories:
         for category in sub_categories:
-            if category in SUB_CATEGORIES:
+            if category in SUB_CATEGORIES_SET:
                 validated_sub.append(category)
             else:
                 unknown_sub_count += 1
     
     return validated_main, unknown_main_count, validated_sub, unknown_sub_count
 
-def format_categories_for_display(categories, category_type, known_categories):
+def format_categories_for_display(categories, category_type, known_categories_set):
     """
     Format categories for display with smart logic for nulls, unknowns, etc.
-    
+
     Args:
         categories: List of category strings
         category_type: String "Main-Category" or "Sub-Category"
-        known_categories: List of known valid categories for this type
-    
+        known_categories_set: frozenset of known valid categories for this type
+                              (pass MAIN_CATEGORIES_SET / SUB_CATEGORIES_SET)
+
     Returns:
         str: Formatted category string for display
     """
+    assert isinstance(known_categories_set, (set, frozenset))
+
     if not categories:
         return f"{category_type}: null"
     
     # Filter out "null" strings and get only valid categories
     actual_categories = [cat for cat in categories if cat != "null" and cat.strip()]
-    
+
     if not actual_categories:
         return f"{category_type}: null"
-    
-    validated_categories = []
-    unknown_count = 0
-    
-    for category in actual_categories:
-        if category in known_categories:
-            validated_categories.append(category)
-        else:
-            unknown_count += 1
-    
+
+    # One ordered pass with O(1) set membership; unknowns are just the rest
+    validated_categories = [cat for cat in actual_categories if cat in known_categories_set]
+    unknown_count = len(actual_categories) - len(validated_categories)
+
     # Format the result
     if validated_categories and unknown_count == 0:
         # Only valid categories
-        if len(validated_categories) == 1:
-            return f"{category_type}: {validated_categories[0]}"
-        else:
-            categories_str = ", ".join(validated_categories)
-            return f"{category_type}: {categories_str}"
-    elif not validated_categories and unknown_count > 0:
+        return f"{category_type}: {', '.join(validated_categories)}"
+    elif not validated_categories:
         # Only unknown categories
         if unknown_count == 1:
             return f"{category_type}: unknown"
         else:
             return f"{category_type}: other + {unknown_count}"
     else:
-        # Mixed valid and unknown
-        result = f"{category_type}: "
-        if validated_categories:
-            result += ", ".join(validated_categories)
-        if unknown_count > 0:
-            if validated_categories:
-                result += ", "
-            if unknown_count == 1:
-                result += "unknown"
-            else:
-                result += f"other + {unknown_count}"
-        return result
+        # Mixed valid and unknown - assemble the parts and join once
+        parts = list(validated_categories)
+        parts.append("unknown" if unknown_count == 1 else f"other + {unknown_count}")
+        return f"{category_type}: {', '.join(parts)}"
 
 # --- 3. AI Configuration Management Functions ---
 
@@ -542,7 +1060,7 @@ def ensure_gamai_config():
     # Create config.json if it doesn't exist
     if not os.path.exists(GAMAI_CONFIG_FILE):
         with open(GAMAI_CONFIG_FILE, 'w', encoding='utf-8') as f:
-            json.dump(DEFAULT_AI_CONFIG, f, indent=4, ensure_ascii=False)
+            f.write(_json_dumps(DEFAULT_AI_CONFIG))
     
     return True
 
@@ -550,8 +1068,8 @@ def load_gamai_config():
     """Load GAMAI configuration from file"""
     try:
         ensure_gamai_config()
-        with open(GAMAI_CONFIG_FILE, 'r', encoding='utf-8') as f:
-            config = json.load(f)
+        with open(GAMAI_CONFIG_FILE, 'rb') as f:
+            config = _json_loads(f.read())
             # Ensure all required keys exist
             for key, value in DEFAULT_AI_CONFIG.items():
                 if key not in config:
@@ -566,7 +1084,9 @@ def save_gamai_config(config):
     try:
         ensure_gamai_config()
         with open(GAMAI_CONFIG_FILE, 'w', encoding='utf-8') as f:
-            json.dump(config, f, indent=4, ensure_ascii=False)
+            f.write(_json_dumps(config))
+        # Key or model names may have changed; rebuild on next use
+        invalidate_gamai_model_cache()
         return True
     except Exception as e:
         print(f"Error saving GAMAI config: {e}")
@@ -585,9 +1105,28 @@ def is_gamai_configured():
 
 # --- 4. Data Model ---
 
+# GameInfo objects with a manifest write still pending on their debounce timer
+_PENDING_MANIFEST_SAVES = set()
+
+def flush_pending_manifests():
+    """Write out any manifests still waiting on their debounce timer"""
+    for game in list(_PENDING_MANIFEST_SAVES):
+        game._flush_manifest()
+
 class GameInfo:
     """Data class for game information with enhanced metadata"""
-    
+
+    # One instance per game stays resident for the whole session; slots drop
+    # the per-instance __dict__ so large libraries stay compact. Identity
+    # hashing is unaffected (_PENDING_MANIFEST_SAVES relies on it).
+    __slots__ = ('name', 'version', 'type', 'players', 'folder_path',
+                 'icon_path', 'main_categories', 'sub_categories',
+                 'time_played', 'edits', 'played_times', 'rating', 'feedback',
+                 '_dirty', '_flush_timer')
+
+    # Debounce interval so bursts of edits coalesce into a single write (ms)
+    MANIFEST_FLUSH_INTERVAL_MS = 500
+
     def __init__(self, name, version, folder_path, icon_path=None, game_type="2D", players="1", main_categories=None, sub_categories=None, time_played=None, edits=None, played_times=None, rating=None, feedback=None):
         self.name = name if name else "Unknown Game"
         self.version = version if version else "N/A"
@@ -606,6 +1145,9 @@ class GameInfo:
         self.rating = rating if rating is not None else None
         # Feedback field - array of feedback strings (max 10, system-only)
         self.feedback = feedback if feedback is not None else []
+        # Manifest write debouncing state
+        self._dirty = False
+        self._flush_timer = None  # Created lazily on first save
     
     def get_manifest_data(self):
         """Get complete manifest data including auto-tracking fields"""
@@ -642,9 +1184,9 @@ class GameInfo:
     
     def update_metadata(self, game_type=None, players=None, main_categories=None, sub_categories=None):
         """Update game metadata fields"""
-        if game_type and game_type in ["2D", "3D"]:
+        if game_type and game_type in _VALID_TYPES:
             self.type = game_type
-        if players and players in ["1", "2"]:
+        if players and players in _VALID_PLAYERS:
             self.players = players
         # NEW: Update categories
         if main_categories is not None:
@@ -707,16 +1249,138 @@ class GameInfo:
         return False
     
     def save_manifest(self):
-        """Save current game info to manifest.json"""
+        """Schedule a manifest write - rapid successive edits coalesce into one write"""
+        self._dirty = True
+        _PENDING_MANIFEST_SAVES.add(self)
+        if self._flush_timer is None:
+            self._flush_timer = QTimer()
+            self._flush_timer.setSingleShot(True)
+            self._flush_timer.setInterval(self.MANIFEST_FLUSH_INTERVAL_MS)
+            self._flush_timer.timeout.connect(self._flush_manifest)
+        self._flush_timer.start()
+
+    def _flush_manifest(self):
+        """Write the manifest atomically via a temp file + os.replace"""
+        if not self._dirty:
+            return
+        self._dirty = False
+        _PENDING_MANIFEST_SAVES.discard(self)
         try:
-            with open(self.manifest_path, 'w', encoding='utf-8') as f:
-                json.dump(self.get_manifest_data(), f, indent=4)
+            data = _json_dumps(self.get_manifest_data()).encode('utf-8')
+            tmp_path = self.manifest_path.with_suffix('.json.tmp')
+            with open(tmp_path, 'wb', buffering=io.DEFAULT_BUFFER_SIZE * 8) as f:
+                f.write(data)
+            os.replace(tmp_path, self.manifest_path)
         except Exception as e:
             print(f"Error saving manifest: {e}")
 
 
 # --- 2. Service Layer ---
 
+# Filename sanitizer for game folders - compiled once, strips anything
+# outside [A-Za-z0-9 _-] in a single C-level pass.
+_NAME_SANITIZER_RE = re.compile(r'[^\w \-]+')
+
+def _sanitize_name(name, fallback='game'):
+    """Sanitize a game name for folder creation"""
+    return _NAME_SANITIZER_RE.sub('', name).rstrip() or fallback
+
+# Default index.html for newly created games - parsed once at import time.
+# string.Template keeps the CSS braces literal (no doubling needed).
+_INDEX_HTML_TEMPLATE = string.Template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>$title</title>
+    <style>
+        body {
+            margin: 0;
+            padding: 20px;
+            font-family: Arial, sans-serif;
+            background-color: #2a2a2a;
+            color: white;
+            display: flex;
+            justify-content: center;
+            align-items: center;
+            height: 100vh;
+        }
+        .container {
+            text-align: center;
+        }
+        h1 {
+            color: #E5E5E5;
+        }
+        .message {
+            margin: 20px 0;
+            font-size: 18px;
+        }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>$title</h1>
+        <div class="message">
+            Welcome to your new HTML5 game!<br>
+            Start coding your game here...
+        </div>
+    </div>
+</body>
+</html>""")
+
+def _build_default_manifest(name, version, game_type="2D", players="1",
+                            main_categories=None, sub_categories=None):
+    """Manifest dict for a freshly created/imported game"""
+    return {
+        "name": name,
+        "version": version,
+        "type": game_type,  # Game type (2D/3D)
+        "players": players,  # Number of players (1/2)
+        # Categories with null guidance (3 nulls for each)
+        "main_categories": main_categories if main_categories is not None else ["null", "null", "null"],
+        "sub_categories": sub_categories if sub_categories is not None else ["null", "null", "null"],
+        # Auto-tracking fields - system only, start with defaults
+        "time_played": {"minutes": 0, "hours": 0, "days": 0, "weeks": 0, "months": 0},
+        "edits": 0,
+        "played_times": 0,  # Game launch count tracking
+        "icon": "icon.png",
+        "created": datetime.now().isoformat()
+    }
+
+# All GameInfo-relevant manifest fields, plucked in one place
+_ManifestFields = collections.namedtuple('_ManifestFields', [
+    'name', 'version', 'game_type', 'players', 'main_categories',
+    'sub_categories', 'time_played', 'edits', 'played_times', 'rating',
+    'feedback', 'icon_file'
+])
+
+def _extract_manifest_fields(manifest, default_name):
+    """Pluck the needed manifest fields with backward-compatible defaults"""
+    game_type = manifest.get("type", "2D")
+    players = manifest.get("players", "1")
+    # Validate game_type and players
+    if game_type not in _VALID_TYPES:
+        game_type = "2D"
+    if players not in _VALID_PLAYERS:
+        players = "1"
+
+    return _ManifestFields(
+        name=manifest.get("name", default_name) or default_name,
+        version=manifest.get("version", "N/A") or "N/A",
+        game_type=game_type,
+        players=players,
+        # Categories default to 3 nulls for old games
+        main_categories=manifest.get("main_categories") or ["null", "null", "null"],
+        sub_categories=manifest.get("sub_categories") or ["null", "null", "null"],
+        # Auto-tracking fields - backward compatible defaults for old games
+        time_played=manifest.get("time_played") or {"minutes": 0, "hours": 0, "days": 0, "weeks": 0, "months": 0},
+        edits=manifest.get("edits", 0) or 0,
+        played_times=manifest.get("played_times", 0) or 0,
+        rating=manifest.get("rating", None),  # 1-5 or None for unrated
+        feedback=manifest.get("feedback") or [],  # System-only, max 10 items
+        icon_file=manifest.get("icon", "icon.png"),
+    )
+
 class GameService:
     """Service for discovering and managing games"""
     
@@ -724,7 +1388,25 @@ class GameService:
         # Use absolute path for consistency
         self.games_folder = Path(os.getcwd()) / games_folder
         self._ensure_games_folder()
-    
+        # Extra per-file verification I/O (access checks, stats, readbacks)
+        # only runs when explicitly requested
+        self._debug = os.environ.get("GAMEBOX_DEBUG") == "1"
+        # GameInfo cache keyed by folder -> (manifest st_mtime_ns, GameInfo);
+        # unchanged games skip parsing and validation on rediscovery
+        self._game_info_cache = {}
+        # Deletions are staged into .trash with a rename, then cleaned up off
+        # the UI thread; a single worker keeps the I/O serialized
+        self._trash_folder = self.games_folder / ".trash"
+        self._deleter = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="game-delete")
+        self._purge_trash()
+
+    def _purge_trash(self):
+        """Queue removal of leftover staged deletions from previous runs"""
+        if self._trash_folder.is_dir():
+            for entry in self._trash_folder.iterdir():
+                self._deleter.submit(shutil.rmtree, entry, ignore_errors=True)
+
     def _ensure_games_folder(self):
         """Create Games folder if it doesn't exist"""
         self.games_folder.mkdir(exist_ok=True)
@@ -732,14 +1414,26 @@ class GameService:
     def discover_games(self):
         """Scan Games folder and return list of valid games"""
         games = []
-        
+
+        # Flush any debounced manifest writes so the scan reads current data
+        flush_pending_manifests()
+
         try:
-            # Only iterate one level deep
-            for game_folder in self.games_folder.iterdir():
-                if game_folder.is_dir():
-                    game_info = self._load_game(game_folder)
-                    if game_info and game_info.is_valid():
-                        games.append(game_info)
+            # Only iterate one level deep; scandir's DirEntry carries the type
+            # from the directory read itself, so is_dir() needs no extra stat
+            with os.scandir(self.games_folder) as entries:
+                game_folders = [Path(entry.path) for entry in entries
+                                if entry.is_dir(follow_symlinks=False)
+                                and not entry.name.startswith('.')]
+
+            # Loading is I/O-bound (manifest open/read/parse), so overlap the
+            # disk waits across folders with a thread pool
+            if game_folders:
+                max_workers = min(32, (os.cpu_count() or 1) * 4, len(game_folders))
+                with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    for game_info in executor.map(self._load_game, game_folders):
+                        if game_info and game_info.is_valid():
+                            games.append(game_info)
             
             # Sort by name
             games.sort(key=lambda g: g.name.lower())
@@ -754,56 +1448,59 @@ class GameService:
         """Load game info from folder with enhanced metadata"""
         try:
             manifest_path = game_folder / "manifest.json"
-            
+
+            # Unchanged manifest: reuse the previously built GameInfo
+            try:
+                manifest_mtime = os.stat(manifest_path).st_mtime_ns
+            except OSError:
+                manifest_mtime = None
+            if manifest_mtime is not None:
+                cached = self._game_info_cache.get(game_folder)
+                if cached and cached[0] == manifest_mtime:
+                    return cached[1]
+
             # Load or create manifest
-            manifest = self._load_or_create_manifest(manifest_path, game_folder.name)
+            # Discovery is read-only: missing/broken manifests get in-memory
+            # defaults without a write-back
+            manifest = self._load_or_create_manifest(manifest_path, game_folder.name,
+                                                     create_if_missing=False)
             
             # Ensure manifest is not None
             if manifest is None:
                 print(f"Warning: Failed to load manifest for {game_folder}")
                 return None
             
-            name = manifest.get("name", game_folder.name) or game_folder.name
-            version = manifest.get("version", "N/A") or "N/A"
-            game_type = manifest.get("type", "2D")  # NEW: Read type, default to 2D
-            players = manifest.get("players", "1")  # NEW: Read players, default to 1
-            # NEW: Read categories from manifest (backward compatibility)
-            main_categories = manifest.get("main_categories") or ["null", "null", "null"]  # NEW: Default to 3 nulls for old games
-            sub_categories = manifest.get("sub_categories") or ["null", "null", "null"]      # NEW: Default to 3 nulls for old games
-            # Auto-tracking fields - read from manifest with backward compatibility
-            time_played = manifest.get("time_played") or {"minutes": 0, "hours": 0, "days": 0, "weeks": 0, "months": 0}  # Default to 0 for old games
-            edits = manifest.get("edits", 0) or 0  # Default to 0 for old games
-            played_times = manifest.get("played_times", 0) or 0  # NEW: Default to 0 for old games
-            rating = manifest.get("rating", None)  # NEW: Rating (1-5 or None for unrated)
-            feedback = manifest.get("feedback") or []  # NEW: Feedback array (system-only, max 10 items)
-            icon_file = manifest.get("icon", "icon.png")
-            
-            # Validate game_type and players
-            if game_type not in ["2D", "3D"]:
-                game_type = "2D"
-            if players not in ["1", "2"]:
-                players = "1"
-            
+            fields = _extract_manifest_fields(manifest, game_folder.name)
+
             # Get icon path if exists (with null safety check)
             icon_path = None
-            if icon_file:  # Ensure icon_file is not None
-                icon_path = game_folder / icon_file
-                icon_path = icon_path if icon_path.exists() else None
-            
-            return GameInfo(name, version, game_folder, icon_path, game_type=game_type, players=players, 
-                          main_categories=main_categories, sub_categories=sub_categories, 
-                          time_played=time_played, edits=edits, played_times=played_times, rating=rating, feedback=feedback)
+            if fields.icon_file:  # Ensure icon_file is not None
+                icon_path = game_folder / fields.icon_file
+                # lexists: one lstat, no symlink-target follow needed here
+                icon_path = icon_path if os.path.lexists(icon_path) else None
+
+            game_info = GameInfo(fields.name, fields.version, game_folder, icon_path,
+                          game_type=fields.game_type, players=fields.players,
+                          main_categories=fields.main_categories, sub_categories=fields.sub_categories,
+                          time_played=fields.time_played, edits=fields.edits,
+                          played_times=fields.played_times, rating=fields.rating, feedback=fields.feedback)
+            if manifest_mtime is not None:
+                self._game_info_cache[game_folder] = (manifest_mtime, game_info)
+            return game_info
             
         except Exception as e:
             print(f"Error loading game from {game_folder}: {e}")
             return None
     
-    def _load_or_create_manifest(self, manifest_path, default_name):
-        """Load manifest.json or create default"""
+    def _load_or_create_manifest(self, manifest_path, default_name, create_if_missing=True):
+        """Load manifest.json or build a default; write it back only when asked"""
         if manifest_path.exists():
             try:
-                with open(manifest_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                # Single stat() keys the cache - unchanged manifests skip read + parse
+                stat_result = os.stat(manifest_path)
+                return _read_manifest_cached(str(manifest_path),
+                                             stat_result.st_mtime_ns,
+                                             stat_result.st_size)
             except:
                 # If loading fails, fall through to create default
                 pass
@@ -822,435 +1519,321 @@ class GameService:
             "created": datetime.now().isoformat()
         }
         
-        try:
-            # Write the default manifest back to the file
-            with open(manifest_path, 'w', encoding='utf-8') as f:
-                json.dump(default_manifest, f, indent=4) # Use indent=4 for readability
-        except Exception as e:
-            print(f"Warning: Could not create manifest file at {manifest_path}. Error: {e}")
+        if create_if_missing:
+            try:
+                # Write the default manifest back to the file; compact
+                # separators since this is a machine-generated bootstrap
+                with open(manifest_path, 'w', encoding='utf-8') as f:
+                    f.write(_json_dumps_compact(default_manifest))
+            except Exception as e:
+                print(f"Warning: Could not create manifest file at {manifest_path}. Error: {e}")
         
         return default_manifest
     
     def create_game(self, name, version, icon_data=None, game_type="2D", players="1", main_categories=None, sub_categories=None):
         """Create a new game folder with files"""
         try:
-            print(f"\n{'='*60}")
-            print(f"CREATING NEW GAME: {name} v{version}")
-            print(f"{'='*60}")
-            
+            _log.debug("CREATING NEW GAME: %s v%s", name, version)
+
             # Sanitize game name for folder creation
-            safe_name = "".join(c for c in name if c.isalnum() or c in (' ', '-', '_')).rstrip()
-            if not safe_name:
-                safe_name = "game"
-            
-            game_folder = self.games_folder / safe_name
-            print(f"Game folder path: {game_folder.absolute()}")
-            print(f"Games folder: {self.games_folder.absolute()}")
-            
+            safe_name = _sanitize_name(name)
+            original_safe_name = safe_name
+
             # Ensure games folder exists
-            print(f"Creating games folder if not exists...")
+            _log.debug("Games folder: %s", self.games_folder.absolute())
             self.games_folder.mkdir(exist_ok=True)
-            print(f"Games folder exists: {self.games_folder.exists()}")
-            print(f"Games folder readable: {os.access(self.games_folder, os.R_OK)}")
-            print(f"Games folder writable: {os.access(self.games_folder, os.W_OK)}")
-            
-            # Create game folder with conflict handling (same as import_game)
-            print(f"Creating game folder: {game_folder}")
-            if game_folder.exists():
-                print(f"Game folder already exists - handling conflict")
-                # Handle existing folder conflicts like import_game
-                counter = 1
-                while True:
-                    new_name = f"{safe_name}_{counter}"
-                    candidate_folder = self.games_folder / new_name
-                    if not candidate_folder.exists():
-                        game_folder = candidate_folder
-                        # Update the safe_name for manifest
-                        safe_name = new_name
-                        break
-                    counter += 1
-                print(f"Using alternative folder name: {safe_name}")
-            
-            # Always create the folder (outside the if/else block like import_game)
+            if self._debug:
+                _log.debug("Games folder exists: %s", self.games_folder.exists())
+                _log.debug("Games folder readable: %s", os.access(self.games_folder, os.R_OK))
+                _log.debug("Games folder writable: %s", os.access(self.games_folder, os.W_OK))
+
+            # Create game folder with conflict handling
+            game_folder, safe_name = self._resolve_unique_folder(safe_name)
+            _log.debug("Game folder path: %s", game_folder.absolute())
+            if safe_name != original_safe_name:
+                _log.debug("Using alternative folder name: %s", safe_name)
             game_folder.mkdir(exist_ok=True)
-            print(f"Game folder created: {game_folder.exists()}")
-            print(f"Game folder readable: {os.access(game_folder, os.R_OK)}")
-            print(f"Game folder writable: {os.access(game_folder, os.W_OK)}")
-            
-            # Create manifest.json with enhanced metadata
-            print(f"\n--- CREATING MANIFEST.JSON ---")
+            if self._debug:
+                _log.debug("Game folder created: %s", game_folder.exists())
+                _log.debug("Game folder readable: %s", os.access(game_folder, os.R_OK))
+                _log.debug("Game folder writable: %s", os.access(game_folder, os.W_OK))
+
             # For Surprise games, update the name to include counter suffix if conflict occurred
             display_name = name
-            if safe_name != "".join(c for c in name if c.isalnum() or c in (' ', '-', '_')).rstrip():
-                # Conflict occurred, use the updated name from safe_name
+            if safe_name != original_safe_name:
                 display_name = safe_name.replace('_', ' ')  # Convert back to display format
-                
-            manifest = {
-                "name": display_name,
-                "version": version,
-                "type": game_type,  # NEW: Game type (2D/3D)
-                "players": players,  # NEW: Number of players (1/2)
-                # NEW: Categories with null guidance (3 nulls for each)
-                "main_categories": main_categories if main_categories is not None else ["null", "null", "null"],
-                "sub_categories": sub_categories if sub_categories is not None else ["null", "null", "null"],
-                # Auto-tracking fields - system only, start with defaults
-                "time_played": {"minutes": 0, "hours": 0, "days": 0, "weeks": 0, "months": 0},
-                "edits": 0,
-                "played_times": 0,  # NEW: Game launch count tracking
-                "icon": "icon.png",
-                "created": datetime.now().isoformat()
-            }
-            manifest_path = game_folder / "manifest.json"
-            print(f"Manifest path: {manifest_path.absolute()}")
-            print(f"Manifest folder permissions: {oct(os.stat(game_folder).st_mode)[-3:]}")
+
+            manifest = _build_default_manifest(display_name, version, game_type, players,
+                                               main_categories, sub_categories)
+            index_html = _INDEX_HTML_TEMPLATE.substitute(title=name)
+            icon_path = self._write_game_files(game_folder, manifest, index_html)
+
+            _log.debug("=== GAME CREATION COMPLETED SUCCESSFULLY ===")
+            _log.debug("Game: %s v%s", display_name, version)
+            _log.debug("Location: %s", game_folder.absolute())
+            _log.debug("Files created: 3 (manifest.json, index.html, icon.png)")
+
+            return GameInfo(display_name, version, game_folder, icon_path, game_type=game_type, players=players, 
+                          main_categories=main_categories, sub_categories=sub_categories, 
+                          time_played={"minutes": 0, "hours": 0, "days": 0, "weeks": 0, "months": 0}, edits=0)
             
-            try:
-                with open(manifest_path, 'w', encoding='utf-8') as f:
-                    json.dump(manifest, f, indent=4)
-                print(f"✓ Manifest created successfully: {manifest_path.exists()}")
-                
-                # Verify manifest file
-                if manifest_path.exists():
-                    manifest_size = manifest_path.stat().st_size
-                    print(f"  - File size: {manifest_size} bytes")
-                    print(f"  - File readable: {os.access(manifest_path, os.R_OK)}")
-                    print(f"  - File writable: {os.access(manifest_path, os.W_OK)}")
+        except Exception as e:
+            _log.error("Error creating game: %s", e, exc_info=True)
+            return None
+
+    def _resolve_unique_folder(self, safe_name):
+        """Resolve (folder, name) for safe_name, appending _N on conflicts"""
+        game_folder = self.games_folder / safe_name
+        if game_folder.exists():
+            counter = 1
+            while True:
+                new_name = f"{safe_name}_{counter}"
+                candidate_folder = self.games_folder / new_name
+                if not candidate_folder.exists():
+                    return candidate_folder, new_name
+                counter += 1
+        return game_folder, safe_name
+
+    def _write_game_files(self, game_folder, manifest, html_content):
+        """Write manifest.json, index.html and icon.png into game_folder.
+
+        Shared tail of create_game/import_game; returns the icon path.
+        """
+        # Create manifest.json with enhanced metadata
+        _log.debug("--- CREATING MANIFEST.JSON ---")
+        manifest_path = game_folder / "manifest.json"
+        _log.debug("Manifest path: %s", manifest_path.absolute())
+        if self._debug:
+            _log.debug("Manifest folder permissions: %s", oct(os.stat(game_folder).st_mode)[-3:])
+
+        try:
+            with open(manifest_path, 'w', encoding='utf-8') as f:
+                f.write(_json_dumps(manifest))
+            _log.debug("✓ Manifest created successfully")
+            if self._debug:
+                self._verify_written_file(manifest_path)
+        except Exception as manifest_error:
+            _log.error("✗ ERROR creating manifest.json: %s", manifest_error)
+            raise
+
+        # Create index.html
+        _log.debug("--- CREATING INDEX.HTML ---")
+        index_path = game_folder / "index.html"
+        _log.debug("Index.html path: %s", index_path.absolute())
+
+        try:
+            if isinstance(html_content, str):
+                # Fast path: content already in memory, single write
+                _log.debug("HTML content length: %s characters", len(html_content))
+                index_path.write_text(html_content, encoding='utf-8')
+            else:
+                # Path or file-like: stream in 1 MB chunks so multi-megabyte
+                # imports never hold two copies of the HTML in memory
+                if hasattr(html_content, 'read'):
+                    src_file, close_src = html_content, False
                 else:
-                    print("✗ ERROR: Manifest file does not exist after creation!")
-                    
-            except Exception as manifest_error:
-                print(f"✗ ERROR creating manifest.json: {manifest_error}")
-                raise manifest_error
-            
-            # Create default index.html
-            print(f"\n--- CREATING INDEX.HTML ---")
-            index_html = """<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{}</title>
-    <style>
-        body {{
-            margin: 0;
-            padding: 20px;
-            font-family: Arial, sans-serif;
-            background-color: #2a2a2a;
-            color: white;
-            display: flex;
-            justify-content: center;
-            align-items: center;
-            height: 100vh;
-        }}
-        .container {{
-            text-align: center;
-        }}
-        h1 {{
-            color: #E5E5E5;
-        }}
-        .message {{
-            margin: 20px 0;
-            font-size: 18px;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>{}</h1>
-        <div class="message">
-            Welcome to your new HTML5 game!<br>
-            Start coding your game here...
-        </div>
-    </div>
-</body>
-</html>""".format(name, name)
-            
-            index_path = game_folder / "index.html"
-            print(f"Index.html path: {index_path.absolute()}")
-            print(f"HTML content length: {len(index_html)} characters")
-            print(f"Game folder writable: {os.access(game_folder, os.W_OK)}")
-            
-            try:
-                with open(index_path, 'w', encoding='utf-8') as f:
-                    f.write(index_html)
-                print(f"✓ Index.html created successfully: {index_path.exists()}")
-                
-                # Verify index.html file
-                if index_path.exists():
-                    index_size = index_path.stat().st_size
-                    print(f"  - File size: {index_size} bytes")
-                    print(f"  - File readable: {os.access(index_path, os.R_OK)}")
-                    print(f"  - File writable: {os.access(index_path, os.W_OK)}")
-                    
-                    # Read back first few lines to verify content
-                    with open(index_path, 'r', encoding='utf-8') as f:
-                        first_line = f.readline().strip()
-                    print(f"  - First line: {first_line}")
-                else:
-                    print("✗ ERROR: index.html file does not exist after creation!")
-                    
-            except Exception as html_error:
-                print(f"✗ ERROR creating index.html: {html_error}")
-                import traceback
-                traceback.print_exc()
-                raise html_error
-            
-            # Create default icon.png
-            print(f"\n--- CREATING ICON.PNG ---")
-            icon_path = game_folder / "icon.png"
-            print(f"Icon path: {icon_path.absolute()}")
-            
-            try:
-                self._create_default_icon(icon_path)
-                print(f"✓ Icon created: {icon_path.exists()}")
-                
-                # Verify icon file
-                if icon_path.exists():
-                    icon_size = icon_path.stat().st_size
-                    print(f"  - File size: {icon_size} bytes")
-                    print(f"  - File readable: {os.access(icon_path, os.R_OK)}")
-                else:
-                    print("✗ ERROR: Icon file does not exist after creation!")
-                    
-            except Exception as icon_error:
-                print(f"✗ ERROR creating icon.png: {icon_error}")
-                raise icon_error
-            
-            print(f"\n--- FINAL VERIFICATION ---")
-            print(f"Game folder contents:")
+                    src_file, close_src = open(html_content, 'rb'), True
+                try:
+                    if isinstance(src_file.read(0), bytes):
+                        dst = open(index_path, 'wb')
+                    else:
+                        dst = open(index_path, 'w', encoding='utf-8')
+                    with dst:
+                        shutil.copyfileobj(src_file, dst, 1 << 20)
+                finally:
+                    if close_src:
+                        src_file.close()
+            _log.debug("✓ Index.html created successfully")
+            if self._debug:
+                self._verify_written_file(index_path)
+        except Exception as html_error:
+            _log.error("✗ ERROR creating index.html: %s", html_error)
+            raise
+
+        # Create default icon.png
+        _log.debug("--- CREATING ICON.PNG ---")
+        icon_path = game_folder / "icon.png"
+        _log.debug("Icon path: %s", icon_path.absolute())
+
+        try:
+            self._create_default_icon(icon_path)
+            _log.debug("✓ Icon created")
+            if self._debug:
+                self._verify_written_file(icon_path)
+        except Exception as icon_error:
+            _log.error("✗ ERROR creating icon.png: %s", icon_error)
+            raise
+
+        if self._debug:
+            _log.debug("--- FINAL VERIFICATION ---")
+            _log.debug("Game folder contents:")
             for file in game_folder.iterdir():
-                print(f"  - {file.name} ({file.stat().st_size} bytes)")
-            
-            print(f"\n=== GAME CREATION COMPLETED SUCCESSFULLY ===")
-            print(f"Game: {display_name} v{version}")
-            print(f"Location: {game_folder.absolute()}")
-            print(f"Files created: 3 (manifest.json, index.html, icon.png)")
-            
-            return GameInfo(display_name, version, game_folder, icon_path, game_type=game_type, players=players, 
-                          main_categories=main_categories, sub_categories=sub_categories, 
-                          time_played={"minutes": 0, "hours": 0, "days": 0, "weeks": 0, "months": 0}, edits=0)
-            
-        except Exception as e:
-            print(f"Error creating game: {e}")
-            import traceback
-            traceback.print_exc()
-            return None
-    
+                _log.debug("  - %s (%s bytes)", file.name, file.stat().st_size)
+
+        return icon_path
+
+    def _verify_written_file(self, path, show_first_line=False):
+        """Debug-only stat/readback verification of a freshly written file"""
+        if path.exists():
+            _log.debug("  - File size: %s bytes", path.stat().st_size)
+            _log.debug("  - File readable: %s", os.access(path, os.R_OK))
+            _log.debug("  - File writable: %s", os.access(path, os.W_OK))
+            if show_first_line:
+                with open(path, 'r', encoding='utf-8') as f:
+                    first_line = f.readline().strip()
+                _log.debug("  - First line: %s", first_line[:50])
+        else:
+            _log.error("✗ ERROR: %s does not exist after creation!", path.name)
+
+    # Encoded default icon PNG, rendered once per process (the pixmap is
+    # identical for every game, so repeat paint/encode work is wasted)
+    _DEFAULT_ICON_BYTES = None
+
     def _create_default_icon(self, icon_path):
         """Create a default game icon"""
-        pixmap = QPixmap(200, 200)
-        pixmap.fill(QColor(58, 58, 58))  # #3a3a3a
-        
-        painter = QPainter(pixmap)
-        painter.setPen(QColor(255, 255, 255))
-        font = QFont("Arial", 48, QFont.Bold)
-        painter.setFont(font)
-        painter.drawText(pixmap.rect(), Qt.AlignCenter, "+")
-        painter.end()
-        
-        pixmap.save(str(icon_path))
-    
-    def import_game(self, html_content, name, version, main_categories=None, sub_categories=None):
-        """Import a game from external HTML content"""
+        if GameService._DEFAULT_ICON_BYTES is None:
+            pixmap = QPixmap(200, 200)
+            pixmap.fill(QColor(58, 58, 58))  # #3a3a3a
+
+            painter = QPainter(pixmap)
+            painter.setPen(QColor(255, 255, 255))
+            font = QFont("Arial", 48, QFont.Bold)
+            painter.setFont(font)
+            painter.drawText(pixmap.rect(), Qt.AlignCenter, "+")
+            painter.end()
+
+            buf = QBuffer()
+            buf.open(QBuffer.WriteOnly)
+            pixmap.save(buf, 'PNG')
+            GameService._DEFAULT_ICON_BYTES = bytes(buf.data())
+            buf.close()
+
+        Path(icon_path).write_bytes(GameService._DEFAULT_ICON_BYTES)
+
+    def import_game(self, html_source, name, version, main_categories=None, sub_categories=None):
+        """Import a game from external HTML content.
+
+        html_source may be the HTML as a str, a path to an HTML file, or an
+        open file object; paths and file objects are streamed to disk.
+        """
         try:
-            print(f"\n{'='*60}")
-            print(f"IMPORTING GAME: {name} v{version}")
-            print(f"{'='*60}")
+            _log.debug("IMPORTING GAME: %s v%s", name, version)
             
             # Sanitize game name for folder creation
-            safe_name = "".join(c for c in name if c.isalnum() or c in (' ', '-', '_')).rstrip()
-            if not safe_name:
-                safe_name = "imported_game"
-            
-            game_folder = self.games_folder / safe_name
-            print(f"Game folder path: {game_folder.absolute()}")
+            safe_name = _sanitize_name(name, fallback='imported_game')
             
             # Ensure games folder exists
             self.games_folder.mkdir(exist_ok=True)
-            
-            # Handle existing folder conflicts
-            if game_folder.exists():
-                # Try to find a unique name
-                counter = 1
-                while True:
-                    new_name = f"{safe_name}_{counter}"
-                    candidate_folder = self.games_folder / new_name
-                    if not candidate_folder.exists():
-                        game_folder = candidate_folder
-                        break
-                    counter += 1
-                print(f"Original folder name taken, using: {game_folder.name}")
-            
-            # Create game folder
+
+            # Handle existing folder conflicts (manifest keeps the given name)
+            game_folder, folder_name = self._resolve_unique_folder(safe_name)
+            _log.debug("Game folder path: %s", game_folder.absolute())
+            if folder_name != safe_name:
+                _log.debug("Original folder name taken, using: %s", game_folder.name)
             game_folder.mkdir(exist_ok=True)
-            print(f"Game folder created: {game_folder.exists()}")
-            
-            # Create manifest.json with enhanced metadata
-            print(f"\n--- CREATING MANIFEST.JSON ---")
-            manifest = {
-                "name": name,
-                "version": version,
-                "type": "2D",  # Default: 2D game for imported games
-                "players": "1",  # Default: 1 player for imported games
-                "main_categories": main_categories if main_categories is not None else ["null", "null", "null"],  # NEW: Main categories (3 nulls if empty)
-                "sub_categories": sub_categories if sub_categories is not None else ["null", "null", "null"],      # NEW: Sub categories (3 nulls if empty)
-                # Auto-tracking fields - system only, start with defaults
-                "time_played": {"minutes": 0, "hours": 0, "days": 0, "weeks": 0, "months": 0},
-                "edits": 0,
-                "played_times": 0,  # NEW: Game launch count tracking
-                "icon": "icon.png",
-                "created": datetime.now().isoformat()
-            }
-            manifest_path = game_folder / "manifest.json"
-            
-            try:
-                with open(manifest_path, 'w', encoding='utf-8') as f:
-                    json.dump(manifest, f, indent=4)
-                print(f"✓ Manifest created successfully: {manifest_path.exists()}")
-                
-            except Exception as manifest_error:
-                print(f"✗ ERROR creating manifest.json: {manifest_error}")
-                raise manifest_error
-            
-            # Create index.html with imported content
-            print(f"\n--- IMPORTING INDEX.HTML ---")
-            index_path = game_folder / "index.html"
-            print(f"Index.html path: {index_path.absolute()}")
-            print(f"HTML content length: {len(html_content)} characters")
-            
-            try:
-                with open(index_path, 'w', encoding='utf-8') as f:
-                    f.write(html_content)
-                print(f"✓ Index.html imported successfully: {index_path.exists()}")
-                
-                # Verify imported file
-                if index_path.exists():
-                    index_size = index_path.stat().st_size
-                    print(f"  - File size: {index_size} bytes")
-                    
-                    # Read back first few lines to verify content
-                    with open(index_path, 'r', encoding='utf-8') as f:
-                        first_line = f.readline().strip()
-                    print(f"  - First line: {first_line[:50]}...")
-                else:
-                    print("✗ ERROR: index.html file does not exist after import!")
-                    
-            except Exception as html_error:
-                print(f"✗ ERROR importing index.html: {html_error}")
-                raise html_error
-            
-            # Create default icon.png
-            print(f"\n--- CREATING ICON.PNG ---")
-            icon_path = game_folder / "icon.png"
-            print(f"Icon path: {icon_path.absolute()}")
-            
-            try:
-                self._create_default_icon(icon_path)
-                print(f"✓ Icon created: {icon_path.exists()}")
-                
-                # Verify icon file
-                if icon_path.exists():
-                    icon_size = icon_path.stat().st_size
-                    print(f"  - File size: {icon_size} bytes")
-                else:
-                    print("✗ ERROR: Icon file does not exist after creation!")
-                    
-            except Exception as icon_error:
-                print(f"✗ ERROR creating icon.png: {icon_error}")
-                raise icon_error
-            
-            print(f"\n--- FINAL VERIFICATION ---")
-            print(f"Game folder contents:")
-            for file in game_folder.iterdir():
-                print(f"  - {file.name} ({file.stat().st_size} bytes)")
-            
-            print(f"\n=== GAME IMPORT COMPLETED SUCCESSFULLY ===")
-            print(f"Game: {name} v{version}")
-            print(f"Location: {game_folder.absolute()}")
-            print(f"Files created: 3 (manifest.json, index.html, icon.png)")
+            if self._debug:
+                _log.debug("Game folder created: %s", game_folder.exists())
+
+            manifest = _build_default_manifest(name, version,
+                                               main_categories=main_categories,
+                                               sub_categories=sub_categories)
+            icon_path = self._write_game_files(game_folder, manifest, html_source)
+
+            _log.debug("=== GAME IMPORT COMPLETED SUCCESSFULLY ===")
+            _log.debug("Game: %s v%s", name, version)
+            _log.debug("Location: %s", game_folder.absolute())
+            _log.debug("Files created: 3 (manifest.json, index.html, icon.png)")
             
             return GameInfo(name, version, game_folder, icon_path, game_type="2D", players="1", 
                           main_categories=main_categories, sub_categories=sub_categories, 
                           time_played={"minutes": 0, "hours": 0, "days": 0, "weeks": 0, "months": 0}, edits=0)
             
         except Exception as e:
-            print(f"Error importing game: {e}")
-            import traceback
-            traceback.print_exc()
+            _log.error("Error importing game: %s", e, exc_info=True)
             return None
 
     def delete_game(self, game_name):
         """Delete a game folder and all its contents"""
         try:
-            print(f"\n{'='*60}")
-            print(f"DELETING GAME: '{game_name}'")
-            print(f"{'='*60}")
+            _log.debug("DELETING GAME: '%s'", game_name)
             
             # Clean up the game name - remove extra whitespace
             game_name_clean = game_name.strip()
             
             # Get all games to find the one to delete
             games = self.discover_games()
-            game_to_delete = None
-            
-            # First try exact match (case insensitive, trimmed)
-            for game in games:
-                if game.name.strip().lower() == game_name_clean.lower():
-                    game_to_delete = game
-                    break
-            
+            target = game_name_clean.lower()
+
+            # Index by lowercased name once; exact match is a dict lookup
+            # (reversed so duplicate names resolve to the first, as before)
+            by_name = [(game.name.strip().lower(), game) for game in games]
+            game_to_delete = dict(reversed(by_name)).get(target)
+
             # If exact match fails, try partial match for game names with extra whitespace
             if not game_to_delete:
-                for game in games:
-                    if game_name_clean.lower() in game.name.strip().lower() or game.name.strip().lower() in game_name_clean.lower():
+                for lower_name, game in by_name:
+                    if target in lower_name or lower_name in target:
                         game_to_delete = game
                         break
             
             if not game_to_delete:
-                print(f"✗ ERROR: Game '{game_name_clean}' not found")
-                print(f"Available games: {[g.name for g in games]}")
+                _log.error("✗ ERROR: Game '%s' not found", game_name_clean)
+                _log.debug("Available games: %s", [g.name for g in games])
                 return False
             
             # Get the game folder path
             game_folder = game_to_delete.folder_path
-            print(f"Game folder path: {game_folder.absolute()}")
-            print(f"Games folder: {self.games_folder.absolute()}")
-            print(f"Found game to delete: '{game_to_delete.name}' at '{game_folder}'")
+            _log.debug("Game folder path: %s", game_folder.absolute())
+            _log.debug("Games folder: %s", self.games_folder.absolute())
+            _log.debug("Found game to delete: '%s' at '%s'", game_to_delete.name, game_folder)
             
             # Check if the game folder exists
             if not game_folder.exists():
-                print(f"✗ ERROR: Game folder does not exist: {game_folder}")
+                _log.error("✗ ERROR: Game folder does not exist: %s", game_folder)
                 return False
             
-            print(f"Deleting game folder and all contents...")
+            _log.debug("Deleting game folder and all contents...")
             
-            # Delete all files in the game folder
-            import shutil
-            shutil.rmtree(game_folder)
+            # Stage the folder into .trash with an atomic same-filesystem
+            # rename, then remove it in the background; the caller only
+            # waits for the rename
+            self._trash_folder.mkdir(exist_ok=True)
+            staging = self._trash_folder / f"{game_folder.name}.{uuid.uuid4().hex}"
+            game_folder.rename(staging)
+            self._deleter.submit(shutil.rmtree, staging, ignore_errors=True)
+            self._game_info_cache.pop(game_folder, None)
             
             # Verify the folder was deleted
             if game_folder.exists():
-                print(f"✗ ERROR: Game folder still exists after deletion")
+                _log.error("✗ ERROR: Game folder still exists after deletion")
                 return False
             
-            print(f"\n--- FINAL VERIFICATION ---")
-            print(f"Game '{game_to_delete.name}' deleted successfully")
-            print(f"Location: {game_folder.absolute()} (now deleted)")
+            _log.debug("--- FINAL VERIFICATION ---")
+            _log.debug("Game '%s' deleted successfully", game_to_delete.name)
+            _log.debug("Location: %s (now deleted)", game_folder.absolute())
             
-            print(f"\n=== GAME DELETION COMPLETED SUCCESSFULLY ===")
-            print(f"Game: {game_to_delete.name}")
+            _log.debug("=== GAME DELETION COMPLETED SUCCESSFULLY ===")
+            _log.debug("Game: %s", game_to_delete.name)
             
             return True
             
         except Exception as e:
-            print(f"Error deleting game: {e}")
-            import traceback
-            traceback.print_exc()
+            _log.error("Error deleting game: %s", e, exc_info=True)
             return False
 
 
 # --- 2.1. Enhanced Context System Functions ---
 
+@functools.lru_cache(maxsize=32)
+def _read_text_cached(path_str, mtime_ns):
+    """Read a text file, memoized by (path, mtime); mtime_ns keys invalidation"""
+    return Path(path_str).read_text(encoding='utf-8')
+
+# Preformatted "[LINE NNN]: " prefixes for typical file sizes; avoids one
+# f-string format call per line when numbering files for AI context.
+_LINE_PREFIXES = [f"[LINE {i:03d}]: " for i in range(1, 8193)]
+
+@functools.lru_cache(maxsize=64)
 def _format_file_with_line_numbers(content, filename=""):
     """
     Format file content with clear line numbers for AI context.
@@ -1261,8 +1844,10 @@ def _format_file_with_line_numbers(content, filename=""):
     
     Returns:
         str: Content with numbered lines in format [LINE 001]: actual_code
+
+    The same file is re-formatted across many prompts, so results are
+    memoized; unchanged content costs a cache lookup after the first call.
     """
-    lines = content.split('\n')
     formatted_lines = []
     
     # Add file context header
@@ -1272,10 +1857,11 @@ def _format_file_with_line_numbers(content, filename=""):
         formatted_lines.append("When referencing lines, use format: lines X-Y or line X")
         formatted_lines.append("=" * 50)
     
-    # Number each line with clear formatting
-    for i, line in enumerate(lines, 1):
-        line_num = f"{i:03d}"  # Zero-padded 3-digit line numbers
-        formatted_lines.append(f"[LINE {line_num}]: {line}")
+    # Number each line with clear formatting (single join, no per-line appends);
+    # prefixes come from the precomputed table, formatted only past its end
+    formatted_lines.extend(
+        (_LINE_PREFIXES[i] if i < len(_LINE_PREFIXES) else f"[LINE {i + 1:03d}]: ") + line
+        for i, line in enumerate(content.split('\n')))
     
     return '\n'.join(formatted_lines)
 
@@ -1316,8 +1902,8 @@ def _load_enhanced_ai_context(game, selected_text="", start_line=0, end_line=0):
             manifest_path = game.game_dir / "manifest.json"
             if manifest_path.exists():
                 try:
-                    with open(manifest_path, 'r', encoding='utf-8') as f:
-                        context['manifest_content'] = f.read()
+                    context['manifest_content'] = _read_text_cached(
+                        str(manifest_path), manifest_path.stat().st_mtime_ns)
                 except Exception as e:
                     print(f"Warning: Could not load manifest.json: {e}")
             
@@ -1325,21 +1911,21 @@ def _load_enhanced_ai_context(game, selected_text="", start_line=0, end_line=0):
             index_path = game.game_dir / "index.json"
             if index_path.exists():
                 try:
-                    with open(index_path, 'r', encoding='utf-8') as f:
-                        context['index_content'] = f.read()
+                    context['index_content'] = _read_text_cached(
+                        str(index_path), index_path.stat().st_mtime_ns)
                 except Exception as e:
                     print(f"Warning: Could not load index.json: {e}")
         
         # Load main file content (HTML/Python/etc.)
         if game and hasattr(game, 'html_path') and game.html_path and game.html_path.exists():
             try:
-                with open(game.html_path, 'r', encoding='utf-8') as f:
-                    main_content = f.read()
-                    context['main_file_content'] = main_content
-                    context['main_file_with_lines'] = _format_file_with_line_numbers(
-                        main_content, 
-                        game.html_path.name if hasattr(game.html_path, 'name') else "main_file"
-                    )
+                main_content = _read_text_cached(
+                    str(game.html_path), game.html_path.stat().st_mtime_ns)
+                context['main_file_content'] = main_content
+                context['main_file_with_lines'] = _format_file_with_line_numbers(
+                    main_content, 
+                    game.html_path.name if hasattr(game.html_path, 'name') else "main_file"
+                )
             except Exception as e:
                 print(f"Warning: Could not load main file: {e}")
                 context['main_file_content'] = "ERROR: Could not load main file content"
@@ -1351,6 +1937,31 @@ def _load_enhanced_ai_context(game, selected_text="", start_line=0, end_line=0):
     
     return context
 
+# Static prompt sections for _create_ai_context_prompt, interned once at
+# import instead of being rebuilt per prompt
+_HDR_MAIN = "=== AI CODE EDITING CONTEXT ==="
+_HDR_MANIFEST = "\n=== MANIFEST ==="
+_HDR_INDEX = "\n=== INDEX ==="
+_HDR_MAIN_FILE = "\n=== MAIN FILE WITH LINE NUMBERS ==="
+_HDR_ACTIVITY = "\n=== RECENT EDITING ACTIVITY ==="
+_HDR_EDITING = "\n=== EDITING INSTRUCTIONS ==="
+_TOGGLE_INSTRUCTIONS = {
+    "full_file": (
+        "INSTRUCTIONS: Provide complete file content with your changes integrated.\n"
+        "Response format: Return the entire file content with requested modifications."),
+    "specific_lines": (
+        "INSTRUCTIONS: Target specific line ranges for precise modifications.\n"
+        "Response format: Specify line ranges like 'lines 5-10:' followed by new content."),
+}
+_LINE_EDITING_RULES = (
+    "- Use line numbers to target specific modifications\n"
+    "- Reference lines as 'lines X-Y' or 'line X'\n"
+    "- Preserve existing code structure and formatting\n"
+    "- Only modify the specified line ranges")
+_PROMPT_FOOTER = ("\n" + "=" * 60 + "\n"
+                  "Please analyze the context above and provide the requested code modifications.\n"
+                  + "=" * 60)
+
 def _create_ai_context_prompt(context, edit_mode="edit_selected", toggle_mode="specific_lines"):
     """
     Create comprehensive AI prompt with enhanced context.
@@ -1363,10 +1974,7 @@ def _create_ai_context_prompt(context, edit_mode="edit_selected", toggle_mode="s
     Returns:
         str: Formatted prompt for AI processing
     """
-    prompt_parts = []
-    
-    # Header
-    prompt_parts.append("=== AI CODE EDITING CONTEXT ===")
+    prompt_parts = [_HDR_MAIN]
     
     # Game Information
     if context.get('game_info'):
@@ -1378,27 +1986,21 @@ def _create_ai_context_prompt(context, edit_mode="edit_selected", toggle_mode="s
     # Edit Mode and Toggle Instructions
     prompt_parts.append(f"Edit Mode: {edit_mode}")
     prompt_parts.append(f"Toggle Mode: {toggle_mode}")
-    
-    if toggle_mode == "full_file":
-        prompt_parts.append("INSTRUCTIONS: Provide complete file content with your changes integrated.")
-        prompt_parts.append("Response format: Return the entire file content with requested modifications.")
-    else:
-        prompt_parts.append("INSTRUCTIONS: Target specific line ranges for precise modifications.")
-        prompt_parts.append("Response format: Specify line ranges like 'lines 5-10:' followed by new content.")
+    prompt_parts.append(_TOGGLE_INSTRUCTIONS.get(toggle_mode, _TOGGLE_INSTRUCTIONS["specific_lines"]))
     
     # Manifest Context
     if context.get('manifest_content'):
-        prompt_parts.append("\n=== MANIFEST ===")
+        prompt_parts.append(_HDR_MANIFEST)
         prompt_parts.append(context['manifest_content'])
     
     # Index Context  
     if context.get('index_content'):
-        prompt_parts.append("\n=== INDEX ===")
+        prompt_parts.append(_HDR_INDEX)
         prompt_parts.append(context['index_content'])
     
     # File Content with Line Numbers
     if context.get('main_file_with_lines'):
-        prompt_parts.append(f"\n=== MAIN FILE WITH LINE NUMBERS ===")
+        prompt_parts.append(_HDR_MAIN_FILE)
         prompt_parts.append(context['main_file_with_lines'])
         
         # Add selection info if available
@@ -1408,39 +2010,39 @@ def _create_ai_context_prompt(context, edit_mode="edit_selected", toggle_mode="s
             if context.get('selected_content'):
                 prompt_parts.append(context['selected_content'])
     
-    # Recent Activity History
+    # Recent Activity History - maintained as a bounded deque at insertion
+    # time, so this is O(1) regardless of context size
     try:
-        recent_activities = []
-        global_context = GAMAI_CONTEXT.get_context()
-        
-        # Get last 10 activity logs from global context
-        for message in reversed(global_context):
-            if message.get('role') == 'system' and '📝 Activity Log:' in message.get('content', ''):
-                recent_activities.append(message['content'])
-                if len(recent_activities) >= 10:  # Keep only last 10 activities
-                    break
-        
-        if recent_activities:
-            prompt_parts.append("\n=== RECENT EDITING ACTIVITY ===")
-            for activity in reversed(recent_activities):  # Show oldest to newest
-                prompt_parts.append(activity)
+        if GAMAI_CONTEXT.activity_log:
+            prompt_parts.append(_HDR_ACTIVITY)
+            prompt_parts.extend(GAMAI_CONTEXT.activity_log)  # Oldest to newest
     except Exception as e:
         print(f"Warning: Could not load recent activity logs: {e}")
     
     # Specific Instructions for Line-Aware Editing
-    prompt_parts.append("\n=== EDITING INSTRUCTIONS ===")
+    prompt_parts.append(_HDR_EDITING)
     if toggle_mode == "specific_lines":
-        prompt_parts.append("- Use line numbers to target specific modifications")
-        prompt_parts.append("- Reference lines as 'lines X-Y' or 'line X'")
-        prompt_parts.append("- Preserve existing code structure and formatting")
-        prompt_parts.append("- Only modify the specified line ranges")
+        prompt_parts.append(_LINE_EDITING_RULES)
     
-    prompt_parts.append("\n" + "=" * 60)
-    prompt_parts.append("Please analyze the context above and provide the requested code modifications.")
-    prompt_parts.append("=" * 60)
+    prompt_parts.append(_PROMPT_FOOTER)
     
     return '\n'.join(prompt_parts)
 
+# Activity-log writes happen off the click path; one worker keeps them in
+# submission order
+_LOG_EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+    max_workers=1, thread_name_prefix="gamai-log")
+atexit.register(_LOG_EXECUTOR.shutdown, wait=True)
+
+# Operation-type and toggle-mode values come from small fixed sets; intern
+# them so dict hashing and equality checks hit pointer identity
+_OP_EDIT_SELECTED = sys.intern('edit_selected')
+_OP_EDIT_CODE_FULL = sys.intern('edit_code_full')
+_OP_EDIT_CODE_LINES = sys.intern('edit_code_specific_lines')
+_OP_EDIT_CODE_ERROR = sys.intern('edit_code_error')
+_MODE_FULL_FILE = sys.intern('full_file')
+_MODE_SPECIFIC_LINES = sys.intern('specific_lines')
+
 def _log_ai_edit_activity(operation_type, game_name, details):
     """
     Log AI editing activity for enhanced tracking.
@@ -1451,9 +2053,16 @@ def _log_ai_edit_activity(operation_type, game_name, details):
         details (dict): Operation details (lines, mode, etc.)
     """
     try:
-        from datetime import datetime
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        
+        # Reuse the formatted timestamp within the same second; bursty edit
+        # logging otherwise reformats an identical string per call
+        now = int(time.time())
+        if now != _log_ai_edit_activity._last_ts[0]:
+            _log_ai_edit_activity._last_ts[0] = now
+            _log_ai_edit_activity._last_ts[1] = time.strftime(
+                "%Y-%m-%d %H:%M:%S", time.localtime(now))
+        timestamp = _log_ai_edit_activity._last_ts[1]
+        
+        operation_type = sys.intern(operation_type)
         log_entry = {
             'timestamp': timestamp,
             'operation_type': operation_type,
@@ -1466,11 +2075,14 @@ def _log_ai_edit_activity(operation_type, game_name, details):
         if details.get('lines'):
             log_message += f" (lines {details['lines']})"
         
-        # Add to global GAMAI context for AI awareness
-        GAMAI_CONTEXT.add_message("global", "system", f"📝 Activity Log: {log_message}")
+        # Add to global GAMAI context for AI awareness; submitted to the
+        # log worker so the dialog click never waits on context pruning
+        _LOG_EXECUTOR.submit(GAMAI_CONTEXT.add_message, "global", "system",
+                             f"📝 Activity Log: {log_message}")
         
-        # Print to console for debugging
-        print(f"[AI EDIT LOG] {timestamp} | {operation_type} | Game: {game_name} | {details}")
+        # Console diagnostics only when debug logging is on
+        _log.debug("[AI EDIT LOG] %s | %s | Game: %s | %s",
+                   timestamp, operation_type, game_name, details)
         
         # TODO: Extend to file logging system in future implementation
         # log_file = "ai_edit_activity.log"
@@ -1480,8 +2092,144 @@ def _log_ai_edit_activity(operation_type, game_name, details):
     except Exception as e:
         print(f"Warning: Could not log AI edit activity: {e}")
 
+_log_ai_edit_activity._last_ts = [0, ""]
+
+# Mode-specific response-format blocks for _create_ai_prompt - built once
+# instead of re-allocating the triple-quoted text on every prompt
+_MODE_INSTRUCTIONS_FULL = """
+RESPONSE FORMAT FOR FULL FILE MODE:
+- Provide the COMPLETE file content with your changes integrated
+- Include all existing code plus your modifications
+- Maintain the entire file structure
+- Do not use line number references in your response
+- NO SPACING PRESERVATION COMMENTS - Return clean file content only
+- Do not include any invisible comments like "<!--.-->", "/*.*/" at the start of your response
+- Return the file exactly as it should appear in the editor
+
+CRITICAL SPACING PRESERVATION INSTRUCTION:
+- ❌ DO NOT use spacing preservation comments in full file mode
+- ❌ DO NOT prefix the first line with "<!--.-->", "/*.*/" or any invisible comment
+- Return clean, production-ready file content without any hidden characters
+"""
+
+_MODE_INSTRUCTIONS_LINES = """
+RESPONSE FORMAT FOR SPECIFIC LINES MODE:
+- Target specific line ranges for precise modifications
+- Use format: "lines X-Y:" followed by the new content for that range
+- Only modify the specified line ranges, preserve everything else
+- Example response:
+  lines 5-10:
+    <new html content for lines 5-10>
+  lines 15-18:
+    <new css content for lines 15-18>
+
+CRITICAL SPACING PRESERVATION INSTRUCTION:
+- For HTML content: ALWAYS prefix the FIRST line after "lines X-Y:" with "<!--.-->"
+- For CSS content: ALWAYS prefix the FIRST line after "lines X-Y:" with "/*.*/"
+- For JavaScript content: ALWAYS prefix the FIRST line after "lines X-Y:" with "/*.*/"
+- This invisible comment is essential for preserving leading spaces during copy/paste
+- Example: lines 5-6:\n    <!--.-->     <div class='test'>\n        <p>content</p>
+- The comment will be invisible but ensures all leading spaces are preserved
+"""
+
 # --- 2.1. Dialog Classes ---
 
+class AIGenerateWorker(QThread):
+    """Runs a Gemini generation (with rate-limit fallback) off the UI thread"""
+
+    finished_text = pyqtSignal(str, str)  # response text, model name used
+    failed = pyqtSignal(str)
+
+    def __init__(self, ai_model, model_name, prompt, parent=None):
+        super().__init__(parent)
+        self._ai_model = ai_model
+        self._model_name = model_name
+        self._prompt = prompt
+
+    def run(self):
+        try:
+            model_name = self._model_name
+            try:
+                response = generate_ai_content(self._ai_model, self._prompt)
+            except Exception as rate_limit_error:
+                # Check if it's a rate limit error and try backup model
+                if _is_rate_limit_error(rate_limit_error):
+                    print(f"🔄 Rate limit reached on {model_name}, switching to backup model...")
+                    ai_model, model_name = switch_to_backup_model(model_name)
+                    if not ai_model:
+                        raise Exception("Failed to switch to backup model")
+                    # Later requests should go straight to the backup model
+                    _MODEL_CACHE['model'], _MODEL_CACHE['name'] = ai_model, model_name
+                    response = generate_ai_content(ai_model, self._prompt)
+                else:
+                    raise
+            self.finished_text.emit(response.text.strip(), model_name)
+        except Exception as e:
+            self.failed.emit(str(e))
+
+# Stylesheet for AIEditCodeDialog, parsed by Qt once per dialog tree via
+# objectName selectors instead of per-widget setStyleSheet calls
+_AI_EDIT_DIALOG_STYLE = """
+    QLabel#dialogHeader {
+        color: #E5E5E5;
+        font-size: 18px;
+        font-weight: bold;
+        margin-bottom: 10px;
+    }
+    QLabel#fieldLabel {
+        font-weight: bold;
+        margin: 10px 0 5px 0;
+        color: #CCCCCC;
+    }
+    QRadioButton { color: #CCCCCC; font-size: 13px; }
+    QFrame#hline { color: #E5E5E5; margin: 10px 0px; }
+    QTextEdit#instructionInput {
+        border: 2px solid #ddd;
+        border-radius: 5px;
+        padding: 10px;
+        font-size: 14px;
+        color: #CCCCCC;
+    }
+    QTextEdit#instructionInput:focus {
+        border-color: #E5E5E5;
+    }
+    QTextEdit#resultView {
+        background-color: #E5E5E5;
+        border: 1px solid #E5E5E5;
+        border-radius: 5px;
+        padding: 10px;
+        font-family: 'Courier New', monospace;
+        font-size: 12px;
+        color: #333;
+    }
+    QPushButton {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
+            stop:0 #121212, stop:0.3 #121212, stop:0.7 #1a1a1a, stop:1 #121212);
+        border: 2px solid #E5E5E5;
+        border-radius: 5px;
+        padding: 10px 20px;
+        color: white;
+    }
+    QPushButton#primaryBtn {
+        font-weight: bold;
+    }
+    QPushButton:hover {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
+            stop:0 #121212, stop:0.3 #161616, stop:0.7 #1e1e1e, stop:1 #121212);
+        border: 2px solid #E5E5E5;
+    }
+    QPushButton:pressed {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
+            stop:0 #0e0e0e, stop:0.3 #121212, stop:0.7 #161616, stop:1 #0e0e0e);
+        border: 2px solid #E5E5E5;
+    }
+    QPushButton#primaryBtn:disabled {
+        background-color: #2a2a2a;
+        border: 2px solid #555;
+        color: #666;
+    }
+"""
+
 class AIEditCodeDialog(QDialog):
     """Dialog for AI-powered code editing of selected code"""
     
@@ -1497,6 +2245,30 @@ class AIEditCodeDialog(QDialog):
         self.toggle_mode = toggle_mode  # "full_file" or "specific_lines"
         self.edited_code = None
         self.enhanced_context = None
+        # Filled in when the enhanced context loads; the apply/log paths
+        # read these repeatedly and should not re-walk the context dicts
+        self._game_name = 'Unknown'
+        self._main_file_length = 0
+        # Resolve the editor read/write callables once; the widget type never
+        # changes for the dialog's lifetime, so later calls skip the hasattr
+        # probing and dispatch straight into Qt
+        self._editor_read = None
+        self._editor_write = None
+        if editor_widget is not None:
+            if hasattr(editor_widget, 'toPlainText'):
+                # QPlainTextEdit
+                self._editor_read = editor_widget.toPlainText
+            elif hasattr(editor_widget, 'text'):
+                # QTextEdit
+                self._editor_read = editor_widget.text
+            if hasattr(editor_widget, 'setPlainText'):
+                self._editor_write = editor_widget.setPlainText
+            elif hasattr(editor_widget, 'setText'):
+                self._editor_write = editor_widget.setText
+        # Widget kind is fixed for the dialog's lifetime; the per-command
+        # type-name comparison becomes a single attribute load
+        self._is_qsci = (editor_widget is not None
+                         and _is_qsci_widget(editor_widget))
         
         self.setWindowTitle("🤖 AI Code Editor")
         self.setModal(True)
@@ -1517,35 +2289,29 @@ class AIEditCodeDialog(QDialog):
         layout.setContentsMargins(20, 20, 20, 20)
         layout.setSpacing(15)
         
+        # One stylesheet for the whole dialog; widgets opt in by objectName
+        self.setStyleSheet(_AI_EDIT_DIALOG_STYLE)
+
         # Header
         header_label = QLabel("🤖 AI Code Editor")
-        header_label.setStyleSheet("""
-            QLabel {
-                color: #E5E5E5;
-                font-size: 18px;
-                font-weight: bold;
-                margin-bottom: 10px;
-            }
-        """)
+        header_label.setObjectName("dialogHeader")
         layout.addWidget(header_label)
         
         # Toggle Mode Selection
         toggle_label = QLabel("Edit Mode:")
-        toggle_label.setStyleSheet("font-weight: bold; margin-bottom: 5px; color: #CCCCCC;")
+        toggle_label.setObjectName("fieldLabel")
         layout.addWidget(toggle_label)
         
         toggle_layout = QHBoxLayout()
         
         # Full File Replace Toggle
         self.full_file_radio = QRadioButton("Full File Replace")
-        self.full_file_radio.setStyleSheet("QRadioButton { color: #CCCCCC; font-size: 13px; }")
         self.full_file_radio.setChecked(self.toggle_mode == "full_file")
         self.full_file_radio.toggled.connect(self._on_toggle_changed)
         toggle_layout.addWidget(self.full_file_radio)
         
         # Specific Lines Replace Toggle
         self.specific_lines_radio = QRadioButton("Specific Lines Replace")
-        self.specific_lines_radio.setStyleSheet("QRadioButton { color: #CCCCCC; font-size: 13px; }")
         self.specific_lines_radio.setChecked(self.toggle_mode == "specific_lines")
         self.specific_lines_radio.toggled.connect(self._on_toggle_changed)
         toggle_layout.addWidget(self.specific_lines_radio)
@@ -1556,50 +2322,29 @@ class AIEditCodeDialog(QDialog):
         # Add separator
         separator = QFrame()
         separator.setFrameShape(QFrame.HLine)
-        separator.setStyleSheet("color: #E5E5E5; margin: 10px 0px;")
+        separator.setObjectName("hline")
         layout.addWidget(separator)
         
         # User instruction
         instruction_label = QLabel("What would you like AI to do with this code?")
-        instruction_label.setStyleSheet("font-weight: bold; margin: 10px 0 5px 0; color: #CCCCCC;")
+        instruction_label.setObjectName("fieldLabel")
         layout.addWidget(instruction_label)
         
         self.instruction_input = QTextEdit()
         self.instruction_input.setPlaceholderText("Describe what you want AI to change, add, or improve in the selected code...")
         self.instruction_input.setMaximumHeight(100)
-        self.instruction_input.setStyleSheet("""
-            QTextEdit {
-                border: 2px solid #ddd;
-                border-radius: 5px;
-                padding: 10px;
-                font-size: 14px;
-                color: #CCCCCC;
-            }
-            QTextEdit:focus {
-                border-color: #E5E5E5;
-            }
-        """)
+        self.instruction_input.setObjectName("instructionInput")
         layout.addWidget(self.instruction_input)
         
         # AI processed result preview
         result_label = QLabel("AI-Edited Result:")
-        result_label.setStyleSheet("font-weight: bold; margin: 10px 0 5px 0; color: #CCCCCC;")
+        result_label.setObjectName("fieldLabel")
         layout.addWidget(result_label)
         
         self.result_text_edit = QTextEdit()
         self.result_text_edit.setPlainText("AI result will appear here after processing...")
         self.result_text_edit.setMaximumHeight(150)
-        self.result_text_edit.setStyleSheet("""
-            QTextEdit {
-                background-color: #E5E5E5;
-                border: 1px solid #E5E5E5;
-                border-radius: 5px;
-                padding: 10px;
-                font-family: 'Courier New', monospace;
-                font-size: 12px;
-                color: #333;
-            }
-        """)
+        self.result_text_edit.setObjectName("resultView")
         self.result_text_edit.setReadOnly(True)
         layout.addWidget(self.result_text_edit)
         
@@ -1607,88 +2352,18 @@ class AIEditCodeDialog(QDialog):
         button_layout = QHBoxLayout()
         
         self.process_button = QPushButton("🤖 AI Process")
-        self.process_button.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
-                    stop:0 #121212, stop:0.3 #121212, stop:0.7 #1a1a1a, stop:1 #121212);
-                border: 2px solid #E5E5E5;
-                border-radius: 5px;
-                padding: 10px 20px;
-                font-weight: bold;
-                color: white;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
-                    stop:0 #121212, stop:0.3 #161616, stop:0.7 #1e1e1e, stop:1 #121212);
-                border: 2px solid #E5E5E5;
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
-                    stop:0 #0e0e0e, stop:0.3 #121212, stop:0.7 #161616, stop:1 #0e0e0e);
-                border: 2px solid #E5E5E5;
-            }
-            QPushButton:disabled {
-                background-color: #2a2a2a;
-                border: 2px solid #555;
-                color: #666;
-            }
-        """)
+        self.process_button.setObjectName("primaryBtn")
         self.process_button.clicked.connect(self._process_with_ai)
         button_layout.addWidget(self.process_button)
         
         button_layout.addStretch()
         
         self.cancel_button = QPushButton("Cancel")
-        self.cancel_button.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
-                    stop:0 #121212, stop:0.3 #121212, stop:0.7 #1a1a1a, stop:1 #121212);
-                border: 2px solid #E5E5E5;
-                border-radius: 5px;
-                padding: 10px 20px;
-                color: white;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
-                    stop:0 #121212, stop:0.3 #161616, stop:0.7 #1e1e1e, stop:1 #121212);
-                border: 2px solid #E5E5E5;
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
-                    stop:0 #0e0e0e, stop:0.3 #121212, stop:0.7 #161616, stop:1 #0e0e0e);
-                border: 2px solid #E5E5E5;
-            }
-        """)
         self.cancel_button.clicked.connect(self.reject)
         button_layout.addWidget(self.cancel_button)
         
         self.accept_button = QPushButton("✅ Apply Changes")
-        self.accept_button.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
-                    stop:0 #121212, stop:0.3 #121212, stop:0.7 #1a1a1a, stop:1 #121212);
-                border: 2px solid #E5E5E5;
-                border-radius: 5px;
-                padding: 10px 20px;
-                font-weight: bold;
-                color: white;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
-                    stop:0 #121212, stop:0.3 #161616, stop:0.7 #1e1e1e, stop:1 #121212);
-                border: 2px solid #E5E5E5;
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
-                    stop:0 #0e0e0e, stop:0.3 #121212, stop:0.7 #161616, stop:1 #0e0e0e);
-                border: 2px solid #E5E5E5;
-            }
-            QPushButton:disabled {
-                background-color: #2a2a2a;
-                border: 2px solid #555;
-                color: #666;
-            }
-        """)
+        self.accept_button.setObjectName("primaryBtn")
         self.accept_button.clicked.connect(self.accept)
         self.accept_button.setEnabled(False)  # Enable only after AI processing
         button_layout.addWidget(self.accept_button)
@@ -1704,7 +2379,9 @@ class AIEditCodeDialog(QDialog):
                 start_line=self.start_line,
                 end_line=self.end_line
             )
-            print(f"Enhanced context loaded for game: {self.enhanced_context.get('game_info', {}).get('name', 'Unknown')}")
+            self._game_name = self.enhanced_context.get('game_info', {}).get('name', 'Unknown Game')
+            self._main_file_length = len(self.enhanced_context.get('main_file_content', ''))
+            print(f"Enhanced context loaded for game: {self._game_name}")
         except Exception as e:
             print(f"Error loading enhanced context: {e}")
             self.enhanced_context = {}
@@ -1715,10 +2392,13 @@ class AIEditCodeDialog(QDialog):
             # Load manifest.json if available
             if self.game and hasattr(self.game, 'game_file') and self.game.game_file:
                 manifest_path = Path(self.game.game_file).with_name('manifest.json')
-                if manifest_path.exists():
-                    with open(manifest_path, 'r', encoding='utf-8') as f:
-                        self.enhanced_context['manifest_content'] = f.read()
-                else:
+                try:
+                    # mtime-keyed cache: unchanged manifests cost one stat,
+                    # and a missing file costs the same stat instead of an
+                    # exists() probe plus a racy open
+                    self.enhanced_context['manifest_content'] = _read_text_cached(
+                        str(manifest_path), manifest_path.stat().st_mtime_ns)
+                except FileNotFoundError:
                     self.enhanced_context['manifest_content'] = ""
             else:
                 self.enhanced_context['manifest_content'] = ""
@@ -1726,12 +2406,8 @@ class AIEditCodeDialog(QDialog):
             # Reload current file content from editor
             if self.editor_widget:
                 try:
-                    if hasattr(self.editor_widget, 'toPlainText'):
-                        # QPlainTextEdit
-                        current_content = self.editor_widget.toPlainText()
-                    elif hasattr(self.editor_widget, 'text'):
-                        # QTextEdit
-                        current_content = self.editor_widget.text()
+                    if self._editor_read is not None:
+                        current_content = self._editor_read()
                     else:
                         # For other widget types, try to get content
                         current_content = ""
@@ -1741,11 +2417,18 @@ class AIEditCodeDialog(QDialog):
                     
                     self.enhanced_context['main_file_content'] = current_content
                     
-                    # Add line-numbered version
+                    # Add line-numbered version; skip the O(N) renumbering when
+                    # the editor content is unchanged since the previous click
                     if current_content:
-                        from pathlib import Path
-                        main_file_name = Path(self.game.game_file).name if hasattr(self.game, 'game_file') and self.game.game_file else "main_file"
-                        self.enhanced_context['main_file_with_lines'] = self._format_file_with_line_numbers(current_content, main_file_name)
+                        content_hash = hash(current_content)
+                        if content_hash == getattr(self, '_last_content_hash', None):
+                            self.enhanced_context['main_file_with_lines'] = self._last_numbered
+                        else:
+                            main_file_name = Path(self.game.game_file).name if hasattr(self.game, 'game_file') and self.game.game_file else "main_file"
+                            numbered = self._format_file_with_line_numbers(current_content, main_file_name)
+                            self.enhanced_context['main_file_with_lines'] = numbered
+                            self._last_content_hash = content_hash
+                            self._last_numbered = numbered
                     
                 except Exception as e:
                     print(f"Warning: Error loading current file content: {e}")
@@ -1766,11 +2449,10 @@ class AIEditCodeDialog(QDialog):
     def _format_file_with_line_numbers(self, content, file_name):
         """Format file content with line numbers for AI context"""
         try:
-            lines = content.split('\n')
-            numbered_lines = []
-            for i, line in enumerate(lines, 1):
-                numbered_lines.append(f"{i:4d}: {line}")
-            return f"\n=== {file_name.upper()} ===\n" + '\n'.join(numbered_lines)
+            # Single join over a generator - no intermediate N-entry list
+            body = '\n'.join(f"{i:4d}: {line}"
+                             for i, line in enumerate(content.split('\n'), 1))
+            return f"\n=== {file_name.upper()} ===\n{body}"
         except Exception as e:
             print(f"Error formatting file with line numbers: {e}")
             return f"\n=== {file_name.upper()} ===\n" + content
@@ -1778,9 +2460,9 @@ class AIEditCodeDialog(QDialog):
     def _on_toggle_changed(self):
         """Handle toggle mode changes"""
         if self.full_file_radio.isChecked():
-            self.toggle_mode = "full_file"
+            self.toggle_mode = _MODE_FULL_FILE
         elif self.specific_lines_radio.isChecked():
-            self.toggle_mode = "specific_lines"
+            self.toggle_mode = _MODE_SPECIFIC_LINES
         print(f"Toggle mode changed to: {self.toggle_mode}")
     
     def _process_with_ai(self):
@@ -1811,113 +2493,81 @@ class AIEditCodeDialog(QDialog):
     
     def _create_ai_prompt(self, instruction):
         """Create the AI prompt for code editing with enhanced context"""
-        # Create comprehensive context prompt
-        context_prompt = _create_ai_context_prompt(
-            context=self.enhanced_context,
-            edit_mode="edit_code",
-            toggle_mode=self.toggle_mode
+        # The context block is immutable between clicks unless the file,
+        # manifest or mode changed; reuse the assembled prefix when its
+        # inputs are the same objects (the mtime-keyed read caches hand
+        # back identical strings for unchanged files, so comparing this
+        # key is effectively a few identity checks)
+        context_key = (
+            self.toggle_mode,
+            self.enhanced_context.get('manifest_content', ''),
+            self.enhanced_context.get('index_content', ''),
+            self.enhanced_context.get('main_file_with_lines', ''),
+            self.enhanced_context.get('selected_content', ''),
+            # The prefix embeds the recent-activity section, so new log
+            # entries must invalidate the cached text
+            GAMAI_CONTEXT.get_activity_log(),
         )
+        if getattr(self, '_context_prompt_key', None) == context_key:
+            context_prompt = self._context_prompt_cache
+        else:
+            context_prompt = _create_ai_context_prompt(
+                context=self.enhanced_context,
+                edit_mode="edit_code",
+                toggle_mode=self.toggle_mode
+            )
+            self._context_prompt_key = context_key
+            self._context_prompt_cache = context_prompt
         
-        # Add user instruction
+        # Only the user instruction is recomputed per click; keeping the
+        # mutable part as a suffix also leaves the provider-side prompt
+        # prefix stable for implicit prompt caching
         user_instruction = f"\n\n=== USER REQUEST ===\n{instruction}\n"
+        mode_instructions = (_MODE_INSTRUCTIONS_FULL if self.toggle_mode == "full_file"
+                             else _MODE_INSTRUCTIONS_LINES)
+        return context_prompt + user_instruction + mode_instructions
+    
+    def _call_ai_for_code_edit(self, prompt):
+        """Start the AI edit on a worker thread; the event loop keeps running"""
+        # Reuse the session's model instance; only the first click builds it
+        ai_model, model_name = get_cached_gamai_model()
+        if not ai_model:
+            self._on_ai_failed("AI model not available")
+            return
         
-        # Add mode-specific instructions
-        if self.toggle_mode == "full_file":
-            mode_instructions = """
-RESPONSE FORMAT FOR FULL FILE MODE:
-- Provide the COMPLETE file content with your changes integrated
-- Include all existing code plus your modifications
-- Maintain the entire file structure
-- Do not use line number references in your response
-- NO SPACING PRESERVATION COMMENTS - Return clean file content only
-- Do not include any invisible comments like "<!--.-->", "/*.*/" at the start of your response
-- Return the file exactly as it should appear in the editor
-
-CRITICAL SPACING PRESERVATION INSTRUCTION:
-- ❌ DO NOT use spacing preservation comments in full file mode
-- ❌ DO NOT prefix the first line with "<!--.-->", "/*.*/" or any invisible comment
-- Return clean, production-ready file content without any hidden characters
-"""
-        else:
-            mode_instructions = """
-RESPONSE FORMAT FOR SPECIFIC LINES MODE:
-- Target specific line ranges for precise modifications
-- Use format: "lines X-Y:" followed by the new content for that range
-- Only modify the specified line ranges, preserve everything else
-- Example response:
-  lines 5-10:
-    <new html content for lines 5-10>
-  lines 15-18:
-    <new css content for lines 15-18>
+        # Show current model being used
+        self.process_button.setText(f"🤖 AI Processing ({model_name})...")
+        
+        # Generate off the UI thread; results come back via signals on the
+        # main thread, and parenting the worker to the dialog ties lifetimes
+        self._ai_worker = AIGenerateWorker(ai_model, model_name, prompt, self)
+        self._ai_worker.finished_text.connect(self._on_ai_finished)
+        self._ai_worker.failed.connect(self._on_ai_failed)
+        self._ai_worker.start()
 
-CRITICAL SPACING PRESERVATION INSTRUCTION:
-- For HTML content: ALWAYS prefix the FIRST line after "lines X-Y:" with "<!--.-->"
-- For CSS content: ALWAYS prefix the FIRST line after "lines X-Y:" with "/*.*/"
-- For JavaScript content: ALWAYS prefix the FIRST line after "lines X-Y:" with "/*.*/"
-- This invisible comment is essential for preserving leading spaces during copy/paste
-- Example: lines 5-6:\n    <!--.-->     <div class='test'>\n        <p>content</p>
-- The comment will be invisible but ensures all leading spaces are preserved
-"""
+    def _on_ai_finished(self, ai_response, model_name):
+        """Handle a completed AI generation on the UI thread"""
+        # Extract content from markdown code blocks if present
+        extracted_content = extract_content_from_code_blocks(ai_response)
         
-        # Combine all parts
-        full_prompt = context_prompt + user_instruction + mode_instructions
-        return full_prompt
-    
-    def _call_ai_for_code_edit(self, prompt):
-        """Call AI to edit the selected code"""
-        try:
-            # Create AI model instance
-            ai_model, model_name = create_gamai_model()
-            if not ai_model:
-                raise Exception("AI model not available")
-            
-            # Show current model being used
-            self.process_button.setText(f"🤖 AI Processing ({model_name})...")
-            
-            # Generate AI response with fallback capability
-            try:
-                response = ai_model.generate_content(prompt)
-                ai_response = response.text.strip()
-            except Exception as rate_limit_error:
-                # Check if it's a rate limit error and try backup model
-                error_msg = str(rate_limit_error).lower()
-                if "rate limit" in error_msg or "quota" in error_msg or "limit" in error_msg:
-                    print(f"🔄 Rate limit reached on {model_name}, switching to backup model...")
-                    # Switch to backup model
-                    ai_model, backup_model_name = switch_to_backup_model(model_name)
-                    if not ai_model:
-                        raise Exception("Failed to switch to backup model")
-                    
-                    # Update button text to show backup model
-                    self.process_button.setText(f"🤖 AI Processing ({backup_model_name})...")
-                    
-                    # Try again with backup model
-                    response = ai_model.generate_content(prompt)
-                    ai_response = response.text.strip()
-                else:
-                    # Re-raise if it's not a rate limit error
-                    raise rate_limit_error
-            
-            # Extract content from markdown code blocks if present
-            extracted_content = extract_content_from_code_blocks(ai_response)
-            
-            # Set the result
-            self.result_text_edit.setPlainText(ai_response)
-            self.edited_code = extracted_content
-            
-            # Enable accept button
-            self.accept_button.setEnabled(True)
-            
-            # Re-enable process button
-            self.process_button.setEnabled(True)
-            self.process_button.setText("🤖 AI Process")
-            
-            QMessageBox.information(self, "Success", "AI has processed your code. Review the result and click 'Apply Changes' to use it.")
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"AI processing failed: {e}")
-            self.process_button.setEnabled(True)
-            self.process_button.setText("🤖 AI Process")
+        # Set the result
+        self.result_text_edit.setPlainText(ai_response)
+        self.edited_code = extracted_content
+        
+        # Enable accept button
+        self.accept_button.setEnabled(True)
+        
+        # Re-enable process button
+        self.process_button.setEnabled(True)
+        self.process_button.setText("🤖 AI Process")
+        
+        QMessageBox.information(self, "Success", "AI has processed your code. Review the result and click 'Apply Changes' to use it.")
+
+    def _on_ai_failed(self, message):
+        """Handle a failed AI generation on the UI thread"""
+        QMessageBox.critical(self, "Error", f"AI processing failed: {message}")
+        self.process_button.setEnabled(True)
+        self.process_button.setText("🤖 AI Process")
     
     def get_edited_code(self):
         """Get the AI-edited code"""
@@ -1928,12 +2578,8 @@ CRITICAL SPACING PRESERVATION INSTRUCTION:
         try:
             if self.edited_code and self.editor_widget:
                 # Replace the entire content in the editor
-                if hasattr(self.editor_widget, 'setPlainText'):
-                    # QPlainTextEdit
-                    self.editor_widget.setPlainText(self.edited_code)
-                elif hasattr(self.editor_widget, 'setText'):
-                    # QTextEdit
-                    self.editor_widget.setText(self.edited_code)
+                if self._editor_write is not None:
+                    self._editor_write(self.edited_code)
                 else:
                     # For other widget types, try to set content
                     if hasattr(self.editor_widget, 'textCursor'):
@@ -1960,40 +2606,36 @@ CRITICAL SPACING PRESERVATION INSTRUCTION:
         
         Returns: List of tuples (start_line, end_line, content)
         """
-        import re
-        
         line_commands = []
         
         try:
-            print(f"🔍 DEBUG: Raw AI Response:\n{repr(ai_response)}")
-            
-            # Pattern to match "line X:" or "lines X-Y:" commands (both singular and plural)
-            line_pattern = r'lines?\s+(\d+)(?:-(\d+))?\s*:'
+            _log.debug("🔍 DEBUG: Raw AI Response: %r", ai_response)
             
-            # Find all line commands in the response
-            matches = re.finditer(line_pattern, ai_response, re.MULTILINE | re.IGNORECASE)
+            # Find all "line X:" / "lines X-Y:" commands with the precompiled
+            # pattern; materialized so each command's content ends where the
+            # next match begins, with no per-command rescans
+            matches = list(_LINE_CMD_RE.finditer(ai_response))
             
             for match_idx, match in enumerate(matches):
                 start_line = int(match.group(1))
                 end_line = int(match.group(2)) if match.group(2) else start_line
                 
-                print(f"🔍 DEBUG: Command {match_idx + 1}: Lines {start_line}-{end_line}")
-                print(f"   Match text: {repr(match.group(0))}")
-                print(f"   Match span: {match.span()} ({match.start()}-{match.end()})")
+                _log.debug("🔍 DEBUG: Command %s: Lines %s-%s", match_idx + 1, start_line, end_line)
+                _log.debug("   Match text: %r", match.group(0))
+                _log.debug("   Match span: %s (%s-%s)", match.span(), match.start(), match.end())
                 
                 # Find the content after this line command
                 content_start = match.end()
-                print(f"   Content starts at: {content_start}")
+                _log.debug("   Content starts at: %s", content_start)
                 
-                # Find the next line command or end of string
-                next_match = re.search(line_pattern, ai_response[content_start:], re.MULTILINE | re.IGNORECASE)
-                
-                if next_match:
-                    content_end = content_start + next_match.start()
-                    print(f"   Next command found at: {content_start + next_match.start()}")
+                # Content runs up to the next command or end of string
+                has_next = match_idx + 1 < len(matches)
+                if has_next:
+                    content_end = matches[match_idx + 1].start()
+                    _log.debug("   Next command found at: %s", content_end)
                 else:
                     content_end = len(ai_response)
-                    print(f"   No next command, using end of string: {content_end}")
+                    _log.debug("   No next command, using end of string: %s", content_end)
                 
                 # Extract the raw content between this command and the next
                 raw_content = ai_response[content_start:content_end]
@@ -2002,13 +2644,13 @@ CRITICAL SPACING PRESERVATION INSTRUCTION:
                 # Check if raw_content starts with a new line and has content
                 if raw_content.startswith('\n'):
                     raw_content = raw_content[1:]  # Remove leading newline
-                    print(f"   Removed leading newline from raw content")
+                    _log.debug("   Removed leading newline from raw content")
                 elif raw_content.startswith(' \n'):
                     raw_content = raw_content[2:]  # Remove leading space+newline
-                    print(f"   Removed leading space+newline from raw content")
+                    _log.debug("   Removed leading space+newline from raw content")
                 
-                # If next_match exists, ensure we don't include any part of the next command
-                if next_match:
+                # If a next command exists, ensure we don't include any part of it
+                if has_next:
                     # Look backwards from content_end to find the last meaningful newline
                     end_section = ai_response[max(0, content_end-100):content_end]
                     last_newline = end_section.rfind('\n')
@@ -2016,14 +2658,14 @@ CRITICAL SPACING PRESERVATION INSTRUCTION:
                         # Adjust content_end to end at the last newline before next command
                         adjusted_end = content_end - (len(end_section) - last_newline)
                         raw_content = ai_response[content_start:adjusted_end]
-                        print(f"   Adjusted content end to last newline: {adjusted_end}")
+                        _log.debug("   Adjusted content end to last newline: %s", adjusted_end)
                 
-                print(f"   Final raw content ({len(raw_content)} chars): {repr(raw_content)}")
-                print(f"   Raw content ({len(raw_content)} chars): {repr(raw_content)}")
+                _log.debug("   Final raw content (%s chars): %r", len(raw_content), raw_content)
+                _log.debug("   Raw content (%s chars): %r", len(raw_content), raw_content)
                 
                 # Clean up the content: remove leading newlines and trailing whitespace
                 content = raw_content.strip()
-                print(f"   Stripped content: {repr(content)}")
+                _log.debug("   Stripped content: %r", content)
                 
                 # Smart indentation removal - only remove common AI indentation (4-8 spaces)
                 lines = content.split('\n')
@@ -2038,50 +2680,38 @@ CRITICAL SPACING PRESERVATION INSTRUCTION:
                     
                     # Only remove common AI indentation (4-8 spaces), preserve code formatting and comment prefixes
                     if min_indent != float('inf') and 4 <= min_indent <= 8:
-                        print(f"   Removing common indentation: {min_indent} spaces")
-                        def preserve_comment_prefixes(line):
-                            # Check if line starts with comment prefixes that should be preserved
-                            if (line.startswith('/*.*/') or line.startswith('<!--.-->')):
-                                # Preserve comment prefix, only remove indentation after the prefix
-                                prefix_end = line.find('/*.*/') + 5 if line.startswith('/*.*/') else line.find('<!--.-->') + 8
-                                content_start = prefix_end
-                                # Find actual indentation (spaces after comment prefix)
-                                content = line[content_start:]
-                                if content and content[0] == ' ' and len(content) > min_indent:
-                                    return line[:content_start] + content[min_indent:]
-                                else:
-                                    return line  # No indentation to remove
-                            elif len(line) > min_indent and line.strip():
-                                return line[min_indent:]
-                            else:
-                                return line
-                        
-                        lines = [preserve_comment_prefixes(line) for line in lines]
-                        print(f"   ✅ Comment prefixes preserved after indentation removal")
+                        _log.debug("   Removing common indentation: %s spaces", min_indent)
+                        if _CSS_PFX not in content and _HTML_PFX not in content:
+                            # Fast path: no spacing-preservation markers, so a
+                            # plain slice per line is enough - no per-line
+                            # function call or prefix probing
+                            lines = [line[min_indent:] if len(line) > min_indent and line.strip() else line
+                                     for line in lines]
+                        else:
+                            lines = [_dedent_preserving_prefix(line, min_indent) for line in lines]
+                        _log.debug("   ✅ Comment prefixes preserved after indentation removal")
                     else:
-                        print(f"   Preserving original indentation (min_indent: {min_indent})")
+                        _log.debug("   Preserving original indentation (min_indent: %s)", min_indent)
                 
                 cleaned_content = '\n'.join(lines).strip()
-                print(f"   Final cleaned content: {repr(cleaned_content)}")
+                _log.debug("   Final cleaned content: %r", cleaned_content)
                 
                 # REMOVED: HTML comment injection - now handled by AI with powerful prompt
                 
-                print(f"   ---")
+                _log.debug("   ---")
                 
                 # Only add if there's actual content
                 if cleaned_content:
                     line_commands.append((start_line, end_line, cleaned_content))
                 else:
-                    print(f"⚠️ Skipping empty content for lines {start_line}-{end_line}")
+                    _log.debug("⚠️ Skipping empty content for lines %s-%s", start_line, end_line)
             
-            print(f"🔍 Final parsed {len(line_commands)} line commands:")
+            _log.debug("🔍 Final parsed %s line commands:", len(line_commands))
             for start, end, content in line_commands:
-                print(f"   Lines {start}-{end}: {repr(content[:100])}")
+                _log.debug("   Lines %s-%s: %r", start, end, content[:100])
                 
         except Exception as e:
-            print(f"❌ Error parsing AI line commands: {e}")
-            import traceback
-            traceback.print_exc()
+            _log.error("❌ Error parsing AI line commands: %s", e, exc_info=True)
             line_commands = []
         
         return line_commands
@@ -2089,38 +2719,47 @@ CRITICAL SPACING PRESERVATION INSTRUCTION:
     def _apply_fallback_specific_lines(self):
         """Fallback method when no line commands are found in AI response"""
         try:
-            game_name = self.enhanced_context.get('game_info', {}).get('name', 'Unknown Game') if self.enhanced_context else 'Unknown'
+            game_name = self._game_name
             
             # Use original single line range replacement
             if self.editor_widget:
-                if type(self.editor_widget).__name__ == 'QsciScintilla':
-                    # QsciScintilla fallback
+                if self._is_qsci:
+                    # QsciScintilla fallback: target-range replace, same as
+                    # the command path - the line-end position comes straight
+                    # from Scintilla with no line copied into Python, and the
+                    # range now includes the whole end line like the text-
+                    # editor branch below
                     try:
                         line_from_0 = self.start_line - 1
                         line_to_0 = self.end_line - 1
-                        self.editor_widget.setSelection(line_from_0, 0, line_to_0, 0)
-                        # Use original method (now with AI comment preservation!)
-                        self.editor_widget.replaceSelectedText(self.edited_code)
-                        print(f"✅ Applied fallback replacement in QsciScintilla from lines {self.start_line}-{self.end_line} (AI comment method)")
+                        sci = self.editor_widget.SendScintilla
+                        target_start = sci(QsciScintilla.SCI_POSITIONFROMLINE, line_from_0)
+                        target_end = sci(QsciScintilla.SCI_GETLINEENDPOSITION, line_to_0)
+                        content_bytes = self.edited_code.encode('utf-8')
+                        sci(QsciScintilla.SCI_SETTARGETRANGE, target_start, target_end)
+                        sci(QsciScintilla.SCI_REPLACETARGET, len(content_bytes), content_bytes)
+                        _log.debug("applied fallback replacement in QsciScintilla, lines %s-%s",
+                                   self.start_line, self.end_line)
                     except Exception as e:
                         QMessageBox.critical(self, "Error", f"Failed to replace lines {self.start_line}-{self.end_line}: {e}")
                         return False
                 else:
                     # Text editor fallback
                     try:
+                        # Jump straight to the target blocks; walking the
+                        # document one line at a time is O(lines) per command
+                        doc = self.editor_widget.document()
+                        start_block = doc.findBlockByNumber(self.start_line - 1)
+                        end_block = doc.findBlockByNumber(self.end_line - 1)
                         cursor = self.editor_widget.textCursor()
-                        cursor.movePosition(QTextCursor.Start)
-                        for i in range(self.start_line - 1):
-                            cursor.movePosition(QTextCursor.Down)
-                        cursor.movePosition(QTextCursor.StartOfLine)
-                        for i in range(self.end_line - self.start_line):
-                            cursor.movePosition(QTextCursor.Down)
-                        cursor.movePosition(QTextCursor.EndOfLine)
-                        cursor.setPosition(cursor.anchor(), QTextCursor.KeepAnchor)
+                        cursor.setPosition(start_block.position())
+                        cursor.setPosition(end_block.position() + max(end_block.length() - 1, 0),
+                                           QTextCursor.KeepAnchor)
                         # Use original method (now with AI comment preservation!)
                         cursor.insertText(self.edited_code)
                         self.editor_widget.setTextCursor(cursor)
-                        print(f"✅ Applied fallback replacement in text editor from lines {self.start_line}-{self.end_line} (AI comment method)")
+                        _log.debug("applied fallback replacement in text editor, lines %s-%s",
+                                   self.start_line, self.end_line)
                     except Exception as e:
                         QMessageBox.critical(self, "Error", f"Failed to replace lines {self.start_line}-{self.end_line}: {e}")
                         return False
@@ -2132,56 +2771,6 @@ CRITICAL SPACING PRESERVATION INSTRUCTION:
             QMessageBox.critical(self, "Error", f"Failed to apply fallback replacement: {e}")
             return False
 
-    def _copy_content_to_clipboard(self, content):
-        """Copy content to clipboard using pyperclip (preserves spaces)"""
-        try:
-            print(f"   📋 Copying content to clipboard: {repr(content[:50])}{'...' if len(content) > 50 else ''}")
-            pyperclip.copy(content)
-            return True
-        except Exception as e:
-            print(f"   ❌ Failed to copy to clipboard: {e}")
-            return False
-
-    def _simulate_paste(self):
-        """Simulate Ctrl+V using keyboard library (preserves spacing like manual paste)"""
-        try:
-            print(f"   ⌨️ Simulating Ctrl+V paste")
-            # Wait a small moment to ensure cursor is positioned
-            time.sleep(0.1)
-            # Send Ctrl+V to paste
-            keyboard.send('ctrl+v')
-            # Wait for paste operation to complete
-            time.sleep(0.1)
-            return True
-        except Exception as e:
-            print(f"   ❌ Failed to simulate paste: {e}")
-            return False
-
-    def _apply_keyboard_paste(self, content, focus_widget=None):
-        """Apply content using keyboard-based clipboard approach (preserves spacing)"""
-        try:
-            print(f"   🎯 Using keyboard-based paste approach")
-            
-            # Step 1: Copy content to clipboard (preserves spaces)
-            if not self._copy_content_to_clipboard(content):
-                return False
-                
-            # Step 2: Ensure the editor widget is focused (if provided)
-            if focus_widget and hasattr(focus_widget, 'setFocus'):
-                focus_widget.setFocus()
-                time.sleep(0.1)
-                
-            # Step 3: Simulate Ctrl+V paste operation (which preserves spacing)
-            if not self._simulate_paste():
-                return False
-                
-            print(f"   ✅ Keyboard paste completed successfully")
-            return True
-            
-        except Exception as e:
-            print(f"   ❌ Keyboard paste failed: {e}")
-            return False
-
     def _apply_single_line_command(self, start_line, end_line, content):
         """Apply a single line command to the editor using delete-and-insert approach
         
@@ -2191,154 +2780,156 @@ CRITICAL SPACING PRESERVATION INSTRUCTION:
         3. Use replaceSelectedText() with AI-generated comment-prefixed content (preserves spacing)
         """
         try:
-            print(f"🔧 DEBUG: Applying command lines {start_line}-{end_line} using delete-and-insert")
-            print(f"   Content to insert: {repr(content)}")
-            print(f"   🎯 Content ready for spacing preservation via AI comment")
-            
-            if type(self.editor_widget).__name__ == 'QsciScintilla':
-                # QsciScintilla: use delete-and-insert approach
+            _log.debug("applying command lines %s-%s using delete-and-insert", start_line, end_line)
+            _log.debug("content to insert: %r", content)
+            
+            if self._is_qsci:
+                # QsciScintilla: talk to Scintilla directly. The high-level
+                # wrappers each marshal a line/column pair, fire selection
+                # signals and copy line text into Python; one target-range
+                # replace does none of that. SCI_GETLINEENDPOSITION excludes
+                # the EOL, so the trailing newline survives for single and
+                # multi-line commands alike.
                 line_from_0 = start_line - 1
                 line_to_0 = end_line - 1
                 
-                print(f"   QsciScintilla: Will delete content from line {line_from_0+1} to {line_to_0+1}")
+                sci = self.editor_widget.SendScintilla
+                target_start = sci(QsciScintilla.SCI_POSITIONFROMLINE, line_from_0)
+                target_end = sci(QsciScintilla.SCI_GETLINEENDPOSITION, line_to_0)
+                content_bytes = content.encode('utf-8')
                 
-                # For single line: delete only content, keep newline
-                # For multiple lines: delete all content, keep structure
-                target_line_text = self.editor_widget.text(line_from_0)
-                print(f"   Target line {line_from_0}: {repr(target_line_text)}")
-                
-                if start_line == end_line:
-                    # Single line: delete content only (not the newline)
-                    if target_line_text.endswith('\n'):
-                        content_to_delete = target_line_text[:-1]  # Remove newline
-                    else:
-                        content_to_delete = target_line_text
-                    
-                    print(f"   Will delete content only: {repr(content_to_delete)}")
-                    
-                    # Select from start to end (excluding newline)
-                    self.editor_widget.setSelection(line_from_0, 0, line_from_0, len(content_to_delete))
-                    print(f"   Selected content: {repr(self.editor_widget.selectedText())}")
-                    
-                    # Delete only the content
-                    self.editor_widget.removeSelectedText()
-                    print(f"   ✅ Content deleted, keeping line structure")
-                    
-                    # Step 2: Position cursor at start of line and paste content
-                    # Set cursor at beginning of line
-                    self.editor_widget.setSelection(line_from_0, 0, line_from_0, 0)
-                    self.editor_widget.setCursorPosition(line_from_0, 0)
-                    
-                    # Use replaceSelectedText() with AI comment-prefixed content (now preserves spacing!)
-                    self.editor_widget.replaceSelectedText(content)
-                    print(f"   ✅ Pasted content at line {line_from_0+1} (AI comment method)")
-                    
-                else:
-                    # Multiple lines: delete content from all lines
-                    for line_num in range(line_from_0, line_to_0 + 1):
-                        line_text = self.editor_widget.text(line_num)
-                        if line_text.endswith('\n'):
-                            content_to_delete = line_text[:-1]
-                        else:
-                            content_to_delete = line_text
-                        
-                        # Select and delete content only (not newline)
-                        self.editor_widget.setSelection(line_num, 0, line_num, len(content_to_delete))
-                        self.editor_widget.removeSelectedText()
-                    
-                    print(f"   ✅ Deleted content from lines {start_line}-{end_line}")
-                    
-                    # Position cursor at start of first line and paste
-                    self.editor_widget.setSelection(line_from_0, 0, line_from_0, 0)
-                    self.editor_widget.setCursorPosition(line_from_0, 0)
-                    
-                    # Use replaceSelectedText with HTML comment method
-                    self.editor_widget.replaceSelectedText(content)
-                    print(f"   ✅ Pasted content at line {start_line} (AI comment method)")
+                sci(QsciScintilla.SCI_SETTARGETRANGE, target_start, target_end)
+                sci(QsciScintilla.SCI_REPLACETARGET, len(content_bytes), content_bytes)
+                sci(QsciScintilla.SCI_GOTOPOS, target_start)
+                _log.debug("replaced lines %s-%s via Scintilla target range", start_line, end_line)
                 
                 return True
                 
             else:
                 # Text editor: use delete-and-insert approach
-                print(f"   TextEditor: Using delete-and-insert for lines {start_line}-{end_line}")
-                
+                # Text editor: one range replace regardless of line count.
+                # A single-line command is just a range whose start and end
+                # blocks coincide; selecting up to the position before the
+                # block's newline keeps the line structure either way.
                 cursor = self.editor_widget.textCursor()
+                doc = self.editor_widget.document()
                 
-                if start_line == end_line:
-                    # Single line: delete content only, keep newline
-                    cursor.movePosition(QTextCursor.Start)
-                    for i in range(start_line - 1):
-                        cursor.movePosition(QTextCursor.Down)
-                    
-                    # Move to start of line
-                    cursor.movePosition(QTextCursor.StartOfLine)
-                    start_pos = cursor.position()
-                    
-                    # Move to end of line (but before newline)
-                    cursor.movePosition(QTextCursor.EndOfLine)
-                    end_pos = cursor.position()
-                    
-                    # If line has content, select it
-                    if end_pos > start_pos:
-                        cursor.setPosition(start_pos, QTextCursor.MoveAnchor)
-                        cursor.setPosition(end_pos, QTextCursor.KeepAnchor)
-                        
-                        selected = cursor.selectedText()
-                        print(f"   Selected content: {repr(selected)}")
-                        
-                        # Delete the content
-                        cursor.removeSelectedText()
-                        print(f"   ✅ Content deleted, keeping line structure")
-                    
-                    # Step 2: Position cursor at start of line and paste content
-                    cursor.movePosition(QTextCursor.StartOfLine)
-                    self.editor_widget.setTextCursor(cursor)
-                    
-                    # Use cursor.insertText() with HTML comment method (now preserves spacing!)
-                    cursor.insertText(content)
-                    self.editor_widget.setTextCursor(cursor)
-                    print(f"   ✅ Pasted content at line {start_line} (AI comment method)")
-                    
-                else:
-                    # Multiple lines: delete content from all lines
-                    for line_num in range(start_line, end_line + 1):
-                        cursor.movePosition(QTextCursor.Start)
-                        for i in range(line_num - 1):
-                            cursor.movePosition(QTextCursor.Down)
-                        
-                        cursor.movePosition(QTextCursor.StartOfLine)
-                        start_pos = cursor.position()
-                        
-                        cursor.movePosition(QTextCursor.EndOfLine)
-                        end_pos = cursor.position()
-                        
-                        if end_pos > start_pos:
-                            cursor.setPosition(start_pos, QTextCursor.MoveAnchor)
-                            cursor.setPosition(end_pos, QTextCursor.KeepAnchor)
-                            cursor.removeSelectedText()
-                    
-                    print(f"   ✅ Deleted content from lines {start_line}-{end_line}")
-                    
-                    # Position cursor at start of first line
-                    cursor.movePosition(QTextCursor.Start)
-                    for i in range(start_line - 1):
-                        cursor.movePosition(QTextCursor.Down)
-                    cursor.movePosition(QTextCursor.StartOfLine)
-                    self.editor_widget.setTextCursor(cursor)
-                    
-                    # Use cursor.insertText with HTML comment method
-                    cursor.insertText(content)
-                    self.editor_widget.setTextCursor(cursor)
-                    print(f"   ✅ Pasted content at line {start_line} (AI comment method)")
+                start_block = doc.findBlockByNumber(start_line - 1)
+                end_block = doc.findBlockByNumber(end_line - 1)
+                cursor.setPosition(start_block.position())
+                cursor.setPosition(end_block.position() + max(end_block.length() - 1, 0),
+                                   QTextCursor.KeepAnchor)
+                
+                # Use cursor.insertText with HTML comment method
+                cursor.insertText(content)
+                self.editor_widget.setTextCursor(cursor)
+                _log.debug("replaced lines %s-%s in one operation", start_line, end_line)
                 
                 return True
                 
         except Exception as e:
-            print(f"❌ Error applying line command {start_line}-{end_line}: {e}")
-            import traceback
-            traceback.print_exc()
+            _log.error("error applying line command %s-%s: %s",
+                       start_line, end_line, e, exc_info=True)
             return False
 
+    def _apply_commands_bulk(self, sorted_commands):
+        """Apply every line command in memory and swap the document once
+        
+        K separate delete+insert operations cost K reflows and shift every
+        downstream offset; splicing a line list and issuing one setText is a
+        single O(N) swap regardless of batch size. Commands arrive sorted by
+        descending start line, so earlier splices never move the lines later
+        commands target.
+        
+        Returns:
+            tuple: (success_count, failed_commands)
+        """
+        if self._is_qsci:
+            current_text = self.editor_widget.text()
+        elif self._editor_read:
+            current_text = self._editor_read()
+        else:
+            current_text = self.editor_widget.toPlainText()
+        lines = current_text.splitlines(keepends=True)
+        
+        success_count = 0
+        failed_commands = []
+        for start_line, end_line, content in sorted_commands:
+            if start_line < 1 or end_line < start_line or start_line > len(lines):
+                failed_commands.append(f"{start_line}-{end_line}")
+                continue
+            end_line = min(end_line, len(lines))
+            replacement = content.splitlines(keepends=True)
+            # Keep the newline that terminated the replaced range
+            if replacement and not replacement[-1].endswith('\n') \
+                    and lines[end_line - 1].endswith('\n'):
+                replacement[-1] += '\n'
+            lines[start_line - 1:end_line] = replacement
+            success_count += 1
+            _log.debug("applied line command: lines %s-%s", start_line, end_line)
+        
+        new_text = ''.join(lines)
+        if self._is_qsci:
+            self.editor_widget.beginUndoAction()
+            try:
+                self.editor_widget.setText(new_text)
+            finally:
+                self.editor_widget.endUndoAction()
+        else:
+            # setPlainText/setText would clear the widget's undo stack; a
+            # document-wide cursor replacement keeps the swap undoable
+            cursor = self.editor_widget.textCursor()
+            cursor.beginEditBlock()
+            try:
+                cursor.select(QTextCursor.Document)
+                cursor.insertText(new_text)
+            finally:
+                cursor.endEditBlock()
+        return success_count, failed_commands
+
+    def _apply_commands_sequential(self, sorted_commands):
+        """Apply commands one by one through the editor (bulk-path fallback)
+        
+        Returns:
+            tuple: (success_count, failed_commands)
+        """
+        success_count = 0
+        failed_commands = []
+        
+        # Batch the whole command list into one undo step, one repaint and
+        # one textChanged round trip; otherwise every command reflows the
+        # document and redraws the margin
+        batch_cursor = None
+        if self._is_qsci:
+            self.editor_widget.beginUndoAction()
+        elif hasattr(self.editor_widget, 'textCursor'):
+            batch_cursor = self.editor_widget.textCursor()
+            batch_cursor.beginEditBlock()
+        self.editor_widget.setUpdatesEnabled(False)
+        self.editor_widget.blockSignals(True)
+        try:
+            for start_line, end_line, content in sorted_commands:
+                try:
+                    success = self._apply_single_line_command(start_line, end_line, content)
+                    if success:
+                        success_count += 1
+                        _log.debug("applied line command: lines %s-%s", start_line, end_line)
+                    else:
+                        failed_commands.append(f"{start_line}-{end_line}")
+                except Exception as e:
+                    _log.error("failed to apply line command %s-%s: %s",
+                               start_line, end_line, e, exc_info=True)
+                    failed_commands.append(f"{start_line}-{end_line}")
+        finally:
+            self.editor_widget.blockSignals(False)
+            self.editor_widget.setUpdatesEnabled(True)
+            self.editor_widget.update()
+            if self._is_qsci:
+                self.editor_widget.endUndoAction()
+            elif batch_cursor is not None:
+                batch_cursor.endEditBlock()
+        return success_count, failed_commands
+
     def _apply_edited_code_with_toggle(self):
         """Apply edited code with toggle mode logic for AIEditCodeDialog"""
         try:
@@ -2347,36 +2938,33 @@ CRITICAL SPACING PRESERVATION INSTRUCTION:
                 return False
             
             # Log the operation
-            game_name = self.enhanced_context.get('game_info', {}).get('name', 'Unknown Game') if self.enhanced_context else 'Unknown'
+            game_name = self._game_name
             
             if self.toggle_mode == "full_file":
                 # Full file replacement mode
                 _log_ai_edit_activity(
-                    operation_type="edit_code_full",
+                    operation_type=_OP_EDIT_CODE_FULL,
                     game_name=game_name,
                     details={
                         'mode': 'full_file',
                         'lines_modified': 'entire_file',
-                        'original_length': len(self.enhanced_context.get('main_file_content', '')),
+                        'original_length': self._main_file_length,
                         'new_length': len(self.edited_code)
                     }
                 )
                 
                 if self.editor_widget:
-                    # Replace entire content in the editor
-                    if hasattr(self.editor_widget, 'setPlainText'):
-                        # QPlainTextEdit
-                        self.editor_widget.setPlainText(self.edited_code)
-                    elif hasattr(self.editor_widget, 'setText'):
-                        # QTextEdit
-                        self.editor_widget.setText(self.edited_code)
-                    else:
+                    # Replace entire content through the writer resolved in
+                    # __init__; re-probing the widget with hasattr on every
+                    # apply answered a question that never changes
+                    if self._editor_write:
+                        self._editor_write(self.edited_code)
+                    elif hasattr(self.editor_widget, 'textCursor'):
                         # For other widget types, try to set content
-                        if hasattr(self.editor_widget, 'textCursor'):
-                            cursor = self.editor_widget.textCursor()
-                            cursor.select(QTextCursor.Document)
-                            cursor.insertText(self.edited_code)
-                            self.editor_widget.setTextCursor(cursor)
+                        cursor = self.editor_widget.textCursor()
+                        cursor.select(QTextCursor.Document)
+                        cursor.insertText(self.edited_code)
+                        self.editor_widget.setTextCursor(cursor)
                 
                 QMessageBox.information(self, "Success", "Full file has been replaced with AI-generated content.")
                 return True
@@ -2390,24 +2978,22 @@ CRITICAL SPACING PRESERVATION INSTRUCTION:
                     ai_response = self.edited_code.strip()
                     
                     # Check if this looks like a conversational response (not code commands)
+                    lowered = ai_response.lower()
                     is_conversational = (
                         # Looks like AI is talking/explaining rather than giving commands
-                        any(phrase in ai_response.lower() for phrase in [
-                            "here's", "here is", "you can", "you should", "i suggest", 
-                            "i recommend", "let me", "i'll", "i would", "try this",
-                            "to improve", "to fix", "you might", "consider", "instead"
-                        ]) or
+                        _CONVERSATIONAL_RE.search(ai_response) is not None or
                         # Very short responses (likely conversational)
                         len(ai_response) < 50 or
-                        # Responses that don't look like code
-                        not any(char in ai_response for char in ['{', '}', '(', ')', ';', '=', '<', '>', ':', '"', "'"]) or
+                        # Responses that don't look like code; isdisjoint
+                        # probes the hash set in C and stops at the first hit
+                        _CODE_CHARS.isdisjoint(ai_response) or
                         # Responses that mention line numbers without proper format
-                        ('line' in ai_response.lower() and 'lines' not in ai_response.lower() and ':' not in ai_response)
+                        ('line' in lowered and 'lines' not in lowered and ':' not in ai_response)
                     )
                     
                     if is_conversational:
-                        print(f"🤖 Detected conversational AI response (no line commands)")
-                        print(f"   Response preview: {ai_response[:100]}{'...' if len(ai_response) > 100 else ''}")
+                        _log.debug("detected conversational AI response (no line commands)")
+                        _log.debug("response preview: %.100s", ai_response)
                         
                         # Ask user how they want to handle this
                         reply = QMessageBox.question(
@@ -2424,11 +3010,11 @@ CRITICAL SPACING PRESERVATION INSTRUCTION:
                         
                         if reply == QMessageBox.Yes:
                             # Temporarily switch to full file mode for this response
-                            print("🔄 User chose to use full file replacement for conversational AI response")
+                            _log.debug("user chose full file replacement for conversational AI response")
                             self.toggle_mode = "full_file"
                             return self._apply_edited_code_with_toggle()
                         else:
-                            print("❌ User chose to cancel - AI should use line commands")
+                            _log.debug("user chose to cancel - AI should use line commands")
                             QMessageBox.information(
                                 self, 
                                 "AI Response Format",
@@ -2442,12 +3028,12 @@ CRITICAL SPACING PRESERVATION INSTRUCTION:
                             return False
                     else:
                         # Fallback: if no line commands found but doesn't look conversational, treat as single replacement
-                        print("⚠️ No line commands found in AI response, using fallback method")
+                        _log.debug("no line commands found in AI response, using fallback method")
                         return self._apply_fallback_specific_lines()
                 
                 # Log the operation with multiple line modifications
                 _log_ai_edit_activity(
-                    operation_type="edit_code_specific_lines",
+                    operation_type=_OP_EDIT_CODE_LINES,
                     game_name=game_name,
                     details={
                         'mode': 'specific_lines',
@@ -2458,23 +3044,20 @@ CRITICAL SPACING PRESERVATION INSTRUCTION:
                 
                 if self.editor_widget:
                     # Apply line commands in reverse order to avoid line number shifts
-                    success_count = 0
-                    failed_commands = []
+                    # Sort by line number in descending order (bottom to top);
+                    # itemgetter keys in C and the in-place sort skips a copy
+                    line_commands.sort(key=itemgetter(0), reverse=True)
+                    sorted_commands = line_commands
                     
-                    # Sort by line number in descending order (bottom to top)
-                    sorted_commands = sorted(line_commands, key=lambda x: x[0], reverse=True)
-                    
-                    for start_line, end_line, content in sorted_commands:
-                        try:
-                            success = self._apply_single_line_command(start_line, end_line, content)
-                            if success:
-                                success_count += 1
-                                print(f"✅ Applied line command: lines {start_line}-{end_line}")
-                            else:
-                                failed_commands.append(f"{start_line}-{end_line}")
-                        except Exception as e:
-                            print(f"❌ Failed to apply line command {start_line}-{end_line}: {e}")
-                            failed_commands.append(f"{start_line}-{end_line}")
+                    # Splice every command into an in-memory line list and
+                    # swap the document once; editor-level application stays
+                    # around as the fallback if the bulk swap fails
+                    try:
+                        success_count, failed_commands = self._apply_commands_bulk(sorted_commands)
+                    except Exception as bulk_error:
+                        _log.error("bulk apply failed, falling back to per-command path: %s",
+                                   bulk_error, exc_info=True)
+                        success_count, failed_commands = self._apply_commands_sequential(sorted_commands)
                     
                     # Show results
                     if failed_commands:
@@ -2490,10 +3073,10 @@ CRITICAL SPACING PRESERVATION INSTRUCTION:
                     return False
                 
         except Exception as e:
-            game_name = self.enhanced_context.get('game_info', {}).get('name', 'Unknown Game') if self.enhanced_context else 'Unknown'
+            game_name = self._game_name
             QMessageBox.critical(self, "Error", f"Failed to apply edited code: {e}")
             _log_ai_edit_activity(
-                operation_type="edit_code_error",
+                operation_type=_OP_EDIT_CODE_ERROR,
                 game_name=game_name,
                 details={'error': str(e), 'mode': self.toggle_mode}
             )
@@ -2539,6 +3122,101 @@ CRITICAL SPACING PRESERVATION INSTRUCTION:
             print(f"Error logging AI edit activity: {e}")
 
 
+# Mode-button styles for AIEditionPopup. The same multi-hundred-character
+# QSS blobs were rebuilt inline at six call sites; module constants are
+# allocated once and shared by every popup instance.
+_POPUP_MODE_BTN_QSS = """
+    QPushButton {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
+            stop:0 #121212, stop:0.3 #121212, stop:0.7 #1a1a1a, stop:1 #121212);
+        border: 2px solid #E5E5E5;
+        border-radius: 8px;
+        padding: 20px;
+        font-size: 16px;
+        font-weight: bold;
+        text-align: left;
+        color: white;
+    }
+    QPushButton:hover {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
+            stop:0 #121212, stop:0.3 #161616, stop:0.7 #1e1e1e, stop:1 #121212);
+        border: 2px solid #E5E5E5;
+    }
+    QPushButton:pressed {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
+            stop:0 #0e0e0e, stop:0.3 #121212, stop:0.7 #161616, stop:1 #0e0e0e);
+        border: 2px solid #E5E5E5;
+    }
+"""
+
+# Edit-selected button carries both of its looks in one stylesheet, keyed by
+# the selState dynamic property - flipping the property and repolishing is
+# cheaper than reparsing a whole new stylesheet on every state change
+_POPUP_SEL_BTN_QSS = """
+    QPushButton[selState="ready"] {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
+            stop:0 #121212, stop:0.3 #121212, stop:0.7 #1a1a1a, stop:1 #121212);
+        border: 2px solid #E5E5E5;
+        border-radius: 8px;
+        padding: 20px;
+        font-size: 16px;
+        font-weight: bold;
+        text-align: left;
+        color: white;
+    }
+    QPushButton[selState="ready"]:hover {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
+            stop:0 #121212, stop:0.3 #161616, stop:0.7 #1e1e1e, stop:1 #121212);
+        border: 2px solid #E5E5E5;
+    }
+    QPushButton[selState="ready"]:pressed {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
+            stop:0 #0e0e0e, stop:0.3 #121212, stop:0.7 #161616, stop:1 #0e0e0e);
+        border: 2px solid #E5E5E5;
+    }
+    QPushButton[selState="empty"] {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
+            stop:0 #2a2a2a, stop:0.3 #2a2a2a, stop:0.7 #333333, stop:1 #2a2a2a);
+        border: 2px solid #555555;
+        border-radius: 8px;
+        padding: 20px;
+        font-size: 16px;
+        font-weight: bold;
+        text-align: left;
+        color: #E5E5E5;
+    }
+"""
+
+_POPUP_HEADER_QSS = """
+    QLabel {
+        color: #E5E5E5;
+        font-size: 20px;
+        font-weight: bold;
+        margin-bottom: 15px;
+    }
+"""
+
+_POPUP_CANCEL_BTN_QSS = """
+    QPushButton {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
+            stop:0 #121212, stop:0.3 #121212, stop:0.7 #1a1a1a, stop:1 #121212);
+        border: 2px solid #E5E5E5;
+        border-radius: 5px;
+        padding: 10px 20px;
+        color: white;
+    }
+    QPushButton:hover {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
+            stop:0 #121212, stop:0.3 #161616, stop:0.7 #1e1e1e, stop:1 #121212);
+        border: 2px solid #E5E5E5;
+    }
+    QPushButton:pressed {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
+            stop:0 #0e0e0e, stop:0.3 #121212, stop:0.7 #161616, stop:1 #0e0e0e);
+        border: 2px solid #E5E5E5;
+    }
+"""
+
 class AIEditionPopup(QDialog):
     """Popup for AI editing with two modes: Edit Code and Edit Selected"""
     
@@ -2551,14 +3229,49 @@ class AIEditionPopup(QDialog):
         self.end_line = 0
         self.edition_mode = None  # "edit_code" or "edit_selected"
         self.edited_code = None
+        # Last (enabled, qss) applied to the edit-selected button; Qt
+        # repolishes the widget on every setStyleSheet, so reapplying an
+        # unchanged state is pure overhead
+        self._selection_btn_state = None
+        # Last selection lookup, keyed by the selection's positions - the
+        # state check and the mode openers ask for the same selection
+        # back-to-back, and copying it out of the editor twice is wasted work
+        self._sel_cache = None
+        # When the editor exposes selectionChanged the signal invalidates the
+        # cache, so a non-None cache can be trusted without touching the
+        # editor - the readers then skip cursor construction entirely
+        self._sel_event_driven = False
+        # Coalesce rapid selectionChanged bursts (drag-select fires one per
+        # mouse move) into at most one state check per timer tick
+        self._sel_check_timer = QTimer(self)
+        self._sel_check_timer.setSingleShot(True)
+        self._sel_check_timer.setInterval(50)
+        self._sel_check_timer.timeout.connect(self._check_selection_state_impl)
+        if editor_widget is not None and hasattr(editor_widget, 'selectionChanged'):
+            editor_widget.selectionChanged.connect(self._invalidate_sel_cache)
+            editor_widget.selectionChanged.connect(self._check_selection_state)
+            self._sel_event_driven = True
+        # Bind the selection reader once - the widget type never changes after
+        # construction, so re-dispatching on it for every call is wasted work
+        if editor_widget is None:
+            self._get_sel_impl = None
+        elif _is_qsci_widget(editor_widget):
+            self._get_sel_impl = self._get_sel_qsci
+        else:
+            self._get_sel_impl = self._get_sel_qplain
         
         self.setWindowTitle("🤖 AI Code Editor")
         self.setModal(True)
         self.setFixedSize(500, 400)
-        self._setup_ui()
+        # Defer paints and polish until the whole widget tree is built
+        self.setUpdatesEnabled(False)
+        try:
+            self._setup_ui()
+        finally:
+            self.setUpdatesEnabled(True)
         
-        # Check initial selection state
-        self._check_selection_state()
+        # Check initial selection state right away, bypassing the debounce
+        self._check_selection_state_impl()
     
     def _get_text_cursor(self, editor_widget):
         """Get text cursor from editor widget, handling both QPlainTextEdit and QsciScintilla"""
@@ -2573,59 +3286,71 @@ class AIEditionPopup(QDialog):
             # QPlainTextEdit and similar widgets
             return editor_widget.textCursor()
     
+    def _invalidate_sel_cache(self):
+        """Drop the memoized selection when the editor selection changes"""
+        self._sel_cache = None
+    
     def _get_selected_text(self, editor_widget):
         """Get selected text from editor widget, handling both QPlainTextEdit and QsciScintilla"""
-        if editor_widget is None:
+        if self._get_sel_impl is None:
             return "", 0, 0
-            
         try:
-            # Check if it's a QsciScintilla using type comparison
-            if type(editor_widget).__name__ == 'QsciScintilla':
-                # QsciScintilla: get selection using its methods
-                if editor_widget.hasSelectedText():
-                    selected_text = editor_widget.selectedText()
-                    # For QsciScintilla, get line numbers differently
-                    line_from, index_from, line_to, index_to = editor_widget.getSelection()
-                    start_line = line_from + 1
-                    end_line = line_to + 1
-                    return selected_text, start_line, end_line
-                else:
-                    return "", 0, 0
-            else:
-                # QPlainTextEdit and similar widgets
-                cursor = editor_widget.textCursor()
-                if cursor.hasSelection():
-                    selected_text = cursor.selectedText()
-                    start_line = cursor.blockNumber() + 1
-                    end_line = cursor.blockNumber() + 1
-                    if cursor.selectionEnd() != cursor.selectionStart():
-                        # Multi-line selection
-                        temp_cursor = QTextCursor(cursor)
-                        temp_cursor.setPosition(cursor.selectionEnd())
-                        end_line = temp_cursor.blockNumber() + 1
-                    return selected_text, start_line, end_line
-                else:
-                    return "", 0, 0
+            return self._get_sel_impl()
         except Exception as e:
             print(f"Error getting selected text: {e}")
             return "", 0, 0
     
-    def _has_selection(self, editor_widget):
-        """Check if editor widget has text selected"""
-        if editor_widget is None:
-            return False
-            
-        try:
-            # Check if it's a QsciScintilla using type comparison
-            if type(editor_widget).__name__ == 'QsciScintilla':
-                return editor_widget.hasSelectedText()
-            else:
-                # QPlainTextEdit and similar widgets
-                cursor = editor_widget.textCursor()
-                return cursor.hasSelection()
-        except Exception as e:
-            print(f"Error checking selection: {e}")
-            return False
+    def _get_sel_qsci(self):
+        """Selection reader bound when the editor is a QsciScintilla"""
+        if self._sel_event_driven and self._sel_cache is not None:
+            return self._sel_cache[1]
+        editor_widget = self.editor_widget
+        key = editor_widget.getSelection()
+        if self._sel_cache is not None and self._sel_cache[0] == key:
+            return self._sel_cache[1]
+        if editor_widget.hasSelectedText():
+            selected_text = editor_widget.selectedText()
+            # For QsciScintilla, get line numbers differently
+            line_from, index_from, line_to, index_to = key
+            start_line = line_from + 1
+            end_line = line_to + 1
+            result = (selected_text, start_line, end_line)
+        else:
+            result = ("", 0, 0)
+        self._sel_cache = (key, result)
+        return result
+    
+    def _get_sel_qplain(self):
+        """Selection reader bound when the editor is a QPlainTextEdit-like widget"""
+        if self._sel_event_driven and self._sel_cache is not None:
+            return self._sel_cache[1]
+        cursor = self.editor_widget.textCursor()
+        key = (cursor.selectionStart(), cursor.selectionEnd())
+        if self._sel_cache is not None and self._sel_cache[0] == key:
+            return self._sel_cache[1]
+        if cursor.hasSelection():
+            selected_text = cursor.selectedText()
+            start_line = cursor.blockNumber() + 1
+            end_line = cursor.blockNumber() + 1
+            if cursor.selectionEnd() != cursor.selectionStart():
+                # Multi-line selection; findBlock avoids copying the cursor
+                end_line = cursor.document().findBlock(cursor.selectionEnd()).blockNumber() + 1
+            result = (selected_text, start_line, end_line)
+        else:
+            result = ("", 0, 0)
+        self._sel_cache = (key, result)
+        return result
+    
+    def _probe_selection(self, editor_widget):
+        """Return (text, start_line, end_line) for the editor selection, or None
+
+        Single entry point for the selection poll - checking for a selection
+        and then fetching it were two separate dispatches doing the same work.
+        """
+        selected_text, start_line, end_line = self._get_selected_text(editor_widget)
+        if not selected_text:
+            return None
+        return selected_text, start_line, end_line
 
     def _setup_ui(self):
         """Setup the AI edition popup UI"""
@@ -2635,20 +3360,11 @@ class AIEditionPopup(QDialog):
         
         # Header
         header_label = QLabel("🤖 AI Code Editor")
-        header_label.setStyleSheet("""
-            QLabel {
-                color: #E5E5E5;
-                font-size: 20px;
-                font-weight: bold;
-                margin-bottom: 15px;
-            }
-        """)
         header_label.setAlignment(Qt.AlignCenter)
         layout.addWidget(header_label)
         
         # Mode selection buttons
         mode_label = QLabel("Choose editing mode:")
-        mode_label.setStyleSheet("font-weight: bold; margin-bottom: 10px; color: #CCCCCC;")
         layout.addWidget(mode_label)
         
         # Button container
@@ -2658,57 +3374,11 @@ class AIEditionPopup(QDialog):
         
         # Edit Code button
         self.edit_code_button = QPushButton("📝 Edit Code")
-        self.edit_code_button.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
-                    stop:0 #121212, stop:0.3 #121212, stop:0.7 #1a1a1a, stop:1 #121212);
-                border: 2px solid #E5E5E5;
-                border-radius: 8px;
-                padding: 20px;
-                font-size: 16px;
-                font-weight: bold;
-                text-align: left;
-                color: white;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
-                    stop:0 #121212, stop:0.3 #161616, stop:0.7 #1e1e1e, stop:1 #121212);
-                border: 2px solid #E5E5E5;
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
-                    stop:0 #0e0e0e, stop:0.3 #121212, stop:0.7 #161616, stop:1 #0e0e0e);
-                border: 2px solid #E5E5E5;
-            }
-        """)
         self.edit_code_button.clicked.connect(self._open_edit_code_mode)
         button_layout.addWidget(self.edit_code_button)
         
         # Edit Selected button
         self.edit_selected_button = QPushButton("✂️ Edit Selected Lines")
-        self.edit_selected_button.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
-                    stop:0 #121212, stop:0.3 #121212, stop:0.7 #1a1a1a, stop:1 #121212);
-                border: 2px solid #E5E5E5;
-                border-radius: 8px;
-                padding: 20px;
-                font-size: 16px;
-                font-weight: bold;
-                text-align: left;
-                color: white;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
-                    stop:0 #121212, stop:0.3 #161616, stop:0.7 #1e1e1e, stop:1 #121212);
-                border: 2px solid #E5E5E5;
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
-                    stop:0 #0e0e0e, stop:0.3 #121212, stop:0.7 #161616, stop:1 #0e0e0e);
-                border: 2px solid #E5E5E5;
-            }
-        """)
         self.edit_selected_button.clicked.connect(self._open_edit_selected_mode)
         button_layout.addWidget(self.edit_selected_button)
         
@@ -2716,7 +3386,6 @@ class AIEditionPopup(QDialog):
         
         # Selection status
         self.selection_status_label = QLabel()
-        self.selection_status_label.setStyleSheet("color: #666; font-size: 12px; margin-top: 10px;")
         layout.addWidget(self.selection_status_label)
         
         # Cancel button
@@ -2724,149 +3393,69 @@ class AIEditionPopup(QDialog):
         cancel_layout.addStretch()
         
         self.cancel_button = QPushButton("Cancel")
-        self.cancel_button.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
-                    stop:0 #121212, stop:0.3 #121212, stop:0.7 #1a1a1a, stop:1 #121212);
-                border: 2px solid #E5E5E5;
-                border-radius: 5px;
-                padding: 10px 20px;
-                color: white;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
-                    stop:0 #121212, stop:0.3 #161616, stop:0.7 #1e1e1e, stop:1 #121212);
-                border: 2px solid #E5E5E5;
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
-                    stop:0 #0e0e0e, stop:0.3 #121212, stop:0.7 #161616, stop:1 #0e0e0e);
-                border: 2px solid #E5E5E5;
-            }
-        """)
         self.cancel_button.clicked.connect(self.reject)
         cancel_layout.addWidget(self.cancel_button)
         
         layout.addLayout(cancel_layout)
+        
+        # Style everything in one pass now that the tree is assembled;
+        # interleaving setStyleSheet with addWidget makes Qt repolish the
+        # partially built hierarchy at every step (the caller holds updates
+        # disabled for the whole method)
+        header_label.setStyleSheet(_POPUP_HEADER_QSS)
+        mode_label.setStyleSheet("font-weight: bold; margin-bottom: 10px; color: #CCCCCC;")
+        self.edit_code_button.setStyleSheet(_POPUP_MODE_BTN_QSS)
+        self.edit_selected_button.setProperty("selState", "ready")
+        self.edit_selected_button.setStyleSheet(_POPUP_SEL_BTN_QSS)
+        self.cancel_button.setStyleSheet(_POPUP_CANCEL_BTN_QSS)
+        self.selection_status_label.setStyleSheet("color: #666; font-size: 12px; margin-top: 10px;")
+    
+    def _set_selection_btn_state(self, enabled, state):
+        """Update the edit-selected button only when its state really changes"""
+        new_state = (enabled, state)
+        if new_state == self._selection_btn_state:
+            return
+        self._selection_btn_state = new_state
+        btn = self.edit_selected_button
+        btn.setEnabled(enabled)
+        btn.setProperty("selState", state)
+        # Repolish so the [selState=...] rules re-evaluate without a reparse
+        btn.style().unpolish(btn)
+        btn.style().polish(btn)
     
     def _check_selection_state(self):
+        """Schedule a coalesced selection-state check"""
+        self._sel_check_timer.start()
+    
+    def _check_selection_state_impl(self):
         """Check for cached selection first, then fall back to current selection"""
         # First, try to use cached selection
         cache_data = get_cached_selection()
-        if cache_data["selected_text"] and cache_data["selected_text"].strip():
-            self.selected_text = cache_data["selected_text"]
-            self.start_line = cache_data["start_line"]
-            self.end_line = cache_data["end_line"]
+        if cache_data.selected_text and cache_data.selected_text.strip():
+            self.selected_text = cache_data.selected_text
+            self.start_line = cache_data.start_line
+            self.end_line = cache_data.end_line
             
-            self.edit_selected_button.setEnabled(True)
-            self.edit_selected_button.setStyleSheet("""
-                QPushButton {
-                    background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
-                        stop:0 #121212, stop:0.3 #121212, stop:0.7 #1a1a1a, stop:1 #121212);
-                    border: 2px solid #E5E5E5;
-                    border-radius: 8px;
-                    padding: 20px;
-                    font-size: 16px;
-                    font-weight: bold;
-                    text-align: left;
-                    color: white;
-                }
-                QPushButton:hover {
-                    background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
-                        stop:0 #121212, stop:0.3 #161616, stop:0.7 #1e1e1e, stop:1 #121212);
-                    border: 2px solid #E5E5E5;
-                }
-                QPushButton:pressed {
-                    background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
-                        stop:0 #0e0e0e, stop:0.3 #121212, stop:0.7 #161616, stop:1 #0e0e0e);
-                    border: 2px solid #E5E5E5;
-                }
-            """)
+            self._set_selection_btn_state(True, "ready")
             self.selection_status_label.setText(f"✅ Using cached selection ({len(self.selected_text)} characters, lines {self.start_line}-{self.end_line})")
             return
         
         # If no cached selection, check current selection in editor
         if not self.editor_widget:
-            self.edit_selected_button.setEnabled(False)
-            self.edit_selected_button.setStyleSheet("""
-                QPushButton {
-                    background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
-                        stop:0 #2a2a2a, stop:0.3 #2a2a2a, stop:0.7 #333333, stop:1 #2a2a2a);
-                    border: 2px solid #555555;
-                    border-radius: 8px;
-                    padding: 20px;
-                    font-size: 16px;
-                    font-weight: bold;
-                    text-align: left;
-                    color: #E5E5E5;
-                }
-                QPushButton:disabled {
-                    background-color: #2a2a2a;
-                    border: 2px solid #555555;
-                    color: #E5E5E5;
-                }
-            """)
+            self._set_selection_btn_state(False, "empty")
             self.selection_status_label.setText("❌ No cached selection available - Select code and press F9 to cache it")
             return
         
         try:
             # Use the helper methods to handle both QPlainTextEdit and QsciScintilla
-            if self._has_selection(self.editor_widget):
-                selected_text, start_line, end_line = self._get_selected_text(self.editor_widget)
-                self.selected_text = selected_text
-                self.start_line = start_line
-                self.end_line = end_line
+            sel = self._probe_selection(self.editor_widget)
+            if sel is not None:
+                self.selected_text, self.start_line, self.end_line = sel
                 
-                self.edit_selected_button.setEnabled(True)
-                self.edit_selected_button.setStyleSheet("""
-                    QPushButton {
-                        background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
-                            stop:0 #121212, stop:0.3 #121212, stop:0.7 #1a1a1a, stop:1 #121212);
-                        border: 2px solid #E5E5E5;
-                        border-radius: 8px;
-                        padding: 20px;
-                        font-size: 16px;
-                        font-weight: bold;
-                        text-align: left;
-                        color: white;
-                    }
-                    QPushButton:hover {
-                        background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
-                            stop:0 #121212, stop:0.3 #161616, stop:0.7 #1e1e1e, stop:1 #121212);
-                        border: 2px solid #E5E5E5;
-                    }
-                    QPushButton:pressed {
-                        background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
-                            stop:0 #0e0e0e, stop:0.3 #121212, stop:0.7 #161616, stop:1 #0e0e0e);
-                        border: 2px solid #E5E5E5;
-                    }
-                    QPushButton:disabled {
-                        background-color: #2a2a2a;
-                        border: 2px solid #555;
-                        color: #666;
-                    }
-                """)
+                self._set_selection_btn_state(True, "ready")
                 self.selection_status_label.setText(f"📝 Current selection ({len(self.selected_text)} characters, lines {self.start_line}-{self.end_line}) - Press F9 to cache for AI")
             else:
-                self.edit_selected_button.setEnabled(False)
-                self.edit_selected_button.setStyleSheet("""
-                    QPushButton {
-                        background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
-                            stop:0 #2a2a2a, stop:0.3 #2a2a2a, stop:0.7 #333333, stop:1 #2a2a2a);
-                        border: 2px solid #555555;
-                        border-radius: 8px;
-                        padding: 20px;
-                        font-size: 16px;
-                        font-weight: bold;
-                        text-align: left;
-                        color: #E5E5E5;
-                    }
-                    QPushButton:disabled {
-                        background-color: #2a2a2a;
-                        border: 2px solid #555555;
-                        color: #E5E5E5;
-                    }
-                """)
+                self._set_selection_btn_state(False, "empty")
                 self.selection_status_label.setText("❌ No selection found - Select code and press F9 to cache it")
         except Exception as e:
             self.edit_selected_button.setEnabled(False)
@@ -2921,6 +3510,119 @@ class AIEditionPopup(QDialog):
             self.accept()
 
 
+# Stylesheet for AIAdvancedEditDialog, applied once on the dialog and routed
+# by objectName selectors - one Qt CSS parse per dialog tree instead of a
+# setStyleSheet (and repolish) per widget
+_ADV_EDIT_DIALOG_STYLE = """
+    QLabel#dialogHeader {
+        color: #E5E5E5;
+        font-size: 20px;
+        font-weight: bold;
+        margin-bottom: 15px;
+    }
+    QPushButton#toolBtn {
+        background-color: #2a2a2a;
+        border: 2px solid #3a3a3a;
+        border-radius: 5px;
+        padding: 10px 15px;
+        color: white;
+        font-size: 14px;
+        font-weight: bold;
+    }
+    QPushButton#toolBtn:hover {
+        background-color: #3a3a3a;
+        border-color: #E5E5E5;
+    }
+    QPushButton#toolBtn:pressed {
+        background-color: #1a1a1a;
+        border-color: #E5E5E5;
+    }
+    QSpinBox {
+        background-color: #2a2a2a;
+        border: 2px solid #3a3a3a;
+        border-radius: 5px;
+        padding: 5px;
+        color: white;
+        font-size: 14px;
+    }
+    QSpinBox:focus {
+        border-color: #E5E5E5;
+    }
+    QSpinBox::up-button, QSpinBox::down-button {
+        background-color: #3a3a3a;
+        border: none;
+        width: 15px;
+    }
+    QSpinBox::up-button:hover, QSpinBox::down-button:hover {
+        background-color: #4a4a4a;
+    }
+    QTextEdit#selectionPreview {
+        background-color: #E5E5E5;
+        border: 1px solid #ddd;
+        border-radius: 5px;
+        padding: 10px;
+        font-family: 'Courier New', monospace;
+        font-size: 12px;
+        color: #333;
+    }
+    QTextEdit#instructionInput {
+        border: 2px solid #ddd;
+        border-radius: 5px;
+        padding: 10px;
+        font-size: 14px;
+    }
+    QTextEdit#instructionInput:focus {
+        border-color: #E5E5E5;
+    }
+    QTextEdit#resultView {
+        background-color: #E5E5E5;
+        border: 1px solid #E5E5E5;
+        border-radius: 5px;
+        padding: 10px;
+        font-family: 'Courier New', monospace;
+        font-size: 12px;
+        color: #333;
+    }
+    QPushButton#primaryBtn, QPushButton#acceptBtn {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
+            stop:0 #121212, stop:0.3 #121212, stop:0.7 #1a1a1a, stop:1 #121212);
+        border: 2px solid #E5E5E5;
+        border-radius: 5px;
+        font-weight: bold;
+        color: white;
+        padding: 12px 20px;
+    }
+    QPushButton#primaryBtn:hover, QPushButton#acceptBtn:hover {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
+            stop:0 #121212, stop:0.3 #161616, stop:0.7 #1e1e1e, stop:1 #121212);
+        border: 2px solid #E5E5E5;
+    }
+    QPushButton#primaryBtn:pressed, QPushButton#acceptBtn:pressed {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
+            stop:0 #0e0e0e, stop:0.3 #121212, stop:0.7 #161616, stop:1 #0e0e0e);
+        border: 2px solid #E5E5E5;
+    }
+    QPushButton#primaryBtn:disabled {
+        background-color: #2a2a2a;
+        border: 2px solid #555;
+        color: #666;
+    }
+    QPushButton#acceptBtn:disabled {
+        background-color: #ccc;
+        color: #666;
+    }
+    QPushButton#cancelBtn {
+        background-color: #666;
+        color: white;
+        border: none;
+        border-radius: 5px;
+        padding: 12px 20px;
+    }
+    QPushButton#cancelBtn:hover {
+        background-color: #555;
+    }
+"""
+
 class AIAdvancedEditDialog(QDialog):
     """Advanced dialog for editing code with comprehensive AI assistance"""
     
@@ -2938,10 +3640,27 @@ class AIAdvancedEditDialog(QDialog):
         self.conversation_history = GAMAI_CONTEXT.get_context("global")
         GAMAI_CONTEXT.set_active_context("global")
         
-        self._setup_ui()
+        # File content is read on first access, not at dialog open - the
+        # common cancel-without-processing path never touches the disk
+        self._full_file_content = None
         
-        # Load current file content
-        self._load_file_content()
+        # Defer paints and polish until the whole widget tree is built
+        self.setUpdatesEnabled(False)
+        try:
+            self._setup_ui()
+        finally:
+            self.setUpdatesEnabled(True)
+    
+    @property
+    def full_file_content(self):
+        """Full file content for AI context, loaded lazily"""
+        if self._full_file_content is None:
+            self._load_file_content()
+        return self._full_file_content
+    
+    @full_file_content.setter
+    def full_file_content(self, value):
+        self._full_file_content = value
     
     def _get_text_cursor(self, editor_widget):
         """Get text cursor from editor widget, handling both QPlainTextEdit and QsciScintilla"""
@@ -2963,7 +3682,7 @@ class AIAdvancedEditDialog(QDialog):
             
         try:
             # Check if it's a QsciScintilla using type comparison
-            if type(editor_widget).__name__ == 'QsciScintilla':
+            if _is_qsci_widget(editor_widget):
                 # QsciScintilla: get selection using its methods
                 if editor_widget.hasSelectedText():
                     selected_text = editor_widget.selectedText()
@@ -2982,10 +3701,8 @@ class AIAdvancedEditDialog(QDialog):
                     start_line = cursor.blockNumber() + 1
                     end_line = cursor.blockNumber() + 1
                     if cursor.selectionEnd() != cursor.selectionStart():
-                        # Multi-line selection
-                        temp_cursor = QTextCursor(cursor)
-                        temp_cursor.setPosition(cursor.selectionEnd())
-                        end_line = temp_cursor.blockNumber() + 1
+                        # Multi-line selection; findBlock avoids copying the cursor
+                        end_line = cursor.document().findBlock(cursor.selectionEnd()).blockNumber() + 1
                     return selected_text, start_line, end_line
                 else:
                     return "", 0, 0
@@ -2995,20 +3712,14 @@ class AIAdvancedEditDialog(QDialog):
 
     def _setup_ui(self):
         """Setup the advanced edit dialog UI"""
+        self.setStyleSheet(_ADV_EDIT_DIALOG_STYLE)
         layout = QVBoxLayout(self)
         layout.setContentsMargins(20, 20, 20, 20)
         layout.setSpacing(15)
         
         # Header
         header_label = QLabel("🤖 AI Advanced Code Editor")
-        header_label.setStyleSheet("""
-            QLabel {
-                color: #E5E5E5;
-                font-size: 20px;
-                font-weight: bold;
-                margin-bottom: 15px;
-            }
-        """)
+        header_label.setObjectName("dialogHeader")
         layout.addWidget(header_label)
         
         # Selection tools section
@@ -3021,73 +3732,19 @@ class AIAdvancedEditDialog(QDialog):
         
         self.select_function_button = QPushButton("📦 Select Function")
         self.select_function_button.setToolTip("Select the current function/block")
-        self.select_function_button.setStyleSheet("""
-            QPushButton {
-                background-color: #2a2a2a;
-                border: 2px solid #3a3a3a;
-                border-radius: 5px;
-                padding: 10px 15px;
-                color: white;
-                font-size: 14px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #3a3a3a;
-                border-color: #E5E5E5;
-            }
-            QPushButton:pressed {
-                background-color: #1a1a1a;
-                border-color: #E5E5E5;
-            }
-        """)
+        self.select_function_button.setObjectName("toolBtn")
         self.select_function_button.clicked.connect(self._select_current_function)
         selection_layout.addWidget(self.select_function_button)
         
         self.select_element_button = QPushButton("🏷️ Select Element")
         self.select_element_button.setToolTip("Select the current HTML element")
-        self.select_element_button.setStyleSheet("""
-            QPushButton {
-                background-color: #2a2a2a;
-                border: 2px solid #3a3a3a;
-                border-radius: 5px;
-                padding: 10px 15px;
-                color: white;
-                font-size: 14px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #3a3a3a;
-                border-color: #E5E5E5;
-            }
-            QPushButton:pressed {
-                background-color: #1a1a1a;
-                border-color: #E5E5E5;
-            }
-        """)
+        self.select_element_button.setObjectName("toolBtn")
         self.select_element_button.clicked.connect(self._select_current_element)
         selection_layout.addWidget(self.select_element_button)
         
         self.select_all_button = QPushButton("📄 Select All")
         self.select_all_button.setToolTip("Select entire file")
-        self.select_all_button.setStyleSheet("""
-            QPushButton {
-                background-color: #2a2a2a;
-                border: 2px solid #3a3a3a;
-                border-radius: 5px;
-                padding: 10px 15px;
-                color: white;
-                font-size: 14px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #3a3a3a;
-                border-color: #E5E5E5;
-            }
-            QPushButton:pressed {
-                background-color: #1a1a1a;
-                border-color: #E5E5E5;
-            }
-        """)
+        self.select_all_button.setObjectName("toolBtn")
         self.select_all_button.clicked.connect(self._select_all_code)
         selection_layout.addWidget(self.select_all_button)
         
@@ -3106,77 +3763,17 @@ class AIAdvancedEditDialog(QDialog):
         self.start_line_input.setMaximum(9999)
         self.start_line_input.setValue(1)
         self.start_line_input.setPrefix("Start: ")
-        self.start_line_input.setStyleSheet("""
-            QSpinBox {
-                background-color: #2a2a2a;
-                border: 2px solid #3a3a3a;
-                border-radius: 5px;
-                padding: 5px;
-                color: white;
-                font-size: 14px;
-            }
-            QSpinBox:focus {
-                border-color: #E5E5E5;
-            }
-            QSpinBox::up-button, QSpinBox::down-button {
-                background-color: #3a3a3a;
-                border: none;
-                width: 15px;
-            }
-            QSpinBox::up-button:hover, QSpinBox::down-button:hover {
-                background-color: #4a4a4a;
-            }
-        """)
         manual_layout.addWidget(self.start_line_input)
         
         self.end_line_input = QSpinBox()
         self.end_line_input.setMinimum(1)
         self.end_line_input.setMaximum(9999)
         self.end_line_input.setValue(10)
-        self.end_line_input.setPrefix("End: ")
-        self.end_line_input.setStyleSheet("""
-            QSpinBox {
-                background-color: #2a2a2a;
-                border: 2px solid #3a3a3a;
-                border-radius: 5px;
-                padding: 5px;
-                color: white;
-                font-size: 14px;
-            }
-            QSpinBox:focus {
-                border-color: #E5E5E5;
-            }
-            QSpinBox::up-button, QSpinBox::down-button {
-                background-color: #3a3a3a;
-                border: none;
-                width: 15px;
-            }
-            QSpinBox::up-button:hover, QSpinBox::down-button:hover {
-                background-color: #4a4a4a;
-            }
-        """)
-        manual_layout.addWidget(self.end_line_input)
-        
-        self.manual_select_button = QPushButton("🎯 Select Range")
-        self.manual_select_button.setStyleSheet("""
-            QPushButton {
-                background-color: #2a2a2a;
-                border: 2px solid #3a3a3a;
-                border-radius: 5px;
-                padding: 10px 15px;
-                color: white;
-                font-size: 14px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #3a3a3a;
-                border-color: #E5E5E5;
-            }
-            QPushButton:pressed {
-                background-color: #1a1a1a;
-                border-color: #E5E5E5;
-            }
-        """)
+        self.end_line_input.setPrefix("End: ")
+        manual_layout.addWidget(self.end_line_input)
+        
+        self.manual_select_button = QPushButton("🎯 Select Range")
+        self.manual_select_button.setObjectName("toolBtn")
         self.manual_select_button.clicked.connect(self._select_line_range)
         manual_layout.addWidget(self.manual_select_button)
         
@@ -3189,17 +3786,7 @@ class AIAdvancedEditDialog(QDialog):
         
         self.selection_preview = QTextEdit()
         self.selection_preview.setMaximumHeight(150)
-        self.selection_preview.setStyleSheet("""
-            QTextEdit {
-                background-color: #E5E5E5;
-                border: 1px solid #ddd;
-                border-radius: 5px;
-                padding: 10px;
-                font-family: 'Courier New', monospace;
-                font-size: 12px;
-                color: #333;
-            }
-        """)
+        self.selection_preview.setObjectName("selectionPreview")
         self.selection_preview.setReadOnly(True)
         layout.addWidget(self.selection_preview)
         
@@ -3211,17 +3798,7 @@ class AIAdvancedEditDialog(QDialog):
         self.instruction_input = QTextEdit()
         self.instruction_input.setPlaceholderText("Describe what you want AI to do with the selected code (e.g., 'Add a new function to handle user input', 'Change the background color to blue', 'Optimize this JavaScript code', etc.)")
         self.instruction_input.setMaximumHeight(100)
-        self.instruction_input.setStyleSheet("""
-            QTextEdit {
-                border: 2px solid #ddd;
-                border-radius: 5px;
-                padding: 10px;
-                font-size: 14px;
-            }
-            QTextEdit:focus {
-                border-color: #E5E5E5;
-            }
-        """)
+        self.instruction_input.setObjectName("instructionInput")
         layout.addWidget(self.instruction_input)
         
         # AI result
@@ -3231,17 +3808,7 @@ class AIAdvancedEditDialog(QDialog):
         
         self.result_text_edit = QTextEdit()
         self.result_text_edit.setMaximumHeight(200)
-        self.result_text_edit.setStyleSheet("""
-            QTextEdit {
-                background-color: #E5E5E5;
-                border: 1px solid #E5E5E5;
-                border-radius: 5px;
-                padding: 10px;
-                font-family: 'Courier New', monospace;
-                font-size: 12px;
-                color: #333;
-            }
-        """)
+        self.result_text_edit.setObjectName("resultView")
         self.result_text_edit.setReadOnly(True)
         layout.addWidget(self.result_text_edit)
         
@@ -3249,79 +3816,19 @@ class AIAdvancedEditDialog(QDialog):
         button_layout = QHBoxLayout()
         
         self.process_button = QPushButton("🤖 AI Process")
-        self.process_button.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
-                    stop:0 #121212, stop:0.3 #121212, stop:0.7 #1a1a1a, stop:1 #121212);
-                border: 2px solid #E5E5E5;
-                border-radius: 5px;
-                font-weight: bold;
-                color: white;
-                padding: 12px 20px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
-                    stop:0 #121212, stop:0.3 #161616, stop:0.7 #1e1e1e, stop:1 #121212);
-                border: 2px solid #E5E5E5;
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
-                    stop:0 #0e0e0e, stop:0.3 #121212, stop:0.7 #161616, stop:1 #0e0e0e);
-                border: 2px solid #E5E5E5;
-            }
-            QPushButton:disabled {
-                background-color: #2a2a2a;
-                border: 2px solid #555;
-                color: #666;
-            }
-        """)
+        self.process_button.setObjectName("primaryBtn")
         self.process_button.clicked.connect(self._process_with_ai)
         button_layout.addWidget(self.process_button)
         
         button_layout.addStretch()
         
         self.cancel_button = QPushButton("Cancel")
-        self.cancel_button.setStyleSheet("""
-            QPushButton {
-                background-color: #666;
-                color: white;
-                border: none;
-                border-radius: 5px;
-                padding: 12px 20px;
-            }
-            QPushButton:hover {
-                background-color: #555;
-            }
-        """)
+        self.cancel_button.setObjectName("cancelBtn")
         self.cancel_button.clicked.connect(self.reject)
         button_layout.addWidget(self.cancel_button)
         
         self.accept_button = QPushButton("✅ Apply Changes")
-        self.accept_button.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
-                    stop:0 #121212, stop:0.3 #121212, stop:0.7 #1a1a1a, stop:1 #121212);
-                border: 2px solid #E5E5E5;
-                border-radius: 5px;
-                padding: 12px 20px;
-                font-weight: bold;
-                color: white;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
-                    stop:0 #121212, stop:0.3 #161616, stop:0.7 #1e1e1e, stop:1 #121212);
-                border: 2px solid #E5E5E5;
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
-                    stop:0 #0e0e0e, stop:0.3 #121212, stop:0.7 #161616, stop:1 #0e0e0e);
-                border: 2px solid #E5E5E5;
-            }
-            QPushButton:disabled {
-                background-color: #ccc;
-                color: #666;
-            }
-        """)
+        self.accept_button.setObjectName("acceptBtn")
         self.accept_button.clicked.connect(self.accept)
         self.accept_button.setEnabled(False)
         button_layout.addWidget(self.accept_button)
@@ -3331,11 +3838,16 @@ class AIAdvancedEditDialog(QDialog):
     def _load_file_content(self):
         """Load the full file content for AI context"""
         try:
-            if self.game and self.game.html_path and self.game.html_path.exists():
-                with open(self.game.html_path, 'r', encoding='utf-8') as f:
-                    self.full_file_content = f.read()
+            if self.game and self.game.html_path:
+                path = self.game.html_path
+                # Repeat Process-AI runs on an unchanged file cost one stat
+                # instead of a fresh read and decode
+                self.full_file_content = _read_text_cached(
+                    str(path), path.stat().st_mtime_ns)
             else:
                 self.full_file_content = ""
+        except FileNotFoundError:
+            self.full_file_content = ""
         except Exception as e:
             print(f"Error loading file content: {e}")
             self.full_file_content = ""
@@ -3346,10 +3858,13 @@ class AIAdvancedEditDialog(QDialog):
             # Load manifest if available
             if hasattr(self, 'game') and self.game and hasattr(self.game, 'game_file') and self.game.game_file:
                 manifest_path = Path(self.game.game_file).with_name('manifest.json')
-                if manifest_path.exists():
-                    with open(manifest_path, 'r', encoding='utf-8') as f:
-                        self.manifest_content = f.read()
-                else:
+                try:
+                    # mtime-keyed cache: unchanged manifests cost one stat,
+                    # and a missing file costs the same stat instead of an
+                    # exists() probe plus a racy open
+                    self.manifest_content = _read_text_cached(
+                        str(manifest_path), manifest_path.stat().st_mtime_ns)
+                except FileNotFoundError:
                     self.manifest_content = ""
             else:
                 self.manifest_content = ""
@@ -3382,7 +3897,7 @@ class AIAdvancedEditDialog(QDialog):
         """Select entire file"""
         if self.editor_widget:
             # Check if it's a QsciScintilla using type comparison
-            if type(self.editor_widget).__name__ == 'QsciScintilla':
+            if _is_qsci_widget(self.editor_widget):
                 # QsciScintilla: select entire document
                 self.editor_widget.selectAll()
                 selected_text = self.editor_widget.text()
@@ -3408,7 +3923,7 @@ class AIAdvancedEditDialog(QDialog):
         
         if self.editor_widget:
             # Check if it's a QsciScintilla using type comparison
-            if type(self.editor_widget).__name__ == 'QsciScintilla':
+            if _is_qsci_widget(self.editor_widget):
                 # QsciScintilla: set selection using line/column positions
                 # QsciScintilla lines are 0-indexed
                 line_from = start_line - 1
@@ -3461,7 +3976,7 @@ class AIAdvancedEditDialog(QDialog):
             self._load_current_context()
             
             # Get current selection
-            if type(self.editor_widget).__name__ == 'QsciScintilla':
+            if _is_qsci_widget(self.editor_widget):
                 # QsciScintilla
                 if not self.editor_widget.hasSelectedText():
                     QMessageBox.warning(self, "No Selection", "Please select some code first.")
@@ -3537,60 +4052,46 @@ RESPONSE FORMAT:
         return prompt
     
     def _call_ai_for_code_edit(self, prompt):
-        """Call AI to edit the selected code"""
-        try:
-            # Create AI model instance
-            ai_model, model_name = create_gamai_model()
-            if not ai_model:
-                raise Exception("AI model not available")
-            
-            # Show current model being used
-            self.process_button.setText(f"🤖 AI Processing ({model_name})...")
-            
-            # Generate AI response with fallback capability
-            try:
-                response = ai_model.generate_content(prompt)
-                ai_response = response.text.strip()
-            except Exception as rate_limit_error:
-                # Check if it's a rate limit error and try backup model
-                error_msg = str(rate_limit_error).lower()
-                if "rate limit" in error_msg or "quota" in error_msg or "limit" in error_msg:
-                    print(f"🔄 Rate limit reached on {model_name}, switching to backup model...")
-                    # Switch to backup model
-                    ai_model, backup_model_name = switch_to_backup_model(model_name)
-                    if not ai_model:
-                        raise Exception("Failed to switch to backup model")
-                    
-                    # Update button text to show backup model
-                    self.process_button.setText(f"🤖 AI Processing ({backup_model_name})...")
-                    
-                    # Try again with backup model
-                    response = ai_model.generate_content(prompt)
-                    ai_response = response.text.strip()
-                else:
-                    # Re-raise if it's not a rate limit error
-                    raise rate_limit_error
-            
-            # Extract content from markdown code blocks if present
-            extracted_content = extract_content_from_code_blocks(ai_response)
-            
-            # Set the result
-            self.result_text_edit.setPlainText(ai_response)
-            self.edited_code = extracted_content
-            
-            # Enable accept button
-            self.accept_button.setEnabled(True)
-            
-            # Re-enable process button
-            self.process_button.setEnabled(True)
-            self.process_button.setText("🤖 AI Process")
-            
-            QMessageBox.information(self, "Success", "AI has processed your code. Review the result and click 'Apply Changes' to use it.")
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"AI processing failed: {e}")
-            self.process_button.setEnabled(True)
-            self.process_button.setText("🤖 AI Process")
+        """Start the AI edit on a worker thread; the event loop keeps running"""
+        # Reuse the session's model instance; only the first click builds it
+        ai_model, model_name = get_cached_gamai_model()
+        if not ai_model:
+            self._on_ai_failed("AI model not available")
+            return
+        
+        # Show current model being used
+        self.process_button.setText(f"🤖 AI Processing ({model_name})...")
+        
+        # Generate off the UI thread; results come back via signals on the
+        # main thread, and parenting the worker to the dialog ties lifetimes
+        self._ai_worker = AIGenerateWorker(ai_model, model_name, prompt, self)
+        self._ai_worker.finished_text.connect(self._on_ai_finished)
+        self._ai_worker.failed.connect(self._on_ai_failed)
+        self._ai_worker.start()
+
+    def _on_ai_finished(self, ai_response, model_name):
+        """Handle a completed AI generation on the UI thread"""
+        # Extract content from markdown code blocks if present
+        extracted_content = extract_content_from_code_blocks(ai_response)
+        
+        # Set the result
+        self.result_text_edit.setPlainText(ai_response)
+        self.edited_code = extracted_content
+        
+        # Enable accept button
+        self.accept_button.setEnabled(True)
+        
+        # Re-enable process button
+        self.process_button.setEnabled(True)
+        self.process_button.setText("🤖 AI Process")
+        
+        QMessageBox.information(self, "Success", "AI has processed your code. Review the result and click 'Apply Changes' to use it.")
+
+    def _on_ai_failed(self, message):
+        """Handle a failed AI generation on the UI thread"""
+        QMessageBox.critical(self, "Error", f"AI processing failed: {message}")
+        self.process_button.setEnabled(True)
+        self.process_button.setText("🤖 AI Process")
     
     def get_edited_code(self):
         """Get the AI-edited code"""
@@ -3643,9 +4144,16 @@ class AIEditSelectedDialog(QDialog):
         self.conversation_history = GAMAI_CONTEXT.get_context("global")
         GAMAI_CONTEXT.set_active_context("global")
         
-        self._setup_ui()
+        # Defer paints and polish until the whole widget tree is built
+        self.setUpdatesEnabled(False)
+        try:
+            self._setup_ui()
+        finally:
+            self.setUpdatesEnabled(True)
         
-        # Load current file content for AI context
+        # Load current file content for AI context off the UI thread so the
+        # dialog opens immediately even for large game files
+        self.full_file_content = ""
         self._load_file_content()
     
     def _setup_ui(self):
@@ -3838,16 +4346,15 @@ class AIEditSelectedDialog(QDialog):
             self.enhanced_context = {}
     
     def _load_file_content(self):
-        """Load the full file content for AI context"""
-        try:
-            if self.game and self.game.html_path and self.game.html_path.exists():
-                with open(self.game.html_path, 'r', encoding='utf-8') as f:
-                    self.full_file_content = f.read()
-            else:
-                self.full_file_content = ""
-        except Exception as e:
-            print(f"Error loading file content: {e}")
-            self.full_file_content = ""
+        """Start a background read of the full file content for AI context"""
+        if self.game and self.game.html_path and self.game.html_path.exists():
+            self._file_loader = FileContentLoader(self.game.html_path, self)
+            self._file_loader.content_ready.connect(self._on_file_content_ready)
+            self._file_loader.start()
+    
+    def _on_file_content_ready(self, content):
+        """Store the file content once the background read finishes"""
+        self.full_file_content = content
     
     def _process_with_ai(self):
         """Process the code editing request with AI and prompt analysis"""
@@ -3864,19 +4371,10 @@ class AIEditSelectedDialog(QDialog):
             # Load current context BEFORE AI processing (user's suggestion)
             self._load_current_context()
             
-            # First, check prompt relevance
-            relevance_check = self._check_prompt_relevance(instruction)
-            
-            if relevance_check == "unrelated":
-                # Show fallback dialog
-                self._show_incompatibility_dialog(instruction)
-                return
-            
-            # Create AI prompt for code editing
-            prompt = self._create_ai_prompt(instruction)
-            
-            # Call AI to edit the code
-            self._call_ai_for_code_edit(prompt)
+            # Check prompt relevance on a worker thread; the edit call is
+            # chained from _on_relevance_checked so no model round-trip ever
+            # runs on the UI thread
+            self._check_prompt_relevance(instruction)
             
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to process with AI: {e}")
@@ -3884,9 +4382,8 @@ class AIEditSelectedDialog(QDialog):
             self.process_button.setText("🤖 AI Process")
     
     def _check_prompt_relevance(self, instruction):
-        """Check if the user instruction is relevant to the selected code"""
-        try:
-            prompt = f"""Analyze if the user's instruction is relevant to the selected code.
+        """Check instruction relevance on a worker thread and chain the edit"""
+        prompt = f"""Analyze if the user's instruction is relevant to the selected code.
 
 SELECTED CODE:
 ```html
@@ -3906,45 +4403,50 @@ Respond with only one word:
 
 Example of unrelated: Selecting a div element but asking to "change the button color" when there's no button in the selected code."""
 
-            # Create AI model instance
-            ai_model, model_name = create_gamai_model()
-            if not ai_model:
-                return "relevant"  # Default to allowing if AI is not available
-            
-            # Generate AI response with fallback capability
-            try:
-                response = ai_model.generate_content(prompt)
-                result = response.text.strip().lower()
-            except Exception as rate_limit_error:
-                # Check if it's a rate limit error and try backup model
-                error_msg = str(rate_limit_error).lower()
-                if "rate limit" in error_msg or "quota" in error_msg or "limit" in error_msg:
-                    print(f"🔄 Rate limit reached on {model_name} (prompt check), switching to backup model...")
-                    # Switch to backup model
-                    ai_model, backup_model_name = switch_to_backup_model(model_name)
-                    if not ai_model:
-                        return "relevant"  # Default to allowing if backup fails
-                    
-                    # Try again with backup model
-                    response = ai_model.generate_content(prompt)
-                    result = response.text.strip().lower()
-                else:
-                    # Re-raise if it's not a rate limit error
-                    raise rate_limit_error
-            
-            self.prompt_analysis_result = result
-            if result == "unrelated":
-                self.relevance_label.setText("⚠️ Warning: Your instruction may not match the selected code. AI will offer alternatives.")
-                self.relevance_label.setStyleSheet("color: #E5E5E5; font-size: 12px; margin-top: 5px;")
-            else:
-                self.relevance_label.setText("✅ Your instruction looks relevant to the selected code.")
-                self.relevance_label.setStyleSheet("color: #E5E5E5; font-size: 12px; margin-top: 5px;")
+        # Create AI model instance
+        ai_model, model_name = get_cached_gamai_model()
+        if not ai_model:
+            # Default to allowing if AI is not available
+            self._on_relevance_checked("relevant", instruction)
+            return
+        
+        # The worker already handles the rate-limit fallback to the backup
+        # model; any other failure defaults to "relevant" like before
+        self._relevance_worker = AIGenerateWorker(ai_model, model_name, prompt, self)
+        self._relevance_worker.finished_text.connect(
+            lambda text, _model: self._on_relevance_checked(text.strip().lower(), instruction))
+        self._relevance_worker.failed.connect(
+            lambda _message: self._on_relevance_checked("relevant", instruction))
+        self._relevance_worker.start()
+    
+    def _on_relevance_checked(self, result, instruction):
+        """Continue the edit pipeline once the relevance verdict is in"""
+        self.prompt_analysis_result = result
+        if result == "unrelated":
+            self.relevance_label.setText("⚠️ Warning: Your instruction may not match the selected code. AI will offer alternatives.")
+            self.relevance_label.setStyleSheet("color: #E5E5E5; font-size: 12px; margin-top: 5px;")
+            # Show fallback dialog
+            self._show_incompatibility_dialog(instruction)
+            return
+        self.relevance_label.setText("✅ Your instruction looks relevant to the selected code.")
+        self.relevance_label.setStyleSheet("color: #E5E5E5; font-size: 12px; margin-top: 5px;")
+        
+        try:
+            # Make sure the background file read finished before building the
+            # prompt; the relevance round-trip all but guarantees it has
+            loader = getattr(self, '_file_loader', None)
+            if loader is not None and loader.isRunning():
+                loader.wait()
             
-            return result
+            # Create AI prompt for code editing
+            prompt = self._create_ai_prompt(instruction)
             
+            # Call AI to edit the code
+            self._call_ai_for_code_edit(prompt)
         except Exception as e:
-            print(f"Error checking prompt relevance: {e}")
-            return "relevant"  # Default to allowing if check fails
+            QMessageBox.critical(self, "Error", f"Failed to process with AI: {e}")
+            self.process_button.setEnabled(True)
+            self.process_button.setText("🤖 AI Process")
     
     def _show_incompatibility_dialog(self, instruction):
         """Show dialog when prompt doesn't match selected content"""
@@ -4025,60 +4527,46 @@ RESPONSE FORMAT:
         return prompt
     
     def _call_ai_for_code_edit(self, prompt):
-        """Call AI to edit the selected code"""
-        try:
-            # Create AI model instance
-            ai_model, model_name = create_gamai_model()
-            if not ai_model:
-                raise Exception("AI model not available")
-            
-            # Show current model being used
-            self.process_button.setText(f"🤖 AI Processing ({model_name})...")
-            
-            # Generate AI response with fallback capability
-            try:
-                response = ai_model.generate_content(prompt)
-                ai_response = response.text.strip()
-            except Exception as rate_limit_error:
-                # Check if it's a rate limit error and try backup model
-                error_msg = str(rate_limit_error).lower()
-                if "rate limit" in error_msg or "quota" in error_msg or "limit" in error_msg:
-                    print(f"🔄 Rate limit reached on {model_name}, switching to backup model...")
-                    # Switch to backup model
-                    ai_model, backup_model_name = switch_to_backup_model(model_name)
-                    if not ai_model:
-                        raise Exception("Failed to switch to backup model")
-                    
-                    # Update button text to show backup model
-                    self.process_button.setText(f"🤖 AI Processing ({backup_model_name})...")
-                    
-                    # Try again with backup model
-                    response = ai_model.generate_content(prompt)
-                    ai_response = response.text.strip()
-                else:
-                    # Re-raise if it's not a rate limit error
-                    raise rate_limit_error
-            
-            # Extract content from markdown code blocks if present
-            extracted_content = extract_content_from_code_blocks(ai_response)
-            
-            # Set the result
-            self.result_text_edit.setPlainText(ai_response)
-            self.edited_code = extracted_content
-            
-            # Enable accept button
-            self.accept_button.setEnabled(True)
-            
-            # Re-enable process button
-            self.process_button.setEnabled(True)
-            self.process_button.setText("🤖 AI Process")
-            
-            QMessageBox.information(self, "Success", "AI has processed your code. Review the result and click 'Apply Changes' to use it.")
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"AI processing failed: {e}")
-            self.process_button.setEnabled(True)
-            self.process_button.setText("🤖 AI Process")
+        """Start the AI edit on a worker thread; the event loop keeps running"""
+        # Reuse the session's model instance; only the first click builds it
+        ai_model, model_name = get_cached_gamai_model()
+        if not ai_model:
+            self._on_ai_failed("AI model not available")
+            return
+        
+        # Show current model being used
+        self.process_button.setText(f"🤖 AI Processing ({model_name})...")
+        
+        # Generate off the UI thread; results come back via signals on the
+        # main thread, and parenting the worker to the dialog ties lifetimes
+        self._ai_worker = AIGenerateWorker(ai_model, model_name, prompt, self)
+        self._ai_worker.finished_text.connect(self._on_ai_finished)
+        self._ai_worker.failed.connect(self._on_ai_failed)
+        self._ai_worker.start()
+
+    def _on_ai_finished(self, ai_response, model_name):
+        """Handle a completed AI generation on the UI thread"""
+        # Extract content from markdown code blocks if present
+        extracted_content = extract_content_from_code_blocks(ai_response)
+        
+        # Set the result
+        self.result_text_edit.setPlainText(ai_response)
+        self.edited_code = extracted_content
+        
+        # Enable accept button
+        self.accept_button.setEnabled(True)
+        
+        # Re-enable process button
+        self.process_button.setEnabled(True)
+        self.process_button.setText("🤖 AI Process")
+        
+        QMessageBox.information(self, "Success", "AI has processed your code. Review the result and click 'Apply Changes' to use it.")
+
+    def _on_ai_failed(self, message):
+        """Handle a failed AI generation on the UI thread"""
+        QMessageBox.critical(self, "Error", f"AI processing failed: {message}")
+        self.process_button.setEnabled(True)
+        self.process_button.setText("🤖 AI Process")
     
     def get_edited_code(self):
         """Get the AI-edited code"""
@@ -4102,7 +4590,7 @@ RESPONSE FORMAT:
             print(f"🔧 Original edited code: {repr(self.edited_code[:50])}{'...' if len(self.edited_code) > 50 else ''}")
             
             # Handle different editor types
-            if type(self.editor_widget).__name__ == 'QsciScintilla':
+            if _is_qsci_widget(self.editor_widget):
                 # Handle QsciScintilla editor
                 if self.editor_widget.hasSelectedText():
                     # Get the current selection
@@ -4172,7 +4660,6 @@ RESPONSE FORMAT:
             
         except Exception as e:
             print(f"❌ Error applying edited code: {e}")
-            import traceback
             traceback.print_exc()
             QMessageBox.critical(self, "Error", f"Failed to apply edited code: {e}")
             
@@ -5606,7 +6093,7 @@ class AIGameImportDialog(QDialog):
                 raise Exception("AI model not available. Please check your API key configuration.")
             
             # Generate response
-            response = model.generate_content(ai_prompt)
+            response = generate_ai_content(model, ai_prompt)
             ai_response = response.text
             
             # Parse AI response
@@ -5740,7 +6227,7 @@ RESPOND ONLY WITH THE JSON FORMAT ABOVE, NOTHING ELSE:
             json_str = ai_response[start_idx:end_idx + 1]
             
             # Parse JSON
-            manifest_data = json.loads(json_str)
+            manifest_data = _json_loads(json_str)
             
             # Validate required fields
             required_fields = ['name', 'version', 'main_categories', 'sub_categories']
@@ -6905,7 +7392,7 @@ class OneShotGameDialog(QDialog):
                     current_model = backup_model
                 
                 # Generate response
-                response = model.generate_content(ai_prompt)
+                response = generate_ai_content(model, ai_prompt)
                 
                 # Log which model was used
                 print(f"Game generation using model: {current_model}")
@@ -7083,7 +7570,7 @@ class OneShotGameDialog(QDialog):
                     current_model = backup_model
                 
                 # Generate response
-                response = model.generate_content(ai_prompt)
+                response = generate_ai_content(model, ai_prompt)
                 
                 # Log which model was used
                 print(f"Game generation using model: {current_model}")
@@ -7112,7 +7599,7 @@ class OneShotGameDialog(QDialog):
                     print("Model configuration issue - check AI model settings")
                 elif "API key" in error_msg.lower() or "authentication" in error_msg.lower():
                     print("API key issue - check AI configuration")
-                elif "quota" in error_msg.lower() or "rate limit" in error_msg.lower():
+                elif _is_rate_limit_error(error_msg):
                     print("Rate limit reached - try again later or check API quota")
                 
                 return False
@@ -7678,7 +8165,7 @@ class SurpriseGameDialog(QDialog):
                     current_model = backup_model
                 
                 # Generate response
-                response = model.generate_content(ai_prompt)
+                response = generate_ai_content(model, ai_prompt)
                 
                 # Log which model was used
                 print(f"Surprise game generation using model: {current_model}")
@@ -8567,7 +9054,7 @@ class ForYouGameDialog(QDialog):
                     current_model = backup_model
                 
                 # Generate response
-                response = model.generate_content(ai_prompt)
+                response = generate_ai_content(model, ai_prompt)
                 
                 # Log which model was used
                 print(f"For You game generation using model: {current_model}")
@@ -9335,8 +9822,8 @@ class GameOptionsDialog(QDialog):
         info_layout.setSpacing(8)
         
         # Game info with categories
-        main_cat_display = format_categories_for_display(self.game.main_categories, "Main-Category", MAIN_CATEGORIES)
-        sub_cat_display = format_categories_for_display(self.game.sub_categories, "Sub-Category", SUB_CATEGORIES)
+        main_cat_display = format_categories_for_display(self.game.main_categories, "Main-Category", MAIN_CATEGORIES_SET)
+        sub_cat_display = format_categories_for_display(self.game.sub_categories, "Sub-Category", SUB_CATEGORIES_SET)
         
         # Format auto-tracking information
         # Format auto-tracking information - show total minutes only
@@ -9625,8 +10112,8 @@ class GameOptionsDialog(QDialog):
             return  # Safety check
         
         # Game info with categories
-        main_cat_display = format_categories_for_display(self.game.main_categories, "Main-Category", MAIN_CATEGORIES)
-        sub_cat_display = format_categories_for_display(self.game.sub_categories, "Sub-Category", SUB_CATEGORIES)
+        main_cat_display = format_categories_for_display(self.game.main_categories, "Main-Category", MAIN_CATEGORIES_SET)
+        sub_cat_display = format_categories_for_display(self.game.sub_categories, "Sub-Category", SUB_CATEGORIES_SET)
         
         # Format auto-tracking information
         # Format auto-tracking information - show total minutes only
@@ -10002,7 +10489,7 @@ class IconOptionsDialog(QDialog):
         """Custom icon option - select and set custom icon"""
         try:
             # Check if PIL is available for image validation
-            if not HAS_PIL:
+            if not has_pil():
                 QMessageBox.warning(
                     self, 
                     "Feature Unavailable", 
@@ -11038,7 +11525,7 @@ class GamaiChatDialog(QDialog):
     
     def _initialize_ai(self):
         """Initialize the AI model"""
-        if not HAS_GEMINI_AI:
+        if not has_gemini_ai():
             self._add_message("system", "❌ Gemini AI not available. Please install the Google Generative AI library.")
             self.send_button.setEnabled(False)
             return
@@ -11104,37 +11591,29 @@ class GamaiChatDialog(QDialog):
             # Get persona based on context (for now, use default)
             persona = config.get("Personas", {}).get("Default", GAMAI_PERSONA)
             
-            # Create context-aware prompt
-            context_messages = self.conversation_history.copy()
-            context_messages.insert(0, {"role": "system", "content": persona})
-            
-            # Convert to simple text for now
-            full_prompt = persona + "\n\n" + "\n".join([msg["content"] for msg in context_messages])
+            # Create context-aware prompt, ordered for implicit prompt caching
+            full_prompt = build_cache_friendly_prompt(persona, self.conversation_history)
             
             # Try primary model first
             try:
-                response = self.model.generate_content(full_prompt)
+                response = generate_ai_content(self.model, full_prompt)
                 ai_response = response.text
                 
             except Exception as e:
-                error_msg = str(e).lower()
-                
                 # Check if it's a rate limit error
-                if "rate limit" in error_msg or "quota" in error_msg or "limit" in error_msg:
+                if _is_rate_limit_error(e):
                     # Try backup model (flash)
                     self.status_label.setText("● Rate limit reached, switching to Flash...")
                     self._switch_to_backup_model()
                     
                     try:
-                        response = self.model.generate_content(full_prompt)
+                        response = generate_ai_content(self.model, full_prompt)
                         ai_response = response.text
                         self._add_message("system", "🔄 Switched to Flash model due to Pro rate limit.")
                         
                     except Exception as e2:
-                        error_msg2 = str(e2).lower()
-                        
                         # Both models failed
-                        if "rate limit" in error_msg2 or "quota" in error_msg2 or "limit" in error_msg2:
+                        if _is_rate_limit_error(e2):
                             ai_response = "❌ API rate limit reached for both Pro and Flash models. Please wait before trying again or check your API key quotas."
                         else:
                             ai_response = f"❌ Error with Flash model: {str(e2)}"
@@ -11472,7 +11951,6 @@ class GamaiChatWidget(QWidget):
                 
         except Exception as e:
             print(f"❌ Error in _find_main_window: {e}")
-            import traceback
             traceback.print_exc()
     
     def _setup_ui(self):
@@ -11584,7 +12062,7 @@ class GamaiChatWidget(QWidget):
     
     def _initialize_ai(self):
         """Initialize the AI model for this context"""
-        if not HAS_GEMINI_AI:
+        if not has_gemini_ai():
             self._add_message("system", "❌ Gemini AI not available.")
             self.send_button.setEnabled(False)
             return
@@ -11652,40 +12130,27 @@ class GamaiChatWidget(QWidget):
                 games_text = ', '.join(available_games) if available_games else "No games available"
             
             if self.context_type == "editor":
-                persona = personas.get("EditorChat", "You are GAMAI, helping with code editing and development.")
+                persona = personas.get("EditorChat", _build_system_prompt("editor", ""))
             elif self.context_type == "game":
-                persona = personas.get("GameplayChat", "You are GAMAI, assisting with gameplay and game-related questions.")
+                persona = personas.get("GameplayChat", _build_system_prompt("game", ""))
             else:
                 # Main menu AI with tool-calls support
                 games_text = ', '.join(available_games) if available_games else "No games available"
-                persona = personas.get("Default", 
-                    f"You are GAMAI, the GameBox assistant in main menu mode. "
-                    f"Available games: {games_text}. "
-                    f"Available tools: play_game_name (opens game in play mode), edit_game_name (opens game in editor mode), get_tools (shows all available tools). "
-                    f"CRITICAL: When users want to open ANY game, you MUST use JSON tool-calls. "
-                    f"For play mode: {{\"tool\": \"play_game_name\", \"parameters\": {{\"name\": \"Game Name\"}}}} "
-                    f"For edit mode: {{\"tool\": \"edit_game_name\", \"parameters\": {{\"name\": \"Game Name\"}}}} "
-                    f"Examples: 'play candy crush', 'edit maser fighter', 'open game name'. "
-                    f"If a game isn't found, show the user what games are available."
-                )
-            
-            # Create context-aware prompt
-            context_messages = self.conversation_history.copy()
-            context_messages.insert(0, {"role": "system", "content": persona})
+                persona = personas.get("Default", _build_system_prompt("main", games_text))
             
             # Debug: Print available games for AI (only for main menu context)
             if self.context_type == "global":
                 print(f"🔍 AI Available Games: {available_games}")
-            
-            # Convert to simple text
-            full_prompt = persona + "\n\n" + "\n".join([msg["content"] for msg in context_messages])
+
+            # Create context-aware prompt, ordered for implicit prompt caching
+            full_prompt = build_cache_friendly_prompt(persona, self.conversation_history)
             
             # Debug: Show full prompt (truncated)
             print(f"🔍 Full AI Prompt (first 500 chars): {full_prompt[:500]}...")
             
             # Try primary model first
             try:
-                response = self.model.generate_content(full_prompt)
+                response = generate_ai_content(self.model, full_prompt)
                 ai_response = response.text
                 
                 # Process tool-calls if in main menu context
@@ -11695,21 +12160,17 @@ class GamaiChatWidget(QWidget):
                     print(f"🔧 After tool-calls processing: {ai_response[:200]}...")
                 
             except Exception as e:
-                error_msg = str(e).lower()
-                
                 # Handle rate limits - try backup model
-                if "rate limit" in error_msg or "quota" in error_msg or "limit" in error_msg:
+                if _is_rate_limit_error(e):
                     self._switch_to_backup_model()
                     
                     try:
-                        response = self.model.generate_content(full_prompt)
+                        response = generate_ai_content(self.model, full_prompt)
                         ai_response = response.text
                         self._add_message("system", "🔄 Switched to Flash model due to rate limit.")
                         
                     except Exception as e2:
-                        error_msg2 = str(e2).lower()
-                        
-                        if "rate limit" in error_msg2 or "quota" in error_msg2 or "limit" in error_msg2:
+                        if _is_rate_limit_error(e2):
                             ai_response = "❌ API rate limit reached for both models."
                         else:
                             ai_response = f"❌ Error: {str(e2)}"
@@ -12224,7 +12685,6 @@ class GamaiChatWidget(QWidget):
             
         except Exception as e:
             print(f"❌ Error opening game '{game_name}': {e}")
-            import traceback
             traceback.print_exc()
             return False
     
@@ -12360,12 +12820,11 @@ RESPONSE FORMAT:
             
             # Generate AI response with fallback capability
             try:
-                response = ai_model.generate_content(prompt)
+                response = generate_ai_content(ai_model, prompt)
                 ai_response = response.text.strip()
             except Exception as rate_limit_error:
                 # Check if it's a rate limit error and try backup model
-                error_msg = str(rate_limit_error).lower()
-                if "rate limit" in error_msg or "quota" in error_msg or "limit" in error_msg:
+                if _is_rate_limit_error(rate_limit_error):
                     print(f"🔄 Rate limit reached on {model_name}, switching to backup model...")
                     # Switch to backup model
                     ai_model, backup_model_name = switch_to_backup_model(model_name)
@@ -12376,7 +12835,7 @@ RESPONSE FORMAT:
                     print(f"🤖 Switched to {backup_model_name} for AI code editing...")
                     
                     # Try again with backup model
-                    response = ai_model.generate_content(prompt)
+                    response = generate_ai_content(ai_model, prompt)
                     ai_response = response.text.strip()
                 else:
                     # Re-raise if it's not a rate limit error
@@ -12533,7 +12992,6 @@ RESPONSE FORMAT:
                 
         except Exception as e:
             print(f"❌ Error editing code with AI: {e}")
-            import traceback
             traceback.print_exc()
             return False
 
@@ -12599,12 +13057,11 @@ RESPONSE FORMAT:
             
             # Generate AI response with fallback capability
             try:
-                response = ai_model.generate_content(prompt)
+                response = generate_ai_content(ai_model, prompt)
                 ai_response = response.text.strip()
             except Exception as rate_limit_error:
                 # Check if it's a rate limit error and try backup model
-                error_msg = str(rate_limit_error).lower()
-                if "rate limit" in error_msg or "quota" in error_msg or "limit" in error_msg:
+                if _is_rate_limit_error(rate_limit_error):
                     print(f"🔄 Rate limit reached on {model_name}, switching to backup model...")
                     # Switch to backup model
                     ai_model, backup_model_name = switch_to_backup_model(model_name)
@@ -12615,7 +13072,7 @@ RESPONSE FORMAT:
                     print(f"🤖 Switched to {backup_model_name} for AI line range editing...")
                     
                     # Try again with backup model
-                    response = ai_model.generate_content(prompt)
+                    response = generate_ai_content(ai_model, prompt)
                     ai_response = response.text.strip()
                 else:
                     # Re-raise other exceptions
@@ -12690,7 +13147,6 @@ RESPONSE FORMAT:
                     return True
                 except Exception as e:
                     print(f"❌ Error replacing line range: {e}")
-                    import traceback
                     traceback.print_exc()
                     return False
             else:
@@ -12699,7 +13155,6 @@ RESPONSE FORMAT:
                 
         except Exception as e:
             print(f"❌ Error editing line range with AI: {e}")
-            import traceback
             traceback.print_exc()
             return False
 
@@ -12759,12 +13214,11 @@ RESPONSE FORMAT:
             
             # Generate AI response with fallback capability
             try:
-                response = ai_model.generate_content(prompt)
+                response = generate_ai_content(ai_model, prompt)
                 ai_response = response.text.strip()
             except Exception as rate_limit_error:
                 # Check if it's a rate limit error and try backup model
-                error_msg = str(rate_limit_error).lower()
-                if "rate limit" in error_msg or "quota" in error_msg or "limit" in error_msg:
+                if _is_rate_limit_error(rate_limit_error):
                     print(f"🔄 Rate limit reached on {model_name}, switching to backup model...")
                     # Switch to backup model
                     ai_model, backup_model_name = switch_to_backup_model(model_name)
@@ -12775,7 +13229,7 @@ RESPONSE FORMAT:
                     print(f"🤖 Switched to {backup_model_name} for AI full file editing...")
                     
                     # Try again with backup model
-                    response = ai_model.generate_content(prompt)
+                    response = generate_ai_content(ai_model, prompt)
                     ai_response = response.text.strip()
                 else:
                     # Re-raise other exceptions
@@ -12825,7 +13279,6 @@ RESPONSE FORMAT:
                     return True
                 except Exception as e:
                     print(f"❌ Error replacing file content: {e}")
-                    import traceback
                     traceback.print_exc()
                     return False
             else:
@@ -12834,7 +13287,6 @@ RESPONSE FORMAT:
                 
         except Exception as e:
             print(f"❌ Error editing entire file with AI: {e}")
-            import traceback
             traceback.print_exc()
             return False
 
@@ -13909,7 +14361,7 @@ class AIManifestEditorDialog(QDialog):
                 raise Exception("AI model not available. Please check your API key configuration.")
             
             # Generate response
-            response = model.generate_content(ai_prompt)
+            response = generate_ai_content(model, ai_prompt)
             ai_response = response.text
             
             # Parse AI response
@@ -14035,7 +14487,7 @@ Respond ONLY with the JSON content, no additional text.
             json_str = ai_response[start_idx:end_idx + 1]
             
             # Parse JSON
-            manifest_data = json.loads(json_str)
+            manifest_data = _json_loads(json_str)
             
             # Validate required fields
             required_fields = ['name', 'version', 'type', 'players', 'main_categories', 'sub_categories']
@@ -14933,8 +15385,8 @@ class GameButton(QPushButton):
         layout.addWidget(version_label)
         
         # Game metadata with categories and auto-tracking
-        main_cat_display = format_categories_for_display(self.game.main_categories, "Main-Category", MAIN_CATEGORIES)
-        sub_cat_display = format_categories_for_display(self.game.sub_categories, "Sub-Category", SUB_CATEGORIES)
+        main_cat_display = format_categories_for_display(self.game.main_categories, "Main-Category", MAIN_CATEGORIES_SET)
+        sub_cat_display = format_categories_for_display(self.game.sub_categories, "Sub-Category", SUB_CATEGORIES_SET)
         
         # Compact auto-tracking display for game list - show total minutes only
         total_minutes = (self.game.time_played.get('minutes', 0) + 
@@ -15943,7 +16395,7 @@ class GamePlayer(QWidget):
             
         try:
             # Check if it's a QsciScintilla using type comparison
-            if type(editor_widget).__name__ == 'QsciScintilla':
+            if _is_qsci_widget(editor_widget):
                 # QsciScintilla: get selection using its methods
                 if editor_widget.hasSelectedText():
                     selected_text = editor_widget.selectedText()
@@ -15962,10 +16414,8 @@ class GamePlayer(QWidget):
                     start_line = cursor.blockNumber() + 1
                     end_line = cursor.blockNumber() + 1
                     if cursor.selectionEnd() != cursor.selectionStart():
-                        # Multi-line selection
-                        temp_cursor = QTextCursor(cursor)
-                        temp_cursor.setPosition(cursor.selectionEnd())
-                        end_line = temp_cursor.blockNumber() + 1
+                        # Multi-line selection; findBlock avoids copying the cursor
+                        end_line = cursor.document().findBlock(cursor.selectionEnd()).blockNumber() + 1
                     return selected_text, start_line, end_line
                 else:
                     return "", 0, 0
@@ -16709,7 +17159,7 @@ class EnhancedCodeEditorWidget(QWidget):
         editor_layout.addWidget(editor_label)
         
         # Enhanced code editor with syntax highlighting
-        if HAS_QSCINTILLA:
+        if has_qscintilla():
             self.code_editor = QsciScintilla()
             self._setup_syntax_highlighting()
         else:
@@ -16981,7 +17431,7 @@ class EnhancedCodeEditorWidget(QWidget):
         self.unsaved_changes = True
         
         # Update syntax checking if enabled
-        if self.syntax_enabled and HAS_QSCINTILLA:
+        if self.syntax_enabled and has_qscintilla():
             self._check_syntax()
     
     def _check_syntax(self):
@@ -17545,7 +17995,7 @@ class EnhancedCodeEditorWidget(QWidget):
             
         try:
             # Check if it's a QsciScintilla using type comparison
-            if type(editor_widget).__name__ == 'QsciScintilla':
+            if _is_qsci_widget(editor_widget):
                 # QsciScintilla: get selection using its methods
                 if editor_widget.hasSelectedText():
                     selected_text = editor_widget.selectedText()
@@ -17564,10 +18014,8 @@ class EnhancedCodeEditorWidget(QWidget):
                     start_line = cursor.blockNumber() + 1
                     end_line = cursor.blockNumber() + 1
                     if cursor.selectionEnd() != cursor.selectionStart():
-                        # Multi-line selection
-                        temp_cursor = QTextCursor(cursor)
-                        temp_cursor.setPosition(cursor.selectionEnd())
-                        end_line = temp_cursor.blockNumber() + 1
+                        # Multi-line selection; findBlock avoids copying the cursor
+                        end_line = cursor.document().findBlock(cursor.selectionEnd()).blockNumber() + 1
                     return selected_text, start_line, end_line
                 else:
                     return "", 0, 0
@@ -18953,7 +19401,7 @@ class GameBox(QMainWindow):
         
         manifest_path = game_dir / 'manifest.json'
         with open(manifest_path, 'w', encoding='utf-8') as f:
-            json.dump(manifest, f, indent=4)
+            f.write(_json_dumps(manifest))
 
     def _generate_random_name(self):
         """Generate a random 10-character name using letters and numbers"""
@@ -19899,6 +20347,10 @@ def main():
         print("Please install it using: pip3 install PyQtWebEngine")
         sys.exit(1)
         
+    logging.basicConfig(
+        level=logging.DEBUG if os.environ.get("GAMEBOX_DEBUG") == "1" else logging.WARNING,
+        format="%(levelname)s %(name)s: %(message)s")
+
     app = QApplication(sys.argv)
     app.setApplicationName("GameBox")
     app.setApplicationDisplayName("GameBox")
@@ -19980,7 +20432,10 @@ def main():
     
     # Set organization name for better identification
     app.setOrganizationName("GameBox")
-    
+
+    # Make sure debounced manifest writes reach disk before exit
+    app.aboutToQuit.connect(flush_pending_manifests)
+
     # Start the application event loop
     sys.exit(app.exec_())
 